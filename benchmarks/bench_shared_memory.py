@@ -0,0 +1,83 @@
+"""共享内存聚合基准: 对比逐块 pickle 分布对象与写入共享数组两种多进程汇总方式.
+
+用法: python benchmarks/bench_shared_memory.py [--workers 4] [--battles 2000] [--runs 3]
+两种方式统计相同的胜场、回合数与剩余生命直方图 (先核对结果一致), 分块越小,
+逐块返回结果的 pickle 与合并开销占比越高.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bh3_duel_sim.characters import build_valkyrie_roster  # noqa: E402
+from bh3_duel_sim.distributions import run_seeded_distributions  # noqa: E402
+from bh3_duel_sim.parallel import PairJob, SimulationPool  # noqa: E402
+from bh3_duel_sim.shm import SharedMemoryPool  # noqa: E402
+from bh3_duel_sim.simulator import BattleSimulator, pair_seed  # noqa: E402
+
+CHUNK_SIZES = (20, 100, 500)
+
+
+def _jobs(battles: int) -> list[PairJob]:
+    roster = build_valkyrie_roster()
+    names = list(roster)
+    return [
+        PairJob(roster[a], roster[b], pair_seed(0, a, b), 0, battles)
+        for i, a in enumerate(names)
+        for b in names[i + 1 :]
+    ]
+
+
+def _median_seconds(action: object, runs: int) -> float:
+    samples: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()  # type: ignore[operator]
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    """按分块大小逐项测量两种汇总方式的中位耗时."""
+    parser = argparse.ArgumentParser(description="对比 pickle 汇总与共享内存汇总的多进程开销")
+    parser.add_argument("--workers", type=int, default=4, help="工作进程数")
+    parser.add_argument("--battles", type=int, default=2000, help="每组对阵场数")
+    parser.add_argument("--runs", type=int, default=3, help="每项运行次数")
+    args = parser.parse_args()
+
+    jobs = _jobs(args.battles)
+    total = len(jobs) * args.battles
+    print(f"{len(jobs)} 组对阵, 共 {total} 场, {args.workers} 个工作进程")
+    print(f"{'分块':>6}{'单块结果':>10}{'pickle 汇总':>14}{'共享内存':>12}{'加速':>8}")
+    for chunk_size in CHUNK_SIZES:
+        chunk = PairJob(jobs[0].spawn_a, jobs[0].spawn_b, 0, 0, chunk_size)
+        sample = run_seeded_distributions(BattleSimulator(), chunk)
+        payload = len(pickle.dumps(sample))
+        with (
+            SimulationPool(args.workers, chunk_size) as pool,
+            SharedMemoryPool(args.workers, chunk_size) as shared,
+        ):
+            pickled = pool.run_distributions(jobs)
+            summed = shared.run(jobs)
+            # 先确认两种方式的统计完全一致, 再比较耗时.
+            for dist, totals in zip(pickled, summed):
+                assert totals.rounds == list(dist.length.counts)
+                assert totals.hp_a == list(dist.hp_a.counts)
+                assert totals.hp_b == list(dist.hp_b.counts)
+            pickle_time = _median_seconds(lambda: pool.run_distributions(jobs), args.runs)
+            shared_time = _median_seconds(lambda: shared.run(jobs), args.runs)
+        print(
+            f"{chunk_size:>6}{payload:>9}B{pickle_time:>13.2f}s{shared_time:>11.2f}s"
+            f"{pickle_time / shared_time:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""启动耗时基准: 对比惰性名单与旧版全量导入的冷启动开销.
+
+用法: python benchmarks/bench_startup.py [--runs 20]
+每项都在全新解释器中执行, 取多次运行的中位数.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+OLD_EAGER_ROSTER = """
+import importlib, inspect, pkgutil
+from bh3_duel_sim.characters import valkyries
+from bh3_duel_sim.characters.base import BaseCharacter
+roster = {}
+for info in pkgutil.iter_modules(valkyries.__path__):
+    module = importlib.import_module(f"{valkyries.__name__}.{info.name}")
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if issubclass(cls, BaseCharacter) and cls.__module__ == module.__name__:
+            roster[cls().name] = cls
+"""
+
+CASES: dict[str, str] = {
+    "空解释器": "pass",
+    "import bh3_duel_sim": "import bh3_duel_sim",
+    "import + build_valkyrie_roster()": (
+        "from bh3_duel_sim import build_valkyrie_roster; build_valkyrie_roster()"
+    ),
+    "名单 + 首次实例化一名角色": (
+        "from bh3_duel_sim import build_valkyrie_roster; build_valkyrie_roster()['丽塔']()"
+    ),
+    # 旧实现的等价过程: 扫描导入全部角色模块, 再逐个实例化读取显示名.
+    "全量导入并实例化(旧行为)": OLD_EAGER_ROSTER,
+}
+
+
+def _measure(code: str, runs: int) -> float:
+    samples: list[float] = []
+    # 预热一次, 让 __pycache__ 就绪, 避免首轮编译字节码拉高结果.
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    """逐项测量并打印中位耗时及相对空解释器的增量."""
+    parser = argparse.ArgumentParser(description="测量包导入与名单构建的冷启动耗时")
+    parser.add_argument("--runs", type=int, default=20, help="每项运行次数")
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'场景':<36}{'中位耗时':>10}{'增量':>10}")
+    for label, code in CASES.items():
+        elapsed = _measure(code, args.runs)
+        if baseline is None:
+            baseline = elapsed
+        print(f"{label:<36}{elapsed * 1000:>8.1f}ms{(elapsed - baseline) * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
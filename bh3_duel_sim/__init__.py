@@ -1,6 +1,8 @@
 """对战模拟核心包."""
 
-from .characters import *  # noqa: F401,F403
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .characters import (
     BaseCharacter,
     PlaceholderCombatant,
@@ -9,14 +11,21 @@ from .characters import (
 )
 from .characters import __all__ as _CHARACTERS_EXPORTS
 from .logger import BattleLogger
+from .results import MatchupStore
 from .simulator import (
     BattleSimulator,
+    RoundRobinOptions,
+    gauntlet_statistics,
     mass_battle_statistics,
     round_robin_statistics,
     run_single_verbose_battle,
 )
 from .stats import CombatStats
 
+if TYPE_CHECKING:
+    from .checkpoint import RoundRobinCheckpoint
+    from .matrix import MatchupMatrix
+
 __all__ = [
     "BaseCharacter",
     "PlaceholderCombatant",
@@ -24,9 +33,30 @@ __all__ = [
     "build_valkyrie_roster",
     "BattleLogger",
     "BattleSimulator",
+    "MatchupMatrix",
+    "MatchupStore",
+    "RoundRobinCheckpoint",
+    "RoundRobinOptions",
+    "gauntlet_statistics",
     "mass_battle_statistics",
     "round_robin_statistics",
     "run_single_verbose_battle",
     "CombatStats",
 ]
 __all__.extend(name for name in _CHARACTERS_EXPORTS if name not in __all__)  # pyright: ignore[reportUnsupportedDunderAll]
+
+
+def __getattr__(name: str) -> object:
+    # 女武神类按需转发, 避免 import bh3_duel_sim 时加载全部角色模块.
+    if name in _CHARACTERS_EXPORTS:
+        from . import characters  # noqa: PLC0415 - 按需加载, 导入本包时不载入全部角色
+
+        return getattr(characters, name)
+    # 依赖进程池等重模块的导出同样按需导入, 保持包本身的导入开销.
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(f".{_LAZY_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# 按需导入的导出名 -> 所在子模块.
+_LAZY_EXPORTS = {"MatchupMatrix": "matrix", "RoundRobinCheckpoint": "checkpoint"}
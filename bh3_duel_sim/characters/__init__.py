@@ -2,7 +2,6 @@
 
 from .base import BaseCharacter
 from .placeholder import PlaceholderCombatant, build_placeholder_fighters
-from .valkyries import *  # noqa: F401,F403
 from .valkyries import __all__ as _VALKYRIE_EXPORTS
 from .valkyries import build_valkyrie_roster
 
@@ -12,4 +11,13 @@ __all__ = [
     "build_placeholder_fighters",
     "build_valkyrie_roster",
 ]
-__all__.extend(_VALKYRIE_EXPORTS)  # pyright: ignore[reportUnsupportedDunderAll]
+__all__.extend(name for name in _VALKYRIE_EXPORTS if name not in __all__)  # pyright: ignore[reportUnsupportedDunderAll]
+
+
+def __getattr__(name: str) -> object:
+    # 女武神类按需转发, 避免导入本包时加载全部角色模块.
+    if name in _VALKYRIE_EXPORTS:
+        from . import valkyries  # noqa: PLC0415 - 按需加载, 导入本包时不载入全部角色
+
+        return getattr(valkyries, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
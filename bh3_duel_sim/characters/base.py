@@ -12,6 +12,12 @@ from bh3_duel_sim.stats import CombatStats
 ATTRIBUTE_DEBUFF_STATES: frozenset[str] = frozenset({"减防"})
 # 控制类状态集合
 CONTROL_STATES: frozenset[str] = frozenset({"眩晕", "混乱", "魅惑"})
+# 快照单独处理的实例字段: 状态表需逐项复制, 随机源与机制记录由驱动管理.
+SNAPSHOT_SKIP_FIELDS: frozenset[str] = frozenset({"states", "_rng", "_mechanic_log"})
+# 角色快照: (快照字段值, 状态表副本).
+CharacterSnapshot = tuple[tuple[object, ...], dict[str, dict[str, float]]]
+# 角色类 -> 快照字段名, 首次快照时由实例字段推出.
+_SNAPSHOT_FIELDS: dict[type, tuple[str, ...]] = {}
 
 
 class BaseCharacter:
@@ -28,11 +34,53 @@ class BaseCharacter:
         self._rng: random.Random | None = None
         self._active_cooldown: int | None = None
         self._active_counter: int | None = None
+        self._mechanic_log: set[str] | None = None
 
     def bind_rng(self, rng: random.Random) -> None:
         """在战斗开始时由驱动绑定随机源."""
         self._rng = rng
 
+    def track_mechanics(self, log: set[str] | None) -> None:
+        """开启(传入集合)或关闭(传入 None)机制读取记录."""
+        self._mechanic_log = log
+
+    def note_mechanic(self, tag: str) -> None:
+        """记录本场读取过的机制常量, 标签形如 "Lita.COUNTER_BASE_DAMAGE"."""
+        if self._mechanic_log is not None:
+            self._mechanic_log.add(tag)
+
+    def _snapshot_fields(self) -> tuple[str, ...]:
+        fields = _SNAPSHOT_FIELDS.get(type(self))
+        if fields is None:
+            # 类上同名的属性 (如挂接到实例上的方法包装) 不属于战斗状态.
+            cls = type(self)
+            fields = tuple(
+                name
+                for name in vars(self)
+                if name not in SNAPSHOT_SKIP_FIELDS and not hasattr(cls, name)
+            )
+            _SNAPSHOT_FIELDS[type(self)] = fields
+        return fields
+
+    def snapshot(self) -> CharacterSnapshot:
+        """保存对局中的可变状态: 生命、状态表、冷却计数与子类字段.
+
+        只复制字段值元组与状态表, 不深拷贝整个对象; 子类字段须在 __init__ 中初始化.
+        """
+        namespace = self.__dict__
+        values = tuple(namespace[name] for name in self._snapshot_fields())
+        return values, {name: dict(state) for name, state in self.states.items()}
+
+    def restore(self, snapshot: CharacterSnapshot) -> None:
+        """恢复 snapshot 保存的状态, 同一快照可以反复恢复."""
+        values, states = snapshot
+        namespace = self.__dict__
+        for name, value in zip(self._snapshot_fields(), values):
+            namespace[name] = value
+        self.states.clear()
+        for name, state in states.items():
+            self.states[name] = dict(state)
+
     def _require_rng(self) -> random.Random:
         if self._rng is None:
             raise RuntimeError("未绑定随机源")
@@ -0,0 +1,686 @@
+"""声明式角色定义: 从 TOML/JSON 读取属性与技能原语, 编译为专用的角色类.
+
+定义由固定的一组效果原语拼成 (多段伤害、真实伤害、当前生命百分比伤害、护盾、
+施加状态、概率触发等), 编译时每个原语变成一个闭包, 常量全部绑定为闭包变量;
+角色类只覆盖定义中实际用到的钩子, 其余直接沿用基类方法.
+specs/ 目录下附带与手写女武神等价的参考定义, 可用 verify_against_reference 逐场核对.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import tomllib
+
+from ..logger import BattleLogger
+from ..simulator import BattleSimulator, battle_seed
+from ..stats import CombatStats
+from .base import BaseCharacter
+
+# 效果闭包: (施放者, 目标, 日志). 受击钩子中的目标为攻击者.
+Effect = Callable[["SpecCharacter", BaseCharacter, BattleLogger], None]
+TakeDamage = Callable[..., None]
+
+SPECS_DIR = Path(__file__).with_name("specs")
+ACTIVE_SOURCE = "主动技能"
+# 回合开始时可处理的状态; 定义中的 turn_states 决定处理哪些、以什么顺序.
+KNOWN_TURN_STATES = ("流血", "眩晕", "混乱", "减防")
+# 圣血类被动在状态字典中的已触发标记.
+STATE_HEAL_MARK = "spec_heal_mark"
+SPEC_KEYS = frozenset(
+    {
+        "name",
+        "tag",
+        "stats",
+        "cooldown",
+        "active_replaces_basic",
+        "turn_states",
+        "prebattle",
+        "state_heal",
+        "dodge_counter",
+        "revive",
+        "active",
+        "after_basic",
+        "after_self_hit",
+        "after_states",
+        "on_hit",
+    }
+)
+
+# 编译结果按定义文件缓存, 每个进程同一文件只编译一次.
+_COMPILED: dict[str, type[SpecCharacter]] = {}
+
+
+class SpecCharacter(BaseCharacter):
+    """由定义编译出的角色类的公共基类, 只提供字段与眩晕判定."""
+
+    BASE_STATS: CombatStats
+    DISPLAY_NAME = ""
+    ACTIVE_COOLDOWN = 1
+
+    def __init__(self) -> None:
+        super().__init__(name=self.DISPLAY_NAME, stats=self.BASE_STATS)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
+        self._stunned = False
+        self._confused = False
+        self._shield_value = 0.0
+        self._buff_turns = 0
+
+    def reset_for_battle(self) -> None:
+        super().reset_for_battle()
+        self._stunned = False
+        self._confused = False
+        self._shield_value = 0.0
+        self._buff_turns = 0
+
+    def trigger_passive(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
+        if self._stunned:
+            self.log_action(logger, "state", "因眩晕跳过本回合的主动与普攻")
+            return True
+        return False
+
+    def use_active_skill(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
+        return False
+
+    def apply_state_effects(self, opponent: BaseCharacter, logger: BattleLogger) -> None:
+        self._stunned = False
+        self._confused = False
+
+
+def _tag(prefix: str, spec: Mapping[str, Any], default: str) -> str:
+    return f"{prefix}.{spec.get('mechanic', default)}"
+
+
+def _damage(spec: Mapping[str, Any], prefix: str) -> Effect:
+    if "hits" in spec:
+        hits = tuple(float(value) for value in spec["hits"])
+    else:
+        hits = (float(spec["base"]),) * int(spec.get("count", 1))
+    source = str(spec.get("source", ACTIVE_SOURCE))
+    pierce = spec.get("pierce_chance")
+    if pierce is None:
+
+        def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+            for base in hits:
+                if not target.is_alive:
+                    return
+                damage = me.calculate_skill_damage(base, target)
+                if logger.enabled:
+                    me.log_action(logger, "active", f"{source}预期伤害 {damage:.2f}")
+                target.take_damage(damage, logger, source, attacker=me)
+
+        return effect
+
+    chance = float(pierce)
+    tag = _tag(prefix, spec, "PIERCE_CHANCE")
+
+    def pierce_effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        for base in hits:
+            if not target.is_alive:
+                return
+            if not me.is_passive_blocked():
+                me.note_mechanic(tag)
+                if me.roll_chance(chance):
+                    me.log_action(logger, "passive", "触发穿透, 无视防御与护盾")
+                    target.take_damage(base, logger, source, ignore_shield=True, attacker=me)
+                    continue
+            damage = me.calculate_skill_damage(base, target)
+            if logger.enabled:
+                me.log_action(logger, "active", f"{source}预期伤害 {damage:.2f}")
+            target.take_damage(damage, logger, source, attacker=me)
+
+    return pierce_effect
+
+
+def _true_damage(spec: Mapping[str, Any], prefix: str) -> Effect:
+    amount = float(spec["amount"])
+    source = str(spec.get("source", ACTIVE_SOURCE))
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if target.is_alive:
+            target.take_damage(amount, logger, source, ignore_shield=True, attacker=me)
+
+    return effect
+
+
+def _current_hp_damage(spec: Mapping[str, Any], prefix: str) -> Effect:
+    ratio = float(spec["ratio"])
+    minimum = float(spec.get("min", 0.0))
+    source = str(spec.get("source", ACTIVE_SOURCE))
+    passive = bool(spec.get("passive", False))
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if not target.is_alive or (passive and me.is_passive_blocked()):
+            return
+        damage = max(minimum, target.current_hp * ratio)
+        if logger.enabled:
+            me.log_action(logger, "passive", f"造成 {damage:.2f} 点真实伤害")
+        target.take_damage(damage, logger, source, ignore_shield=True, attacker=me)
+
+    return effect
+
+
+def _lost_hp_damage(spec: Mapping[str, Any], prefix: str) -> Effect:
+    ratio = float(spec["ratio"])
+    flat = float(spec.get("flat", 0.0))
+    minimum = float(spec.get("min", 0.0))
+    source = str(spec.get("source", ACTIVE_SOURCE))
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if not target.is_alive:
+            return
+        bonus = (me.max_hp - me.current_hp) * ratio + flat
+        mitigated = max(0.0, me.effective_attack() + bonus - target.effective_defense())
+        damage = max(minimum, mitigated)
+        if logger.enabled:
+            me.log_action(logger, "active", f"造成 {damage:.2f} (失血加成 {bonus:.2f})")
+        target.take_damage(damage, logger, source, attacker=me)
+
+    return effect
+
+
+def _heal(spec: Mapping[str, Any], prefix: str) -> Effect:
+    amount = float(spec["amount"])
+    source = str(spec.get("source", "治疗"))
+    threshold = spec.get("below")
+    passive = bool(spec.get("passive", False))
+    if threshold is None:
+
+        def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+            me.heal(amount, logger, source)
+
+        return effect
+
+    limit = float(threshold)
+
+    def low_hp_effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if me.current_hp < limit and not (passive and me.is_passive_blocked()):
+            me.heal(amount, logger, source)
+
+    return low_hp_effect
+
+
+def _shield(spec: Mapping[str, Any], prefix: str) -> Effect:
+    amount = float(spec["amount"])
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if me.is_passive_blocked():
+            return
+        me._shield_value += amount
+        if logger.enabled:
+            me.log_action(logger, "passive", f"获得 {amount:g} 点护盾 -> {me._shield_value:.2f}")
+
+    return effect
+
+
+def _apply_state(spec: Mapping[str, Any], prefix: str) -> Effect:
+    state_name = str(spec["state"])
+    turns = int(spec["turns"])
+    values = {key: float(value) for key, value in spec.get("values", {}).items()}
+    merge = bool(spec.get("merge", False))
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if merge and state_name in target.states:
+            # 刷新已有状态时沿用原字典, 保留其中的标记.
+            state = target.states[state_name]
+            state["剩余回合"] = turns
+            state.update(values)
+        else:
+            state = {"剩余回合": turns, **values}
+        target.apply_state(state_name, state, logger)
+        if logger.enabled:
+            logger.emit(target.name, "state", f"{me.name} 施加{state_name} {turns} 回合")
+
+    return effect
+
+
+def _buff(spec: Mapping[str, Any], prefix: str) -> Effect:
+    turns = int(spec["turns"])
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        me._buff_turns = turns
+        me.log_action(logger, "active", f"进入强化姿态, 持续 {turns} 回合")
+
+    return effect
+
+
+def _proc(spec: Mapping[str, Any], prefix: str) -> Effect:
+    chance = float(spec["chance"])
+    passive = bool(spec.get("passive", False))
+    tag = _tag(prefix, spec, "CHANCE")
+    on_success = _sequence(_compile_effects(spec.get("then", ()), prefix))
+    on_failure = _sequence(_compile_effects(spec.get("else", ()), prefix))
+
+    def effect(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        if (passive and me.is_passive_blocked()) or not target.is_alive:
+            return
+        me.note_mechanic(tag)
+        if me.roll_chance(chance):
+            if on_success is not None:
+                on_success(me, target, logger)
+        elif on_failure is not None:
+            on_failure(me, target, logger)
+
+    return effect
+
+
+_PRIMITIVES: dict[str, Callable[[Mapping[str, Any], str], Effect]] = {
+    "damage": _damage,
+    "true_damage": _true_damage,
+    "current_hp_damage": _current_hp_damage,
+    "lost_hp_damage": _lost_hp_damage,
+    "heal": _heal,
+    "shield": _shield,
+    "apply_state": _apply_state,
+    "buff": _buff,
+    "proc": _proc,
+}
+
+
+def _compile_effects(items: Sequence[Mapping[str, Any]], prefix: str) -> tuple[Effect, ...]:
+    effects: list[Effect] = []
+    for item in items:
+        builder = _PRIMITIVES.get(str(item.get("type")))
+        if builder is None:
+            raise ValueError(f"未知的效果类型: {item.get('type')!r}")
+        effects.append(builder(item, prefix))
+    return tuple(effects)
+
+
+def _sequence(effects: tuple[Effect, ...]) -> Effect | None:
+    """把效果串成一个闭包; 空序列返回 None, 单个效果直接返回本身."""
+    if not effects:
+        return None
+    if len(effects) == 1:
+        return effects[0]
+
+    def run(me: SpecCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+        for effect in effects:
+            effect(me, target, logger)
+
+    return run
+
+
+def _uses(spec: Mapping[str, Any], kind: str) -> bool:
+    """定义中 (含 proc 分支) 是否出现某种效果."""
+
+    def walk(items: Sequence[Mapping[str, Any]]) -> bool:
+        return any(
+            item.get("type") == kind or walk(item.get("then", ())) or walk(item.get("else", ()))
+            for item in items
+        )
+
+    hooks = ("active", "after_basic", "after_self_hit", "after_states", "on_hit")
+    return any(walk(spec.get(hook, ())) for hook in hooks)
+
+
+def _state_handler(state_name: str) -> Callable[[SpecCharacter, BattleLogger], None]:
+    end_suffix = f" 的{state_name}状态结束"
+    if state_name == "流血":
+
+        def bleed(me: SpecCharacter, logger: BattleLogger) -> None:
+            def effect(state: dict[str, float], remaining: int) -> None:
+                me.take_damage(state["伤害"], logger, "状态:流血")
+
+            me.process_state(state_name, logger, effect, end_message=me.name + end_suffix)
+
+        return bleed
+    if state_name in ("眩晕", "混乱"):
+        field = "_stunned" if state_name == "眩晕" else "_confused"
+
+        def control(me: SpecCharacter, logger: BattleLogger) -> None:
+            def effect(_: dict[str, float], remaining: int) -> None:
+                setattr(me, field, True)
+                if logger.enabled:
+                    me.log_action(logger, "state", f"陷入{state_name} (剩余 {remaining} 回合)")
+
+            me.process_state(state_name, logger, effect, end_message=me.name + end_suffix)
+
+        return control
+
+    return BaseCharacter._handle_defense_break
+
+
+def _build_turn_start(spec: Mapping[str, Any], prefix: str, namespace: dict[str, object]) -> None:
+    unknown = set(spec.get("turn_states", ())) - set(KNOWN_TURN_STATES)
+    if unknown:
+        raise ValueError(f"无法处理的回合状态: {sorted(unknown)}")
+    handlers = tuple(_state_handler(name) for name in spec.get("turn_states", ()))
+    after_states = _sequence(_compile_effects(spec.get("after_states", ()), prefix))
+    has_buff = _uses(spec, "buff")
+    heal_spec = spec.get("state_heal")
+    try_heal: Callable[[SpecCharacter, str, BattleLogger], None] | None = None
+    negative: frozenset[str] = frozenset()
+    if heal_spec is not None:
+        ratio = float(heal_spec["ratio"])
+        negative = frozenset(heal_spec["states"])
+        source = str(heal_spec.get("source", "被动"))
+
+        def heal_once(me: SpecCharacter, state_name: str, logger: BattleLogger) -> None:
+            # 每个负面状态实例只触发一次回复, 刷新同一状态字典不会再次触发.
+            state = me.states.get(state_name)
+            if not state or me.is_passive_blocked() or state.get(STATE_HEAL_MARK):
+                return
+            state[STATE_HEAL_MARK] = 1.0
+            me.heal(max(0.0, me.max_hp * ratio), logger, source)
+
+        def on_state_inflicted(self: SpecCharacter, state_name: str, logger: BattleLogger) -> None:
+            if state_name in negative:
+                heal_once(self, state_name, logger)
+
+        namespace["on_state_inflicted"] = on_state_inflicted
+        try_heal = heal_once
+
+    def apply_state_effects(
+        self: SpecCharacter, opponent: BaseCharacter, logger: BattleLogger
+    ) -> None:
+        self._stunned = False
+        self._confused = False
+        if has_buff and self._buff_turns > 0:
+            self._buff_turns -= 1
+        if try_heal is not None:
+            for state_name in list(self.states):
+                if state_name in negative:
+                    try_heal(self, state_name, logger)
+        for handler in handlers:
+            handler(self, logger)
+        if after_states is not None:
+            after_states(self, opponent, logger)
+
+    namespace["apply_state_effects"] = apply_state_effects
+
+
+def _build_take_damage(spec: Mapping[str, Any], prefix: str, namespace: dict[str, object]) -> None:
+    """按定义由内向外叠加受击层: 基础结算 -> 受击后效果 -> 护盾 -> 闪避反击."""
+    take: TakeDamage = BaseCharacter.take_damage
+    on_hit = _sequence(_compile_effects(spec.get("on_hit", ()), prefix))
+    revive = spec.get("revive")
+    if on_hit is not None or revive is not None:
+        inner_hit = take
+        revive_chance = float(revive["chance"]) if revive is not None else 0.0
+        revive_ratio = float(revive["hp_ratio"]) if revive is not None else 0.0
+        revive_tag = _tag(prefix, revive or {}, "REVIVE_CHANCE")
+
+        def after_hit(  # noqa: PLR0913 - 签名须与 BaseCharacter.take_damage 一致
+            self: SpecCharacter,
+            amount: float,
+            logger: BattleLogger,
+            source: str,
+            *,
+            ignore_shield: bool = False,
+            attacker: BaseCharacter | None = None,
+        ) -> None:
+            category = logger.classify_source(source)
+            inner_hit(self, amount, logger, source, ignore_shield=ignore_shield, attacker=attacker)
+            if (
+                on_hit is not None
+                and attacker
+                and attacker.is_alive
+                and category not in ("state", "heal")
+                and not self.is_passive_blocked()
+            ):
+                on_hit(self, attacker, logger)
+            if revive is not None and self.current_hp <= 0 and not self.is_passive_blocked():
+                self.note_mechanic(revive_tag)
+                if self.roll_chance(revive_chance):
+                    self.current_hp = max(self.max_hp * revive_ratio, 1.0)
+                    self.log_action(logger, "passive", "复活")
+
+        take = after_hit
+
+    if _uses(spec, "shield"):
+        inner_shield = take
+
+        def shielded(  # noqa: PLR0913 - 签名须与 BaseCharacter.take_damage 一致
+            self: SpecCharacter,
+            amount: float,
+            logger: BattleLogger,
+            source: str,
+            *,
+            ignore_shield: bool = False,
+            attacker: BaseCharacter | None = None,
+        ) -> None:
+            if not ignore_shield and self._shield_value > 0 and amount > 0:
+                absorbed = min(amount, self._shield_value)
+                self._shield_value -= absorbed
+                amount -= absorbed
+            if amount <= 0:
+                return
+            inner_shield(
+                self, amount, logger, source, ignore_shield=ignore_shield, attacker=attacker
+            )
+
+        take = shielded
+
+    dodge = spec.get("dodge_counter")
+    if dodge is not None:
+        inner_dodge = take
+        chance = float(dodge["chance"])
+        counter_damage = float(dodge["damage"])
+        counter_source = str(dodge.get("source", "被动:闪避反击"))
+        dodge_tag = _tag(prefix, dodge, "COUNTER_CHANCE")
+
+        def dodging(  # noqa: PLR0913 - 签名须与 BaseCharacter.take_damage 一致
+            self: SpecCharacter,
+            amount: float,
+            logger: BattleLogger,
+            source: str,
+            *,
+            ignore_shield: bool = False,
+            attacker: BaseCharacter | None = None,
+        ) -> None:
+            # 只有直接攻击可被闪避, 状态/治疗/被动来源的伤害照常结算.
+            category = logger.classify_source(source)
+            if (
+                attacker
+                and category not in ("state", "heal", "passive")
+                and not self.is_passive_blocked()
+            ):
+                self.note_mechanic(dodge_tag)
+                if self.roll_chance(chance):
+                    damage = max(0.0, counter_damage - attacker.effective_defense())
+                    attacker.take_damage(damage, logger, counter_source, attacker=self)
+                    return
+            inner_dodge(
+                self, amount, logger, source, ignore_shield=ignore_shield, attacker=attacker
+            )
+
+        take = dodging
+
+    if take is not BaseCharacter.take_damage:
+        namespace["take_damage"] = take
+
+
+def _build_active(spec: Mapping[str, Any], prefix: str, namespace: dict[str, object]) -> None:
+    active = _sequence(_compile_effects(spec.get("active", ()), prefix))
+    if active is None:
+        return
+    replaces_basic = bool(spec.get("active_replaces_basic", False))
+
+    def use_active_skill(
+        self: SpecCharacter, opponent: BaseCharacter, logger: BattleLogger
+    ) -> bool:
+        if not self.consume_active_charge():
+            return False
+        active(self, opponent, logger)
+        return replaces_basic
+
+    namespace["use_active_skill"] = use_active_skill
+
+
+def _build_basic_attack(spec: Mapping[str, Any], prefix: str, namespace: dict[str, object]) -> None:
+    after_basic = _sequence(_compile_effects(spec.get("after_basic", ()), prefix))
+    after_self_hit = _sequence(_compile_effects(spec.get("after_self_hit", ()), prefix))
+
+    def perform_basic_attack(
+        self: SpecCharacter, opponent: BaseCharacter, logger: BattleLogger
+    ) -> None:
+        if self._confused:
+            damage = self.calculate_basic_damage(self)
+            if logger.enabled:
+                self.log_action(logger, "state", f"因混乱攻击自己, 预计伤害 {damage:.2f}")
+            self.take_damage(damage, logger, "混乱误伤")
+            if after_self_hit is not None:
+                after_self_hit(self, opponent, logger)
+            return
+        BaseCharacter.perform_basic_attack(self, opponent, logger)
+        if after_basic is not None:
+            after_basic(self, opponent, logger)
+
+    namespace["perform_basic_attack"] = perform_basic_attack
+
+
+def _build_prebattle(spec: Mapping[str, Any], namespace: dict[str, object]) -> None:
+    prebattle = spec.get("prebattle")
+    if prebattle is None:
+        return
+    hp_multiplier = float(prebattle.get("max_hp_multiplier", 1.0))
+    penalty_ratio = float(prebattle.get("defense_penalty_ratio", 0.0))
+
+    def reset_for_battle(self: SpecCharacter) -> None:
+        SpecCharacter.reset_for_battle(self)
+        self.set_max_hp_override(self.stats.max_hp * hp_multiplier)
+        self.current_hp = self.max_hp
+        self.bonus_defense -= self.stats.defense * penalty_ratio
+
+    namespace["reset_for_battle"] = reset_for_battle
+
+
+def _build_buff(spec: Mapping[str, Any], namespace: dict[str, object]) -> None:
+    buffs = [item for item in spec.get("active", ()) if item.get("type") == "buff"]
+    if len(buffs) > 1:
+        raise ValueError("每个角色至多一个强化姿态")
+    if not buffs:
+        return
+    attack_bonus = float(buffs[0].get("attack", 0.0))
+    defense_bonus = float(buffs[0].get("defense", 0.0))
+
+    def effective_attack(self: SpecCharacter) -> float:
+        value = BaseCharacter.effective_attack(self)
+        if self._buff_turns > 0:
+            value += attack_bonus
+        return value
+
+    def effective_defense(self: SpecCharacter) -> float:
+        value = BaseCharacter.effective_defense(self)
+        if self._buff_turns > 0:
+            value += defense_bonus
+        return value
+
+    namespace["effective_attack"] = effective_attack
+    namespace["effective_defense"] = effective_defense
+
+
+def compile_spec(spec: Mapping[str, Any]) -> type[SpecCharacter]:
+    """把角色定义编译为 SpecCharacter 子类, 只覆盖用到的钩子."""
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"角色定义含未知字段: {sorted(unknown)}")
+    name = str(spec["name"])
+    prefix = str(spec.get("tag", name))
+    stats = CombatStats(**{key: float(value) for key, value in spec["stats"].items()})
+    namespace: dict[str, object] = {
+        "BASE_STATS": stats,
+        "DISPLAY_NAME": name,
+        "ACTIVE_COOLDOWN": int(spec.get("cooldown", 1)),
+        "__module__": __name__,
+    }
+    _build_active(spec, prefix, namespace)
+    _build_basic_attack(spec, prefix, namespace)
+    _build_prebattle(spec, namespace)
+    _build_buff(spec, namespace)
+    _build_turn_start(spec, prefix, namespace)
+    _build_take_damage(spec, prefix, namespace)
+    return type(f"{prefix}Spec", (SpecCharacter,), namespace)
+
+
+def load_spec(path: str | Path) -> dict[str, Any]:
+    """读取 .toml 或 .json 角色定义."""
+    path = Path(path)
+    if path.suffix == ".toml":
+        return tomllib.loads(path.read_text(encoding="utf-8"))
+    if path.suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    raise ValueError(f"不支持的定义格式: {path.suffix}")
+
+
+class SpecFactory:
+    """定义文件角色工厂, 只记录文件路径, 可被 pickle 发往工作进程后各自编译."""
+
+    __slots__ = ("path", "_cls")
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(Path(path).resolve())
+        self._cls: type[SpecCharacter] | None = None
+
+    def load(self) -> type[SpecCharacter]:
+        """编译(或取缓存)定义对应的角色类."""
+        if self._cls is None:
+            cls = _COMPILED.get(self.path)
+            if cls is None:
+                cls = _COMPILED.setdefault(self.path, compile_spec(load_spec(self.path)))
+            self._cls = cls
+        return self._cls
+
+    def __call__(self) -> BaseCharacter:
+        cls = self._cls if self._cls is not None else self.load()
+        return cls()
+
+    def __reduce__(self) -> tuple[type[SpecFactory], tuple[str]]:
+        return (SpecFactory, (self.path,))
+
+    def __repr__(self) -> str:
+        return f"SpecFactory({self.path!r})"
+
+
+def build_spec_roster(directory: str | Path = SPECS_DIR) -> dict[str, Callable[[], BaseCharacter]]:
+    """按目录下的定义文件构建名单, 键为角色显示名."""
+    roster: dict[str, Callable[[], BaseCharacter]] = {}
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix in (".toml", ".json"):
+            factory = SpecFactory(path)
+            roster[factory.load().DISPLAY_NAME] = factory
+    return roster
+
+
+def verify_against_reference(
+    spawn: Callable[[], BaseCharacter],
+    reference: Callable[[], BaseCharacter],
+    opponents: Mapping[str, Callable[[], BaseCharacter]],
+    battles: int = 200,
+    seed: int = 0,
+) -> list[str]:
+    """定义角色与参考角色分别对阵同一批对手, 逐场比较胜者、回合数与双方剩余生命.
+
+    两边座位各打 battles 场, 使用相同的逐场种子; 返回不一致之处的描述, 空列表表示等价.
+    """
+    quiet_logger = BattleLogger(enabled=False)
+    simulator = BattleSimulator()
+    mismatches: list[str] = []
+
+    def outcome(first: BaseCharacter, second: BaseCharacter, battle: int) -> tuple[object, ...]:
+        winner = simulator.simulate_seeded(first, second, quiet_logger, battle)
+        seat = None if winner is None else winner is first
+        return seat, simulator.rounds_played, first.current_hp, second.current_hp
+
+    for opponent_name, spawn_opponent in opponents.items():
+        for seat_first in (True, False):
+            for index in range(battles):
+                battle = battle_seed(seed, index)
+                results = []
+                for candidate in (spawn, reference):
+                    fighter, opponent = candidate(), spawn_opponent()
+                    if seat_first:
+                        results.append(outcome(fighter, opponent, battle))
+                    else:
+                        results.append(outcome(opponent, fighter, battle))
+                if results[0] != results[1]:
+                    seat = "先" if seat_first else "后"
+                    mismatches.append(
+                        f"对阵 {opponent_name} ({seat}位) 第 {index} 场: "
+                        f"定义 {results[0]} / 参考 {results[1]}"
+                    )
+    return mismatches
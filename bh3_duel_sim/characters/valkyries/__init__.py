@@ -1,37 +1,107 @@
-"""女武神角色包."""
+"""女武神角色包.
+
+角色模块按需导入: 名单由静态清单构建, 只有工厂第一次被调用(或直接访问类名)
+时才导入对应模块. 清单外新放入的模块会在构建名单时扫描导入, 保证即放即用.
+"""
 
 from __future__ import annotations
 
 import importlib
 import inspect
 import pkgutil
-from typing import Callable, cast
+from functools import cache
+from typing import Any, Callable, cast
 
 from ..base import BaseCharacter
 
-_VALKYRIE_CLASSES: dict[str, type[BaseCharacter]] = {}
+# 静态清单: 类名 -> (显示名, 模块名). 新增角色请同步登记, 未登记的模块走扫描兜底.
+_MANIFEST: dict[str, tuple[str, str]] = {
+    "Bianka": ("比安卡", "bianka"),
+    "Bronya": ("布洛妮娅", "bronya"),
+    "Chenxue": ("晨雪", "chenxue"),
+    "Kiana": ("琪亚娜", "kiana"),
+    "Korali": ("科拉莉", "korali"),
+    "Lita": ("丽塔", "lita"),
+    "Theresa": ("德丽莎", "theresa"),
+    "Vita": ("薇塔", "vita"),
+}
+
+
+class LazyFactory:
+    """按需导入角色类的工厂, 只记录模块与类名, 可被 pickle 发往工作进程."""
+
+    __slots__ = ("module", "class_name", "_cls")
+
+    def __init__(self, module: str, class_name: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        # 具体角色类无参构造 (名称与属性由子类填入), 与 BaseCharacter 的签名不同, 故标为 type[Any].
+        self._cls: type[Any] | None = None
+
+    def load(self) -> type[Any]:
+        """导入并返回角色类."""
+        cls = self._cls
+        if cls is None:
+            module = importlib.import_module(f"{__name__}.{self.module}")
+            cls = self._cls = getattr(module, self.class_name)
+        return cls
+
+    def __call__(self) -> BaseCharacter:
+        cls = self._cls if self._cls is not None else self.load()
+        return cls()
+
+    def __reduce__(self) -> tuple[type[LazyFactory], tuple[str, str]]:
+        return (LazyFactory, (self.module, self.class_name))
+
+    def __repr__(self) -> str:
+        return f"LazyFactory({self.module!r}, {self.class_name!r})"
+
+
+@cache
+def _discover_unlisted() -> dict[str, tuple[str, str]]:
+    """导入清单外的模块并登记其中的角色类, 每个进程只扫描一次."""
+    listed_modules = {module for _, module in _MANIFEST.values()}
+    discovered: dict[str, tuple[str, str]] = {}
+    for module_info in pkgutil.iter_modules(__path__):
+        if module_info.name in listed_modules:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        for attr_name, attr in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(attr, BaseCharacter)
+                and attr is not BaseCharacter
+                and attr.__module__ == module.__name__
+                and attr_name not in _MANIFEST
+            ):
+                character = cast("type[Any]", attr)
+                discovered[attr_name] = (character().name, module_info.name)
+    return discovered
+
+
+def valkyrie_manifest() -> dict[str, tuple[str, str]]:
+    """返回完整清单(含扫描兜底结果): 类名 -> (显示名, 模块名)."""
+    return {**_MANIFEST, **_discover_unlisted()}
+
 
-for module_info in pkgutil.iter_modules(__path__):
-    module = importlib.import_module(f"{__name__}.{module_info.name}")
-    for attr_name, attr in inspect.getmembers(module, inspect.isclass):
-        if (
-            issubclass(attr, BaseCharacter)
-            and attr is not BaseCharacter
-            and attr.__module__ == module.__name__
-        ):
-            _VALKYRIE_CLASSES[attr_name] = attr
+def __getattr__(name: str) -> type[Any]:
+    entry = _MANIFEST.get(name) or _discover_unlisted().get(name)
+    if entry is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = LazyFactory(entry[1], name).load()
+    globals()[name] = cls
+    return cls
 
-for class_name, class_obj in _VALKYRIE_CLASSES.items():
-    globals()[class_name] = class_obj
 
-__all__ = list(_VALKYRIE_CLASSES.keys()) + ["build_valkyrie_roster"]  # pyright: ignore[reportUnsupportedDunderAll]
+__all__ = list(_MANIFEST.keys()) + [  # pyright: ignore[reportUnsupportedDunderAll]
+    "LazyFactory",
+    "build_valkyrie_roster",
+    "valkyrie_manifest",
+]
 
 
 def build_valkyrie_roster() -> dict[str, Callable[[], BaseCharacter]]:
-    """提供默认女武神角色工厂."""
+    """提供默认女武神角色工厂, 不导入也不实例化任何已登记角色."""
     roster: dict[str, Callable[[], BaseCharacter]] = {}
-    for cls in _VALKYRIE_CLASSES.values():
-        factory = cast("Callable[[], BaseCharacter]", cls)
-        instance = factory()
-        roster[instance.name] = factory
+    for class_name, (display_name, module) in valkyrie_manifest().items():
+        roster[display_name] = LazyFactory(module, class_name)
     return roster
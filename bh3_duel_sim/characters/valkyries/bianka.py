@@ -10,12 +10,19 @@ from ..base import BaseCharacter
 class Bianka(BaseCharacter):
     """比安卡: 护盾堆叠与追加斩击."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=16.0, defense=11.0, speed=22.0)
+    ACTIVE_COOLDOWN = 2
+    ACTIVE_BASE_DAMAGE = 16.0
+    SHIELD_GAIN = 5.0
+    BONUS_SLASH_CHANCE = 0.20
+    BONUS_SLASH_DAMAGE = 24.0
+
     def __init__(self) -> None:
         super().__init__(
             name="比安卡",
-            stats=CombatStats(max_hp=100.0, attack=16.0, defense=11.0, speed=22.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(2)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._shield_value = 0.0
         self._stunned = False
         self._confused = False
@@ -76,18 +83,21 @@ class Bianka(BaseCharacter):
     def _gain_shield(self, logger: BattleLogger) -> None:
         if self.is_passive_blocked():
             return
-        self._shield_value += 5.0
+        self.note_mechanic("Bianka.SHIELD_GAIN")
+        self._shield_value += self.SHIELD_GAIN
         self.log_action(
             logger,
             "passive",
-            f"的被动生效, 获得 5 点护盾 -> 当前 {self._shield_value:.2f}",
+            f"的被动生效, 获得 {self.SHIELD_GAIN:g} 点护盾 -> 当前 {self._shield_value:.2f}",
         )
 
     def _maybe_bonus_slash(self, opponent: BaseCharacter, logger: BattleLogger) -> None:
         if not opponent.is_alive:
             return
-        if self.roll_chance(0.20):
-            damage = self.calculate_skill_damage(24.0, opponent)
+        self.note_mechanic("Bianka.BONUS_SLASH_CHANCE")
+        if self.roll_chance(self.BONUS_SLASH_CHANCE):
+            self.note_mechanic("Bianka.BONUS_SLASH_DAMAGE")
+            damage = self.calculate_skill_damage(self.BONUS_SLASH_DAMAGE, opponent)
             self.log_action(
                 logger,
                 "active",
@@ -98,7 +108,8 @@ class Bianka(BaseCharacter):
     def use_active_skill(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
         if not self.consume_active_charge():
             return False
-        damage = self.calculate_skill_damage(16.0, opponent)
+        self.note_mechanic("Bianka.ACTIVE_BASE_DAMAGE")
+        damage = self.calculate_skill_damage(self.ACTIVE_BASE_DAMAGE, opponent)
         self.log_action(logger, "active", f"以主动替换普攻, 造成 {damage:.2f} 伤害")
         opponent.take_damage(damage, logger, "主动技能", attacker=self)
         self._gain_shield(logger)
@@ -10,12 +10,20 @@ from ..base import BaseCharacter
 class Bronya(BaseCharacter):
     """布洛妮娅: 多段炮火与混乱控制."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=18.0, defense=6.0, speed=20.0)
+    ACTIVE_COOLDOWN = 3
+    SHOT_COUNT = 5
+    SHOT_DAMAGE = 15.0
+    PIERCE_CHANCE = 0.15
+    CONFUSE_CHANCE = 0.25
+    CONFUSE_TURNS = 1
+
     def __init__(self) -> None:
         super().__init__(
             name="布洛妮娅",
-            stats=CombatStats(max_hp=100.0, attack=18.0, defense=6.0, speed=20.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(3)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
 
@@ -74,20 +82,35 @@ class Bronya(BaseCharacter):
     def use_active_skill(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
         if not self.consume_active_charge():
             return False
-        self.log_action(logger, "active", "释放主动技能, 发射五段炮火")
-        for idx in range(1, 6):
-            if not self.is_passive_blocked() and self.roll_chance(0.15):
+        self.note_mechanic("Bronya.SHOT_COUNT")
+        self.note_mechanic("Bronya.SHOT_DAMAGE")
+        self.log_action(logger, "active", f"释放主动技能, 发射 {self.SHOT_COUNT} 段炮火")
+        for idx in range(1, self.SHOT_COUNT + 1):
+            pierced = False
+            if not self.is_passive_blocked():
+                self.note_mechanic("Bronya.PIERCE_CHANCE")
+                pierced = self.roll_chance(self.PIERCE_CHANCE)
+            if pierced:
                 self.log_action(logger, "passive", f"第 {idx} 段触发被动, 无视防御与护盾")
-                opponent.take_damage(15.0, logger, "主动技能", ignore_shield=True, attacker=self)
+                opponent.take_damage(
+                    self.SHOT_DAMAGE, logger, "主动技能", ignore_shield=True, attacker=self
+                )
             else:
-                damage = self.calculate_skill_damage(15.0, opponent)
+                damage = self.calculate_skill_damage(self.SHOT_DAMAGE, opponent)
                 self.log_action(logger, "active", f"第 {idx} 段预期伤害 {damage:.2f}")
                 opponent.take_damage(damage, logger, "主动技能", attacker=self)
             if not opponent.is_alive:
                 break
-        if opponent.is_alive and not self.is_passive_blocked() and self.roll_chance(0.25):
-            opponent.apply_state("混乱", {"剩余回合": 1}, logger)
-            logger.emit(opponent.name, "passive", f"{self.name} 触发混乱, 将自伤 1 回合")
+        if opponent.is_alive and not self.is_passive_blocked():
+            self.note_mechanic("Bronya.CONFUSE_CHANCE")
+            if self.roll_chance(self.CONFUSE_CHANCE):
+                self.note_mechanic("Bronya.CONFUSE_TURNS")
+                opponent.apply_state("混乱", {"剩余回合": self.CONFUSE_TURNS}, logger)
+                logger.emit(
+                    opponent.name,
+                    "passive",
+                    f"{self.name} 触发混乱, 将自伤 {self.CONFUSE_TURNS} 回合",
+                )
         return False
 
     def perform_basic_attack(self, opponent: BaseCharacter, logger: BattleLogger) -> None:
@@ -10,21 +10,29 @@ from ..base import BaseCharacter
 class Chenxue(BaseCharacter):
     """晨雪: 以血换防的持续战士."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=16.0, defense=8.0, speed=21.0)
+    ACTIVE_COOLDOWN = 2
+    MAX_HP_MULTIPLIER = 1.5
+    DEFENSE_PENALTY_RATIO = 0.15
     LOW_HP_THRESHOLD = 30.0
     LOW_HP_HEAL = 5.0
+    LOST_HP_DAMAGE_RATIO = 0.12
+    ACTIVE_FLAT_BONUS = 8.0
 
     def __init__(self) -> None:
-        self._base_stats = CombatStats(max_hp=100.0, attack=16.0, defense=8.0, speed=21.0)
+        self._base_stats = self.BASE_STATS
         super().__init__(name="晨雪", stats=self._base_stats)
-        self.configure_active_cooldown(2)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
-        self._prebattle_defense_penalty = self._base_stats.defense * 0.15
+        self._prebattle_defense_penalty = self._base_stats.defense * self.DEFENSE_PENALTY_RATIO
         self._prebuff_logged = False
 
     def reset_for_battle(self) -> None:
         super().reset_for_battle()
-        self.set_max_hp_override(self._base_stats.max_hp * 1.5)
+        self.note_mechanic("Chenxue.MAX_HP_MULTIPLIER")
+        self.note_mechanic("Chenxue.DEFENSE_PENALTY_RATIO")
+        self.set_max_hp_override(self._base_stats.max_hp * self.MAX_HP_MULTIPLIER)
         self.current_hp = self.max_hp
         self.bonus_defense -= self._prebattle_defense_penalty
         self._stunned = False
@@ -41,8 +49,10 @@ class Chenxue(BaseCharacter):
         self._handle_stun(logger)
         self._handle_confusion(logger)
         self._handle_defense_break(logger)
+        self.note_mechanic("Chenxue.LOW_HP_THRESHOLD")
         if self.current_hp < self.LOW_HP_THRESHOLD and not self.is_passive_blocked():
-            self.log_action(logger, "passive", "触发低血回复, 恢复 5 点生命")
+            self.note_mechanic("Chenxue.LOW_HP_HEAL")
+            self.log_action(logger, "passive", f"触发低血回复, 恢复 {self.LOW_HP_HEAL:g} 点生命")
             self.heal(self.LOW_HP_HEAL, logger, "被动技能")
 
     def _handle_bleed(self, logger: BattleLogger) -> None:
@@ -86,7 +96,9 @@ class Chenxue(BaseCharacter):
         if not self.consume_active_charge():
             return False
         lost_hp = self.max_hp - self.current_hp
-        bonus_damage = lost_hp * 0.12 + 8.0
+        self.note_mechanic("Chenxue.LOST_HP_DAMAGE_RATIO")
+        self.note_mechanic("Chenxue.ACTIVE_FLAT_BONUS")
+        bonus_damage = lost_hp * self.LOST_HP_DAMAGE_RATIO + self.ACTIVE_FLAT_BONUS
         attack_value = self.effective_attack() + bonus_damage
         mitigated = max(0.0, attack_value - opponent.effective_defense())
         total_damage = max(1.0, mitigated)
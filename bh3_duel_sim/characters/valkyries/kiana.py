@@ -10,12 +10,17 @@ from ..base import BaseCharacter
 class Kiana(BaseCharacter):
     """琪亚娜: 主动爆发附带生命百分比真实伤害."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=18.0, defense=7.0, speed=21.0)
+    ACTIVE_COOLDOWN = 2
+    TRUE_DAMAGE_RATIO = 0.15
+    ACTIVE_BASE_DAMAGE = 20.0
+
     def __init__(self) -> None:
         super().__init__(
             name="琪亚娜",
-            stats=CombatStats(max_hp=100.0, attack=18.0, defense=7.0, speed=21.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(2)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
 
@@ -75,12 +80,18 @@ class Kiana(BaseCharacter):
         if not self.consume_active_charge():
             return False
         if opponent.is_alive and not self.is_passive_blocked():
-            bonus = max(1.0, opponent.current_hp * 0.15)
+            self.note_mechanic("Kiana.TRUE_DAMAGE_RATIO")
+            bonus = max(1.0, opponent.current_hp * self.TRUE_DAMAGE_RATIO)
             self.log_action(logger, "passive", f"被动发动, 先造成 {bonus:.2f} 点真实伤害")
             opponent.take_damage(bonus, logger, "被动:超限打击", ignore_shield=True, attacker=self)
         if opponent.is_alive:
-            damage = self.calculate_skill_damage(20.0, opponent)
-            self.log_action(logger, "active", f"主动追加 20 点伤害, 预期 {damage:.2f}")
+            self.note_mechanic("Kiana.ACTIVE_BASE_DAMAGE")
+            damage = self.calculate_skill_damage(self.ACTIVE_BASE_DAMAGE, opponent)
+            self.log_action(
+                logger,
+                "active",
+                f"主动追加 {self.ACTIVE_BASE_DAMAGE:g} 点伤害, 预期 {damage:.2f}",
+            )
             opponent.take_damage(damage, logger, "主动技能", attacker=self)
         return False
 
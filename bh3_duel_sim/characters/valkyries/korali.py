@@ -10,12 +10,18 @@ from ..base import BaseCharacter
 class Korali(BaseCharacter):
     """科拉莉: 连段输出 + 眩晕控制."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=17.0, defense=6.0, speed=21.0)
+    ACTIVE_COOLDOWN = 3
+    STUN_CHANCE = 0.20
+    STUN_TURNS = 2
+    SLASH_SEGMENTS = (20.0, 18.0, 18.0)
+
     def __init__(self) -> None:
         super().__init__(
             name="科拉莉",
-            stats=CombatStats(max_hp=100.0, attack=17.0, defense=6.0, speed=21.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(3)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
 
@@ -76,16 +82,22 @@ class Korali(BaseCharacter):
             return
         if not opponent.is_alive:
             return
-        if self.roll_chance(0.20):
-            opponent.apply_state("眩晕", {"剩余回合": 2}, logger)
-            logger.emit(opponent.name, "passive", f"{self.name} 的被动生效, 陷入 2 回合眩晕")
+        self.note_mechanic("Korali.STUN_CHANCE")
+        if self.roll_chance(self.STUN_CHANCE):
+            self.note_mechanic("Korali.STUN_TURNS")
+            opponent.apply_state("眩晕", {"剩余回合": self.STUN_TURNS}, logger)
+            logger.emit(
+                opponent.name,
+                "passive",
+                f"{self.name} 的被动生效, 陷入 {self.STUN_TURNS} 回合眩晕",
+            )
 
     def use_active_skill(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
         if not self.consume_active_charge():
             return False
         self.log_action(logger, "active", "释放主动技能, 进行三段斩击")
-        segments = [20.0, 18.0, 18.0]
-        for idx, base in enumerate(segments, start=1):
+        self.note_mechanic("Korali.SLASH_SEGMENTS")
+        for idx, base in enumerate(self.SLASH_SEGMENTS, start=1):
             damage = self.calculate_skill_damage(base, opponent)
             # 每段独立结算防御/护盾,避免未来遗忘该设定.
             self.log_action(
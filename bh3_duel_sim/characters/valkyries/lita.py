@@ -10,15 +10,20 @@ from ..base import BaseCharacter
 class Lita(BaseCharacter):
     """丽塔: 高速削甲并反击的刺客."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=22.0, defense=9.0, speed=25.0)
+    ACTIVE_COOLDOWN = 2
+    COUNTER_CHANCE = 0.18
     COUNTER_BASE_DAMAGE = 12.0
+    ACTIVE_BASE_DAMAGE = 15.0
     ARMOR_SHRED_VALUE = 3.0
+    ARMOR_SHRED_TURNS = 2
 
     def __init__(self) -> None:
         super().__init__(
             name="丽塔",
-            stats=CombatStats(max_hp=100.0, attack=22.0, defense=9.0, speed=25.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(2)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
 
@@ -76,11 +81,14 @@ class Lita(BaseCharacter):
     def use_active_skill(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
         if not self.consume_active_charge():
             return False
-        damage = self.calculate_skill_damage(15.0, opponent)
+        self.note_mechanic("Lita.ACTIVE_BASE_DAMAGE")
+        damage = self.calculate_skill_damage(self.ACTIVE_BASE_DAMAGE, opponent)
         self.log_action(logger, "active", f"发动削甲迅袭, 造成 {damage:.2f} 并降低对方防御")
         opponent.take_damage(damage, logger, "主动技能", attacker=self)
         current = opponent.states.get("减防", {"剩余回合": 0, "减防": 0.0})
-        current["剩余回合"] = 2
+        self.note_mechanic("Lita.ARMOR_SHRED_TURNS")
+        self.note_mechanic("Lita.ARMOR_SHRED_VALUE")
+        current["剩余回合"] = self.ARMOR_SHRED_TURNS
         current["减防"] = self.ARMOR_SHRED_VALUE
         opponent.apply_state("减防", current, logger)
         return True
@@ -105,12 +113,12 @@ class Lita(BaseCharacter):
         category = logger.classify_source(source)
         # 被动判定“主动攻击”：只要不是状态/治疗/被动来源的直接伤害(含普攻)，都视为可闪避对象.
         is_direct_attack = category not in {"state", "heal", "passive"}
-        if (
-            is_direct_attack
-            and attacker
-            and not self.is_passive_blocked()
-            and self.roll_chance(0.18)
-        ):
+        countered = False
+        if is_direct_attack and attacker and not self.is_passive_blocked():
+            self.note_mechanic("Lita.COUNTER_CHANCE")
+            countered = self.roll_chance(self.COUNTER_CHANCE)
+        if countered and attacker:
+            self.note_mechanic("Lita.COUNTER_BASE_DAMAGE")
             damage = max(0.0, self.COUNTER_BASE_DAMAGE - attacker.effective_defense())
             self.log_action(
                 logger,
@@ -10,15 +10,24 @@ from ..base import ATTRIBUTE_DEBUFF_STATES, CONTROL_STATES, BaseCharacter
 class Theresa(BaseCharacter):
     """德丽莎: 抵御控制即回复, 攻击封锁对手被动."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=23.0, defense=7.0, speed=24.0)
+    ACTIVE_COOLDOWN = 3
     NEGATIVE_STATE_NAMES = ATTRIBUTE_DEBUFF_STATES | CONTROL_STATES
     PASSIVE_MARK_KEY = "theresa_passive_mark"
+    SANCTIFIED_HEAL_RATIO = 0.10
+    HIT_CHANCE = 0.70
+    ACTIVE_BASE_DAMAGE = 30.0
+    MISS_TRUE_DAMAGE = 1.0
+    MISS_HEAL = 18.0
+    DISABLE_CHANCE = 0.25
+    DISABLE_TURNS = 2
 
     def __init__(self) -> None:
         super().__init__(
             name="德丽莎",
-            stats=CombatStats(max_hp=100.0, attack=23.0, defense=7.0, speed=24.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(3)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
 
@@ -51,7 +60,8 @@ class Theresa(BaseCharacter):
         if state.get(self.PASSIVE_MARK_KEY):
             return
         state[self.PASSIVE_MARK_KEY] = 1.0
-        heal_value = max(0.0, self.max_hp * 0.10)
+        self.note_mechanic("Theresa.SANCTIFIED_HEAL_RATIO")
+        heal_value = max(0.0, self.max_hp * self.SANCTIFIED_HEAL_RATIO)
         self.heal(heal_value, logger, "被动:圣血赐福")
 
     def on_state_inflicted(self, state_name: str, logger: BattleLogger) -> None:
@@ -102,18 +112,25 @@ class Theresa(BaseCharacter):
         if not self.consume_active_charge():
             return False
         self.log_action(logger, "active", "发动圣血祷言, 本回合以主动替换普攻")
-        if self.roll_chance(0.70):
-            damage = self.calculate_skill_damage(30.0, opponent)
+        self.note_mechanic("Theresa.HIT_CHANCE")
+        if self.roll_chance(self.HIT_CHANCE):
+            self.note_mechanic("Theresa.ACTIVE_BASE_DAMAGE")
+            damage = self.calculate_skill_damage(self.ACTIVE_BASE_DAMAGE, opponent)
             self.log_action(logger, "active", f"祷言命中, 造成 {damage:.2f} 点伤害")
             opponent.take_damage(damage, logger, "主动技能", attacker=self)
         else:
+            self.note_mechanic("Theresa.MISS_TRUE_DAMAGE")
+            self.note_mechanic("Theresa.MISS_HEAL")
             self.log_action(
                 logger,
                 "active",
-                "祷言失误, 仅造成 1 点真实伤害并回复 18 点生命",
+                f"祷言失误, 仅造成 {self.MISS_TRUE_DAMAGE:g} 点真实伤害"
+                f"并回复 {self.MISS_HEAL:g} 点生命",
             )
-            opponent.take_damage(1.0, logger, "主动技能", ignore_shield=True, attacker=self)
-            self.heal(18.0, logger, "主动技能:圣血恢复")
+            opponent.take_damage(
+                self.MISS_TRUE_DAMAGE, logger, "主动技能", ignore_shield=True, attacker=self
+            )
+            self.heal(self.MISS_HEAL, logger, "主动技能:圣血恢复")
         if opponent.is_alive:
             self._try_disable_opponent_passive(opponent, logger, "主动技能")
         return True
@@ -135,7 +152,9 @@ class Theresa(BaseCharacter):
             return
         if not opponent.is_alive:
             return
-        if not self.roll_chance(0.25):
+        self.note_mechanic("Theresa.DISABLE_CHANCE")
+        if not self.roll_chance(self.DISABLE_CHANCE):
             return
-        opponent.apply_state("被动封锁", {"剩余回合": 2}, logger)
+        self.note_mechanic("Theresa.DISABLE_TURNS")
+        opponent.apply_state("被动封锁", {"剩余回合": self.DISABLE_TURNS}, logger)
         logger.emit(opponent.name, "state", f"由于 {self.name} 的被动技能，自身被动触发失败")
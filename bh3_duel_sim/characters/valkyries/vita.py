@@ -10,17 +10,22 @@ from ..base import BaseCharacter
 class Vita(BaseCharacter):
     """薇塔: 羽翼姿态强化, 被动魅惑与自救."""
 
+    BASE_STATS = CombatStats(max_hp=100.0, attack=20.0, defense=8.0, speed=25.0)
+    ACTIVE_COOLDOWN = 3
     WING_ATTACK_BONUS = 7.0
     WING_DEFENSE_BONUS = 3.0
+    WING_TURNS = 1
     CHARM_CHANCE = 0.20
+    CHARM_TURNS = 2
     REVIVE_CHANCE = 0.15
+    REVIVE_HP_RATIO = 0.20
 
     def __init__(self) -> None:
         super().__init__(
             name="薇塔",
-            stats=CombatStats(max_hp=100.0, attack=20.0, defense=8.0, speed=25.0),
+            stats=self.BASE_STATS,
         )
-        self.configure_active_cooldown(3)
+        self.configure_active_cooldown(self.ACTIVE_COOLDOWN)
         self._stunned = False
         self._confused = False
         self._wing_form_turns = 0
@@ -89,8 +94,14 @@ class Vita(BaseCharacter):
     def use_active_skill(self, opponent: BaseCharacter, logger: BattleLogger) -> bool:
         if not self.consume_active_charge():
             return False
-        self._wing_form_turns = 1
-        self.log_action(logger, "active", "展开全知的羽翼, 攻击+7/防御+3 持续 1 回合")
+        self.note_mechanic("Vita.WING_TURNS")
+        self._wing_form_turns = self.WING_TURNS
+        self.log_action(
+            logger,
+            "active",
+            f"展开全知的羽翼, 攻击+{self.WING_ATTACK_BONUS:g}/防御+{self.WING_DEFENSE_BONUS:g} "
+            f"持续 {self.WING_TURNS} 回合",
+        )
         return False
 
     def perform_basic_attack(self, opponent: BaseCharacter, logger: BattleLogger) -> None:
@@ -104,12 +115,14 @@ class Vita(BaseCharacter):
     def effective_attack(self) -> float:
         value = super().effective_attack()
         if self._wing_form_turns > 0:
+            self.note_mechanic("Vita.WING_ATTACK_BONUS")
             value += self.WING_ATTACK_BONUS
         return value
 
     def effective_defense(self) -> float:
         value = super().effective_defense()
         if self._wing_form_turns > 0:
+            self.note_mechanic("Vita.WING_DEFENSE_BONUS")
             value += self.WING_DEFENSE_BONUS
         return value
 
@@ -141,15 +154,23 @@ class Vita(BaseCharacter):
             self._try_revive(logger)
 
     def _try_apply_charm(self, attacker: BaseCharacter, logger: BattleLogger) -> None:
+        self.note_mechanic("Vita.CHARM_CHANCE")
         if not self.roll_chance(self.CHARM_CHANCE):
             return
-        attacker.apply_state("魅惑", {"剩余回合": 2}, logger)
-        logger.emit(attacker.name, "state", f"{self.name} 的被动发动, 陷入 2 回合魅惑")
+        self.note_mechanic("Vita.CHARM_TURNS")
+        attacker.apply_state("魅惑", {"剩余回合": self.CHARM_TURNS}, logger)
+        logger.emit(
+            attacker.name,
+            "state",
+            f"{self.name} 的被动发动, 陷入 {self.CHARM_TURNS} 回合魅惑",
+        )
 
     def _try_revive(self, logger: BattleLogger) -> None:
+        self.note_mechanic("Vita.REVIVE_CHANCE")
         if not self.roll_chance(self.REVIVE_CHANCE):
             return
-        self.current_hp = max(self.max_hp * 0.20, 1.0)
+        self.note_mechanic("Vita.REVIVE_HP_RATIO")
+        self.current_hp = max(self.max_hp * self.REVIVE_HP_RATIO, 1.0)
         self.log_action(
             logger,
             "passive",
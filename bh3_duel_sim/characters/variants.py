@@ -0,0 +1,113 @@
+"""参数化角色变体: 不改源码地覆盖基础属性与类常量."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import fields, replace
+from typing import Any, Callable
+
+from ..stats import CombatStats
+from .base import BaseCharacter
+from .valkyries import LazyFactory
+
+STAT_FIELDS: frozenset[str] = frozenset(field.name for field in fields(CombatStats))
+# 变体类缓存上限, 超出后淘汰最久未用的一项; 工厂自身仍持有已建好的类.
+VARIANT_CACHE_SIZE = 1024
+
+# (基类, 覆盖项) -> 变体类; 每个进程各自缓存, 按最近使用排序.
+_VARIANT_CACHE: OrderedDict[tuple[type[BaseCharacter], tuple[tuple[str, object], ...]], type] = (
+    OrderedDict()
+)
+_VARIANT_CACHE_LOCK = threading.Lock()
+
+
+def _coerce(original: object, value: object) -> object:
+    # 保持原常量的类型: 回合数等整数常量四舍五入, 其余按浮点处理.
+    if isinstance(original, bool):
+        return bool(value)
+    if isinstance(original, int) and isinstance(value, (int, float)):
+        return int(round(value))
+    if isinstance(original, float) and isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+def make_variant(base: type[BaseCharacter], overrides: Mapping[str, object]) -> type[BaseCharacter]:
+    """生成覆盖了属性或类常量的子类.
+
+    小写键为 CombatStats 字段(如 "speed"), 大写键为类常量(如 "STUN_CHANCE").
+    属性覆盖要求角色通过 BASE_STATS 声明基础属性.
+    """
+    key = (base, tuple(sorted(overrides.items())))
+    with _VARIANT_CACHE_LOCK:
+        cached = _VARIANT_CACHE.get(key)
+        if cached is not None:
+            _VARIANT_CACHE.move_to_end(key)
+            return cached
+    stat_changes: dict[str, float] = {}
+    attrs: dict[str, object] = {}
+    for name, value in overrides.items():
+        if name in STAT_FIELDS:
+            if not isinstance(value, (int, float)):
+                raise ValueError(f"属性 {name} 需要数值, 收到 {value!r}")
+            stat_changes[name] = float(value)
+        elif name.isupper() and hasattr(base, name):
+            attrs[name] = _coerce(getattr(base, name), value)
+        else:
+            raise ValueError(f"{base.__name__} 没有可调参数: {name}")
+    if stat_changes:
+        base_stats = getattr(base, "BASE_STATS", None)
+        if not isinstance(base_stats, CombatStats):
+            raise ValueError(f"{base.__name__} 未声明 BASE_STATS, 无法覆盖基础属性")
+        attrs["BASE_STATS"] = replace(base_stats, **stat_changes)
+    attrs["__module__"] = base.__module__
+    variant = type(f"{base.__name__}Variant", (base,), attrs)
+    with _VARIANT_CACHE_LOCK:
+        # 多线程同时创建时以先登记的为准, 保证缓存中同一组参数只对应一个类.
+        variant = _VARIANT_CACHE.setdefault(key, variant)
+        _VARIANT_CACHE.move_to_end(key)
+        while len(_VARIANT_CACHE) > VARIANT_CACHE_SIZE:
+            _VARIANT_CACHE.popitem(last=False)
+    return variant
+
+
+def resolve_class(spawn: Callable[[], BaseCharacter]) -> type[BaseCharacter]:
+    """取得工厂对应的角色类(角色类、LazyFactory 或 VariantFactory)."""
+    if isinstance(spawn, (LazyFactory, VariantFactory)):
+        return spawn.load()
+    if isinstance(spawn, type) and issubclass(spawn, BaseCharacter):
+        return spawn
+    return type(spawn())
+
+
+class VariantFactory:
+    """变体角色工厂, 只记录基础工厂与覆盖项, 可被 pickle 发往工作进程."""
+
+    __slots__ = ("base", "overrides", "_cls")
+
+    def __init__(self, base: Callable[[], BaseCharacter], overrides: Mapping[str, object]) -> None:
+        self.base = base
+        self.overrides: tuple[tuple[str, object], ...] = tuple(sorted(overrides.items()))
+        # 与 LazyFactory 相同, 变体类无参构造, 故标为 type[Any].
+        self._cls: type[Any] | None = None
+
+    def load(self) -> type[Any]:
+        """构建(或取缓存)变体类."""
+        cls = self._cls
+        if cls is None:
+            cls = self._cls = make_variant(resolve_class(self.base), dict(self.overrides))
+        return cls
+
+    def __call__(self) -> BaseCharacter:
+        cls = self._cls if self._cls is not None else self.load()
+        return cls()
+
+    def __reduce__(
+        self,
+    ) -> tuple[type[VariantFactory], tuple[Callable[[], BaseCharacter], dict[str, object]]]:
+        return (VariantFactory, (self.base, dict(self.overrides)))
+
+    def __repr__(self) -> str:
+        return f"VariantFactory({self.base!r}, {dict(self.overrides)!r})"
@@ -0,0 +1,148 @@
+"""循环赛检查点: 定期把已完成对阵、当前对阵进度与随机源状态原子写入日志文件.
+
+round_robin_statistics 逐场消耗驱动器的随机源, 因此续跑时除了各组对阵的胜场,
+还要恢复随机源的精确位置: 检查点保存 random.Random.getstate(), 续跑时先还原再从
+中断的那一场继续, 最终结果与不中断、同一种子的运行完全一致.
+
+检查点同时记录运行参数 (名单、每组场数、回合上限、回合模式) 与引擎、角色指纹,
+与本次运行不符时拒绝续跑, 避免把两次不同设定的计数拼在一起.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.results import character_fingerprint, engine_fingerprint
+
+if TYPE_CHECKING:
+    from bh3_duel_sim.simulator import BattleSimulator
+
+DEFAULT_INTERVAL_SECONDS = 30.0
+
+
+class RoundRobinCheckpoint:
+    """循环赛检查点文件.
+
+    interval 为两次写盘的最短间隔 (秒), 每组对阵结束时也会写盘; 正常跑完后删除文件.
+    文件已存在时视为续跑, 由 round_robin_statistics 校验参数并恢复进度.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], interval: float = DEFAULT_INTERVAL_SECONDS
+    ) -> None:
+        self.path = Path(path)
+        self.interval = interval
+        self.params: dict[str, Any] | None = None
+        # 已完成对阵 (名称对) -> 胜场 (有平局时另含 DRAW_KEY).
+        self.completed: dict[tuple[str, str], dict[str, int]] = {}
+        # 进行中的对阵: (名称对, 已完成场数, 胜场); 无则为 None.
+        self.current: tuple[tuple[str, str], int, dict[str, int]] | None = None
+        self.rng_state: tuple[Any, ...] | None = None
+        self.saves = 0
+        self._next_save = time.monotonic() + interval
+        if self.path.exists():
+            self._load()
+
+    @property
+    def resuming(self) -> bool:
+        return self.params is not None
+
+    def _load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"无法识别的检查点格式: {self.path}")
+        self.params = data["params"]
+        self.completed = {
+            (entry["names"][0], entry["names"][1]): dict(entry["wins"])
+            for entry in data["completed"]
+        }
+        current = data.get("current")
+        if current is not None:
+            names = (current["names"][0], current["names"][1])
+            self.current = (names, int(current["battles"]), dict(current["wins"]))
+        version, internal, gauss_next = data["rng"]
+        self.rng_state = (version, tuple(internal), gauss_next)
+
+    def begin(
+        self,
+        simulator: BattleSimulator,
+        roster: dict[str, Callable[[], BaseCharacter]],
+        iterations_per_pair: int,
+    ) -> None:
+        """校验 (续跑) 或登记 (新跑) 运行参数; 续跑时把随机源恢复到中断位置."""
+        params = {
+            "engine": engine_fingerprint(),
+            "roster": {name: character_fingerprint(spawn) for name, spawn in roster.items()},
+            "iterations_per_pair": iterations_per_pair,
+            **simulator.settings,
+        }
+        if self.params is None:
+            self.params = params
+        elif self.params != params:
+            changed = sorted(key for key in params if params[key] != self.params.get(key))
+            raise ValueError(f"检查点 {self.path} 与本次运行参数不符: {', '.join(changed)}")
+        elif self.rng_state is not None:
+            simulator.rng.setstate(self.rng_state)
+        self._next_save = time.monotonic() + self.interval
+
+    def resume_pair(self, names: tuple[str, str]) -> tuple[int, dict[str, int]] | None:
+        """中断时正在进行的对阵返回 (已完成场数, 胜场), 否则为 None."""
+        if self.current is None or self.current[0] != names:
+            return None
+        _, battles, wins = self.current
+        self.current = None
+        return battles, dict(wins)
+
+    def tick(
+        self, rng: random.Random, names: tuple[str, str], battles: int, wins: dict[str, int]
+    ) -> None:
+        """运行器每跑完一块调用一次, 距上次写盘超过间隔时写盘."""
+        if time.monotonic() >= self._next_save:
+            self.current = (names, battles, dict(wins))
+            self.save(rng)
+
+    def finish_pair(self, rng: random.Random, names: tuple[str, str], wins: dict[str, int]) -> None:
+        """登记一组已完成的对阵并写盘."""
+        self.completed[names] = dict(wins)
+        self.current = None
+        self.save(rng)
+
+    def save(self, rng: random.Random) -> None:
+        """原子写入检查点: 先写临时文件并落盘, 再替换正式文件."""
+        version, internal, gauss_next = rng.getstate()
+        payload = {
+            "format": CHECKPOINT_FORMAT,
+            "params": self.params,
+            "completed": [
+                {"names": list(names), "wins": wins} for names, wins in self.completed.items()
+            ],
+            "current": None
+            if self.current is None
+            else {
+                "names": list(self.current[0]),
+                "battles": self.current[1],
+                "wins": self.current[2],
+            },
+            "rng": [version, list(internal), gauss_next],
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+        self.saves += 1
+        self._next_save = time.monotonic() + self.interval
+
+    def clear(self) -> None:
+        """运行完成后删除检查点文件."""
+        self.path.unlink(missing_ok=True)
+
+
+CHECKPOINT_FORMAT = 1
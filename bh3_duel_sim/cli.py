@@ -0,0 +1,469 @@
+"""命令行入口: 面向性能的批量对战运行器."""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import csv
+import io
+import json
+import pstats
+import random
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.characters.valkyries import LazyFactory, valkyrie_manifest
+from bh3_duel_sim.parallel import (
+    BACKEND_AUTO,
+    BACKENDS,
+    DEFAULT_CHUNK_SIZE,
+    PairJob,
+    SimulationPool,
+    gil_enabled,
+    resolve_backend,
+)
+from bh3_duel_sim.progress import (
+    DEFAULT_INTERVAL_SECONDS,
+    ProgressSink,
+    ProgressTracker,
+    PrometheusTextfile,
+    TerminalProgress,
+)
+from bh3_duel_sim.results import MatchupStore, character_fingerprint
+from bh3_duel_sim.simulator import (
+    DEFAULT_MAX_ROUNDS,
+    DEFAULT_STALEMATE_ROUNDS,
+    BattleSimulator,
+    pair_seed,
+    run_single_verbose_battle,
+    win_rate_half_width,
+)
+
+
+@dataclass
+class PairTally:
+    """单组对阵的累计胜场与平局."""
+
+    name_a: str
+    name_b: str
+    base_seed: int
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+
+    @property
+    def battles(self) -> int:
+        return self.wins_a + self.wins_b + self.draws
+
+    @property
+    def half_width(self) -> float:
+        return win_rate_half_width(self.wins_a, self.battles)
+
+
+def _resolve_roster(tokens: Sequence[str] | None) -> dict[str, Callable[[], BaseCharacter]]:
+    """按显示名或类名挑选角色, 只构造惰性工厂, 不导入角色模块."""
+    manifest = valkyrie_manifest()
+    by_display = {display: (cls, module) for cls, (display, module) in manifest.items()}
+    if not tokens:
+        return {display: LazyFactory(module, cls) for display, (cls, module) in by_display.items()}
+    roster: dict[str, Callable[[], BaseCharacter]] = {}
+    for token in tokens:
+        if token in by_display:
+            cls, module = by_display[token]
+            roster[token] = LazyFactory(module, cls)
+        elif token in manifest:
+            display, module = manifest[token]
+            roster[display] = LazyFactory(module, token)
+        else:
+            known = ", ".join(by_display)
+            raise SystemExit(f"未知角色: {token} (可选: {known})")
+    return roster
+
+
+def _split_names(values: Sequence[str] | None) -> list[str]:
+    names: list[str] = []
+    for value in values or []:
+        names.extend(part for part in value.split(",") if part)
+    return names
+
+
+def _plan_pairs(
+    args: argparse.Namespace,
+) -> tuple[dict[str, Callable[[], BaseCharacter]], list[tuple[str, str]]]:
+    """根据 --pair / --gauntlet / --roster 确定名单与对阵列表."""
+    names = _split_names(args.roster)
+    if args.pair:
+        roster = _resolve_roster(args.pair)
+        pair_names = list(roster)
+        if len(pair_names) != len(args.pair) or len(pair_names) < MIN_PLAYERS:
+            raise SystemExit("--pair 需要两名不同的角色")
+        return roster, [(pair_names[0], pair_names[1])]
+    roster = _resolve_roster(names or None)
+    if args.gauntlet:
+        challenger_roster = _resolve_roster([args.gauntlet])
+        challenger = next(iter(challenger_roster))
+        roster = {**challenger_roster, **roster}
+        return roster, [(challenger, name) for name in roster if name != challenger]
+    order = list(roster)
+    if len(order) < MIN_PLAYERS:
+        raise SystemExit("至少需要两名角色")
+    return roster, [
+        (order[i], order[j]) for i in range(len(order)) for j in range(i + 1, len(order))
+    ]
+
+
+def _apply_cached(
+    args: argparse.Namespace,
+    tallies: list[PairTally],
+    store: MatchupStore,
+    fingerprints: dict[str, str],
+    progress: ProgressTracker | None,
+) -> list[PairTally]:
+    """用缓存填入命中的对阵, 返回仍需模拟的对阵."""
+    pending = []
+    for tally in tallies:
+        names = (tally.name_a, tally.name_b)
+        cached = store.lookup({n: fingerprints[n] for n in names}, battles=args.iterations)
+        if cached is None:
+            pending.append(tally)
+            continue
+        tally.wins_a = cached[tally.name_a]
+        tally.wins_b = cached[tally.name_b]
+        tally.draws = args.iterations - tally.wins_a - tally.wins_b
+        if progress is not None:
+            progress.record_cached(tally.name_a, tally.name_b, args.iterations, tally.wins_a)
+    return pending
+
+
+def _record_results(
+    args: argparse.Namespace,
+    tallies: list[PairTally],
+    store: MatchupStore,
+    fingerprints: dict[str, str],
+) -> None:
+    for tally in tallies:
+        store.record(
+            {n: fingerprints[n] for n in (tally.name_a, tally.name_b)},
+            battles=args.iterations,
+            wins={tally.name_a: tally.wins_a, tally.name_b: tally.wins_b},
+        )
+    store.save()
+
+
+def _run_fixed(
+    args: argparse.Namespace,
+    pool: SimulationPool,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    pending: list[PairTally],
+    progress: ProgressTracker | None,
+) -> int:
+    """每组对阵各跑 --iterations 场, 返回模拟场数."""
+    jobs = [
+        PairJob(roster[t.name_a], roster[t.name_b], t.base_seed, 0, args.iterations)
+        for t in pending
+    ]
+    on_chunk = _progress_callback(progress, pending)
+    for tally, (wins_a, wins_b) in zip(pending, pool.run(jobs, on_chunk)):
+        tally.wins_a = wins_a
+        tally.wins_b = wins_b
+        tally.draws = args.iterations - wins_a - wins_b
+    return args.iterations * len(pending)
+
+
+def _run_precision(
+    args: argparse.Namespace,
+    pool: SimulationPool,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    tallies: list[PairTally],
+    progress: ProgressTracker | None,
+) -> int:
+    """精度模式: 每轮为尚未达标的对阵追加一批, 直到置信区间半宽达标或触顶."""
+    simulated = 0
+    while True:
+        pending = [
+            t
+            for t in tallies
+            if t.battles < args.max_iterations
+            and (t.battles < args.batch or t.half_width > args.precision)
+        ]
+        if progress is not None:
+            # 已达标或触顶的对阵不再追加, 计划场数收缩为已完成场数.
+            for tally in tallies:
+                if tally not in pending:
+                    progress.finish(tally.name_a, tally.name_b)
+        if not pending:
+            return simulated
+        jobs = [
+            PairJob(
+                roster[t.name_a],
+                roster[t.name_b],
+                t.base_seed,
+                t.battles,
+                min(t.battles + args.batch, args.max_iterations),
+            )
+            for t in pending
+        ]
+        on_chunk = _progress_callback(progress, pending)
+        for job, tally, (wins_a, wins_b) in zip(jobs, pending, pool.run(jobs, on_chunk)):
+            played = job.stop - job.start
+            tally.wins_a += wins_a
+            tally.wins_b += wins_b
+            tally.draws += played - wins_a - wins_b
+            simulated += played
+
+
+def _run(
+    args: argparse.Namespace,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    tallies: list[PairTally],
+    store: MatchupStore | None = None,
+    progress: ProgressTracker | None = None,
+) -> int:
+    """执行全部对阵, 返回本次实际模拟的场数; 精度模式不使用缓存."""
+    if progress is not None:
+        planned = args.max_iterations if args.precision else args.iterations
+        for tally in tallies:
+            progress.plan(tally.name_a, tally.name_b, planned)
+    with SimulationPool(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_rounds=args.max_rounds,
+        stalemate_rounds=args.stalemate_rounds,
+        backend=args.backend,
+    ) as pool:
+        if args.precision:
+            return _run_precision(args, pool, roster, tallies, progress)
+        if store is None:
+            return _run_fixed(args, pool, roster, tallies, progress)
+        fingerprints = {name: character_fingerprint(roster[name]) for name in roster}
+        pending = _apply_cached(args, tallies, store, fingerprints, progress)
+        simulated = _run_fixed(args, pool, roster, pending, progress)
+        _record_results(args, pending, store, fingerprints)
+        return simulated
+
+
+def _choose_seed(explicit: int | None, store: MatchupStore | None) -> int:
+    """未指定种子时沿用缓存文件记录的种子, 使打印的种子能复现缓存结果; 再无则随机."""
+    if explicit is not None:
+        return explicit
+    stored = store.settings.get(SEED_SETTING) if store is not None else None
+    return stored if isinstance(stored, int) else random.randrange(1 << 31)
+
+
+def _progress_callback(
+    progress: ProgressTracker | None, pending: list[PairTally]
+) -> Callable[[int, int, int, int], None] | None:
+    if progress is None:
+        return None
+
+    def on_chunk(idx: int, battles: int, wins_a: int, wins_b: int) -> None:
+        progress.add(pending[idx].name_a, pending[idx].name_b, battles, wins_a)
+
+    return on_chunk
+
+
+def _build_progress(args: argparse.Namespace) -> ProgressTracker | None:
+    sinks: list[ProgressSink] = []
+    if args.progress:
+        sinks.append(TerminalProgress(sys.stderr))
+    if args.metrics_file:
+        sinks.append(PrometheusTextfile(args.metrics_file))
+    return ProgressTracker(sinks, args.progress_interval) if sinks else None
+
+
+def _overall(tallies: list[PairTally]) -> dict[str, float]:
+    wins: dict[str, int] = {}
+    battles: dict[str, int] = {}
+    for t in tallies:
+        for name, count in ((t.name_a, t.wins_a), (t.name_b, t.wins_b)):
+            wins[name] = wins.get(name, 0) + count
+            battles[name] = battles.get(name, 0) + t.battles
+    return {name: wins[name] / battles[name] if battles[name] else 0.0 for name in wins}
+
+
+def _render(
+    fmt: str,
+    seed: int,
+    tallies: list[PairTally],
+    simulated: int,
+    elapsed: float,
+) -> str:
+    throughput = simulated / elapsed if elapsed > 0 else 0.0
+    overall = _overall(tallies)
+    if fmt == "json":
+        payload = {
+            "seed": seed,
+            "simulated_battles": simulated,
+            "elapsed_seconds": elapsed,
+            "battles_per_second": throughput,
+            "overall": overall,
+            "matchups": [
+                {
+                    "a": t.name_a,
+                    "b": t.name_b,
+                    "wins_a": t.wins_a,
+                    "wins_b": t.wins_b,
+                    "draws": t.draws,
+                    "battles": t.battles,
+                    "rate_a": t.wins_a / t.battles if t.battles else 0.0,
+                    "half_width": t.half_width,
+                }
+                for t in tallies
+            ],
+        }
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["a", "b", "wins_a", "wins_b", "draws", "battles", "rate_a", "half_width"])
+        for t in tallies:
+            rate = t.wins_a / t.battles if t.battles else 0.0
+            writer.writerow(
+                [
+                    t.name_a,
+                    t.name_b,
+                    t.wins_a,
+                    t.wins_b,
+                    t.draws,
+                    t.battles,
+                    f"{rate:.6f}",
+                    f"{t.half_width:.6f}",
+                ]
+            )
+        return buffer.getvalue().rstrip("\n")
+
+    lines = ["整体胜率:"]
+    lines.extend(f"- {name}: {rate:.2%}" for name, rate in overall.items())
+    lines.append("\n对阵详情:")
+    for t in tallies:
+        rate_a = t.wins_a / t.battles if t.battles else 0.0
+        rate_b = t.wins_b / t.battles if t.battles else 0.0
+        draws = f", 平局 {t.draws / t.battles:.2%}" if t.draws else ""
+        lines.append(
+            f"- {t.name_a} vs {t.name_b}: {t.name_a} {rate_a:.2%} / {t.name_b} {rate_b:.2%}"
+            f"{draws} ({t.battles} 场, ±{t.half_width:.2%})"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构造命令行参数解析器."""
+    parser = argparse.ArgumentParser(prog="bh3-duel-sim", description="崩坏3 对战胜率模拟")
+    parser.add_argument(
+        "--roster",
+        action="append",
+        metavar="NAMES",
+        help="参赛角色, 显示名或类名, 逗号分隔或多次指定 (默认全部女武神)",
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--pair", nargs=2, metavar=("A", "B"), help="只跑一组对阵")
+    target.add_argument("--gauntlet", metavar="NAME", help="挑战者对阵名单中其余所有角色")
+    amount = parser.add_mutually_exclusive_group()
+    amount.add_argument("--iterations", type=int, default=10_000, help="每组对阵场数")
+    amount.add_argument(
+        "--precision",
+        type=float,
+        metavar="HALF_WIDTH",
+        help="精度目标: 95%% 置信区间半宽 (如 0.01), 达标即停",
+    )
+    parser.add_argument("--max-iterations", type=int, default=200_000, help="精度模式单组上限")
+    parser.add_argument("--batch", type=int, default=2_000, help="精度模式每轮追加场数")
+    parser.add_argument("--workers", type=int, default=1, help="工作进程/线程数")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=BACKEND_AUTO,
+        help="并行后端, auto 在 GIL 关闭的自由线程构建上用线程, 否则用进程",
+    )
+    parser.add_argument(
+        "--max-rounds", type=int, default=DEFAULT_MAX_ROUNDS, help="单场回合上限, 超过判平局"
+    )
+    parser.add_argument(
+        "--stalemate-rounds",
+        type=int,
+        default=DEFAULT_STALEMATE_ROUNDS,
+        help="双方生命连续这么多回合不变即判平局, 0 为关闭",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="多进程分块场数")
+    parser.add_argument(
+        "--seed", type=int, help="基础随机种子 (默认沿用 --store 记录的种子, 否则随机并打印)"
+    )
+    parser.add_argument("--format", choices=("table", "json", "csv"), default="table")
+    parser.add_argument("--store", metavar="PATH", help="对阵结果缓存文件, 未改动的对阵直接复用")
+    parser.add_argument("--no-sample-log", action="store_true", help="不输出示例对局日志")
+    parser.add_argument(
+        "--annotate",
+        type=int,
+        default=0,
+        metavar="N",
+        help="示例对局每回合用 N 场推演标注胜率 (0 为不标注)",
+    )
+    parser.add_argument(
+        "--progress", action="store_true", help="在 stderr 显示进度、吞吐、预计剩余时间与置信区间"
+    )
+    parser.add_argument(
+        "--metrics-file", metavar="PATH", help="定期写入 Prometheus 文本格式的进度指标"
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=DEFAULT_INTERVAL_SECONDS,
+        metavar="SECONDS",
+        help="进度刷新的最短间隔",
+    )
+    parser.add_argument("--profile", action="store_true", help="用 cProfile 分析主进程耗时")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """解析参数并运行."""
+    args = build_parser().parse_args(argv)
+    store = MatchupStore(args.store) if args.store and not args.precision else None
+    seed = _choose_seed(args.seed, store)
+    simulator = BattleSimulator(
+        seed, max_rounds=args.max_rounds, stalemate_rounds=args.stalemate_rounds
+    )
+    if store is not None:
+        # 缓存结果随种子与驱动设置而变, 任一不同时旧结果作废.
+        store.use_settings({**simulator.settings, SEED_SETTING: seed})
+    roster, pairs = _plan_pairs(args)
+    tallies = [PairTally(a, b, pair_seed(seed, a, b)) for a, b in pairs]
+
+    profiler = cProfile.Profile() if args.profile else None
+    progress = _build_progress(args)
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    simulated = _run(args, roster, tallies, store, progress)
+    if profiler is not None:
+        profiler.disable()
+    if progress is not None:
+        progress.close()
+    elapsed = time.perf_counter() - start
+
+    print(_render(args.format, seed, tallies, simulated, elapsed))
+    summary = (
+        f"种子 {seed}, 模拟 {simulated} 场, 耗时 {elapsed:.2f}s, "
+        f"吞吐 {simulated / elapsed if elapsed > 0 else 0.0:,.0f} 场/秒, "
+        f"后端 {resolve_backend(args.backend, args.workers)} "
+        f"(GIL {'开启' if gil_enabled() else '关闭'})"
+    )
+    # 机器可读格式只占用 stdout, 摘要与剖析结果写到 stderr.
+    print(summary, file=sys.stderr if args.format != "table" else sys.stdout)
+    if profiler is not None:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+    if not args.no_sample_log and args.format == "table" and pairs:
+        name_a, name_b = pairs[0]
+        print("\n示例对局日志:")
+        run_single_verbose_battle(simulator, roster[name_a], roster[name_b], args.annotate)
+
+
+MIN_PLAYERS = 2
+PROFILE_TOP = 30
+# 缓存文件设置中记录基础种子的键.
+SEED_SETTING = "seed"
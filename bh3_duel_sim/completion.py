@@ -0,0 +1,277 @@
+"""对阵矩阵补全: 只模拟部分对阵, 用低秩斜对称模型推断其余胜率."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+
+# (i, j, i 的胜场, 总场数 (含平局)), 约定 i < j.
+Observation = tuple[int, int, int, int]
+
+
+def _sigmoid(x: float) -> float:
+    if x >= 0:
+        return 1.0 / (1.0 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1.0 + z)
+
+
+class SkewModel:
+    """斜对称低秩模型: logit P(i 胜 j) = s_i - s_j + u_i·v_j - u_j·v_i.
+
+    s 是整体强度, (u, v) 是风格嵌入 ("刀/盾"), 能表达石头剪刀布式的克制关系.
+    交换 i, j 时 logit 取反, 因此 P(i 胜 j) + P(j 胜 i) = 1 恒成立; 有平局的对阵实测
+    胜率之和小于 1, 模型只能近似.
+    """
+
+    def __init__(self, size: int, dims: int, rng: random.Random) -> None:
+        self.strength = [0.0] * size
+        self.blade = [[rng.gauss(0.0, 0.3) for _ in range(dims)] for _ in range(size)]
+        self.chest = [[rng.gauss(0.0, 0.3) for _ in range(dims)] for _ in range(size)]
+
+    def logit(self, i: int, j: int) -> float:
+        u_i, v_i = self.blade[i], self.chest[i]
+        u_j, v_j = self.blade[j], self.chest[j]
+        style = sum(a * b for a, b in zip(u_i, v_j)) - sum(a * b for a, b in zip(u_j, v_i))
+        return self.strength[i] - self.strength[j] + style
+
+    def predict(self, i: int, j: int) -> float:
+        return _sigmoid(self.logit(i, j))
+
+    def fit(
+        self,
+        observations: Sequence[Observation],
+        rng: random.Random,
+        options: CompletionOptions | None = None,
+    ) -> None:
+        """SGD 最大化二项对数似然 (按场数加权, 权重归一到均值 1), 参数取自 options.
+
+        风格嵌入参数多、数据少时易过拟合, 因此比整体强度施加更强的 L2 收缩.
+        """
+        if not observations:
+            return
+        options = options or CompletionOptions()
+        learning_rate, l2, style_l2 = options.learning_rate, options.l2, options.style_l2
+        mean_battles = sum(obs[3] for obs in observations) / len(observations)
+        order = list(observations)
+        for _ in range(options.epochs):
+            rng.shuffle(order)
+            for i, j, wins, battles in order:
+                if battles == 0:
+                    continue
+                weight = battles / mean_battles
+                grad = weight * (wins / battles - self.predict(i, j))
+                self.strength[i] += learning_rate * (grad - l2 * self.strength[i])
+                self.strength[j] += learning_rate * (-grad - l2 * self.strength[j])
+                u_i, v_i = self.blade[i], self.chest[i]
+                u_j, v_j = self.blade[j], self.chest[j]
+                for d in range(len(u_i)):
+                    du_i = grad * v_j[d] - style_l2 * u_i[d]
+                    dv_j = grad * u_i[d] - style_l2 * v_j[d]
+                    du_j = -grad * v_i[d] - style_l2 * u_j[d]
+                    dv_i = -grad * u_j[d] - style_l2 * v_i[d]
+                    u_i[d] += learning_rate * du_i
+                    v_j[d] += learning_rate * dv_j
+                    u_j[d] += learning_rate * du_j
+                    v_i[d] += learning_rate * dv_i
+
+
+@dataclass
+class CompletionResult:
+    """补全结果: 直接模拟的对阵、模型集成、留出验证误差与消耗场数."""
+
+    names: list[str]
+    observed: dict[tuple[str, str], tuple[int, int]]
+    models: list[SkewModel]
+    holdout: dict[tuple[str, str], tuple[float, float]] = field(default_factory=dict)
+    battles_used: int = 0
+    # 每组直接模拟的对阵的总场数 (含平局).
+    battles_per_pair: int = 0
+
+    def __post_init__(self) -> None:
+        self._index = {name: idx for idx, name in enumerate(self.names)}
+
+    def predict(self, name_a: str, name_b: str) -> tuple[float, float]:
+        """模型预测的 A 对 B 胜率及其不确定度 (集成成员间的标准差)."""
+        i, j = self._index[name_a], self._index[name_b]
+        rates = [model.predict(i, j) for model in self.models]
+        mean = sum(rates) / len(rates)
+        variance = sum((r - mean) ** 2 for r in rates) / max(1, len(rates) - 1)
+        return mean, math.sqrt(variance)
+
+    def rate(self, name_a: str, name_b: str) -> tuple[float, float]:
+        """A 对 B 胜率: 直接模拟过的用实测值与二项标准误, 否则用模型预测."""
+        if (name_a, name_b) in self.observed:
+            wins_a, wins_b = self.observed[name_a, name_b]
+        elif (name_b, name_a) in self.observed:
+            wins_b, wins_a = self.observed[name_b, name_a]
+        else:
+            return self.predict(name_a, name_b)
+        battles = max(1, self.battles_per_pair)
+        rate = wins_a / battles
+        return rate, math.sqrt(rate * (1.0 - rate) / battles)
+
+    @property
+    def holdout_mae(self) -> float:
+        """留出对阵上 |预测 - 实测| 的均值."""
+        errors = [abs(pred - real) for pred, real in self.holdout.values()]
+        return sum(errors) / len(errors) if errors else 0.0
+
+    @property
+    def holdout_rmse(self) -> float:
+        errors = [(pred - real) ** 2 for pred, real in self.holdout.values()]
+        return math.sqrt(sum(errors) / len(errors)) if errors else 0.0
+
+
+def _initial_pairs(size: int, degree: int, rng: random.Random) -> set[tuple[int, int]]:
+    # 每名角色至少随机对上 degree 个对手, 保证每个嵌入都有数据约束.
+    pairs: set[tuple[int, int]] = set()
+    for i in range(size):
+        for pick in rng.sample(range(size - 1), min(degree, size - 1)):
+            j = pick if pick < i else pick + 1
+            pairs.add((min(i, j), max(i, j)))
+    return pairs
+
+
+@dataclass(frozen=True)
+class CompletionOptions:
+    """complete_matchups 的采样与拟合参数.
+
+    initial_degree: 初始每名角色随机对上的对手数; holdout_fraction: 初始对阵中留作验证的比例.
+    dims / ensemble / epochs: 风格嵌入维数、集成成员数与训练轮数; learning_rate 为 SGD 步长,
+    l2 / style_l2 为整体强度与风格嵌入的 L2 系数.
+    active_rounds 轮主动学习, 每轮从 candidate_pool 倍候选中挑 active_pairs 个 (默认为
+    角色数) 分歧最大的对阵去模拟.
+    """
+
+    initial_degree: int = 6
+    iterations_per_pair: int = 500
+    dims: int = 3
+    ensemble: int = 5
+    epochs: int = 200
+    learning_rate: float = 0.05
+    l2: float = 1e-3
+    style_l2: float = 0.01
+    active_rounds: int = 3
+    active_pairs: int | None = None
+    candidate_pool: int = 20
+    holdout_fraction: float = 0.1
+    seed: int = 0
+
+
+def _fit_ensemble(
+    size: int, observations: Sequence[Observation], options: CompletionOptions, seed: int
+) -> list[SkewModel]:
+    # 每个成员在有放回重抽样的对阵上拟合 (bootstrap), 成员间分歧即预测不确定度.
+    models = []
+    for member in range(options.ensemble):
+        rng = random.Random(seed * 7_919 + member)
+        sample = [observations[rng.randrange(len(observations))] for _ in observations]
+        model = SkewModel(size, options.dims, rng)
+        model.fit(sample, rng, options)
+        models.append(model)
+    return models
+
+
+def _disagreement(models: Sequence[SkewModel], pair: tuple[int, int]) -> float:
+    rates = [model.predict(*pair) for model in models]
+    mean = sum(rates) / len(rates)
+    return sum((r - mean) ** 2 for r in rates)
+
+
+def complete_matchups(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    options: CompletionOptions | None = None,
+    *,
+    workers: int = 1,
+) -> CompletionResult:
+    """模拟一部分对阵并补全整个胜率矩阵, 参数见 CompletionOptions.
+
+    1. 每名角色随机抽 initial_degree 个对手直接模拟, 其中 holdout_fraction 比例的对阵
+       留作验证, 不参与拟合.
+    2. 用 bootstrap 集成拟合斜对称低秩模型.
+    3. 主动学习 active_rounds 轮: 从未模拟对阵中随机抽 candidate_pool 倍候选, 挑集成
+       分歧最大的 active_pairs 个去模拟, 重新拟合.
+    4. 在留出对阵上报告预测误差.
+    """
+    options = options if options is not None else CompletionOptions()
+    seed = options.seed
+    names = list(roster)
+    size = len(names)
+    if size < MIN_COMPLETION_SIZE:
+        raise ValueError("矩阵补全至少需要三名角色")
+    rng = random.Random(seed)
+    active_pairs = options.active_pairs or size
+    results: dict[tuple[int, int], tuple[int, int]] = {}
+    battles_used = 0
+
+    def simulate(pool: SimulationPool, pairs: Sequence[tuple[int, int]]) -> None:
+        nonlocal battles_used
+        jobs = [
+            PairJob(
+                roster[names[i]],
+                roster[names[j]],
+                pair_seed(seed, names[i], names[j]),
+                0,
+                options.iterations_per_pair,
+            )
+            for i, j in pairs
+        ]
+        for pair, (wins_i, wins_j) in zip(pairs, pool.run(jobs)):
+            results[pair] = (wins_i, wins_j)
+        battles_used += sum(job.stop - job.start for job in jobs)
+
+    initial = sorted(_initial_pairs(size, options.initial_degree, rng))
+    holdout_count = int(len(initial) * options.holdout_fraction)
+    holdout_pairs = set(rng.sample(initial, holdout_count))
+
+    def training() -> list[Observation]:
+        return [
+            (i, j, wins_i, options.iterations_per_pair)
+            for (i, j), (wins_i, _) in results.items()
+            if (i, j) not in holdout_pairs
+        ]
+
+    with SimulationPool(workers=workers) as pool:
+        simulate(pool, initial)
+        models = _fit_ensemble(size, training(), options, seed)
+        for round_idx in range(options.active_rounds):
+            candidates: set[tuple[int, int]] = set()
+            total_pairs = size * (size - 1) // 2
+            wanted = min(active_pairs * options.candidate_pool, total_pairs - len(results))
+            attempts = 0
+            while len(candidates) < wanted and attempts < wanted * 10:
+                attempts += 1
+                i, j = sorted(rng.sample(range(size), 2))
+                if (i, j) not in results:
+                    candidates.add((i, j))
+            if not candidates:
+                break
+
+            ranked = sorted(candidates, key=partial(_disagreement, models), reverse=True)
+            chosen = ranked[:active_pairs]
+            simulate(pool, sorted(chosen))
+            models = _fit_ensemble(size, training(), options, seed + round_idx + 1)
+
+    result = CompletionResult(
+        names=names,
+        observed={(names[i], names[j]): wins for (i, j), wins in results.items()},
+        models=models,
+        battles_used=battles_used,
+        battles_per_pair=options.iterations_per_pair,
+    )
+    for i, j in sorted(holdout_pairs):
+        predicted, _ = result.predict(names[i], names[j])
+        result.holdout[names[i], names[j]] = (predicted, result.rate(names[i], names[j])[0])
+    return result
+
+
+MIN_COMPLETION_SIZE = 3
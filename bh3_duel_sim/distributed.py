@@ -0,0 +1,561 @@
+"""多机分片执行: 协调者把循环赛拆成 (对阵, 序号区间) 工作单元, 经 TCP 分发给工作进程.
+
+协议为逐行 JSON. 单元结果只由 (对阵种子, 序号区间) 决定, 重复完成的单元按编号去重,
+因此重新下发丢失的单元不会改变计数, 合并结果与单机 SimulationPool 逐场一致.
+单元大小按各对阵实测的单场耗时自适应, 长对局 (如晨雪的 150 生命) 自动切得更小.
+
+用法:
+    python -m bh3_duel_sim.distributed coordinator --port 9000 --iterations 100000
+    python -m bh3_duel_sim.distributed worker --connect 127.0.0.1:9000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, cast
+
+from bh3_duel_sim.characters import build_valkyrie_roster
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.results import character_fingerprint
+from bh3_duel_sim.simulator import (
+    DEFAULT_MAX_ROUNDS,
+    DEFAULT_STALEMATE_ROUNDS,
+    DRAW_KEY,
+    BattleSimulator,
+    PairJob,
+    pair_seed,
+    run_seeded_range,
+)
+
+Address = tuple[str, int]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9000
+DEFAULT_LEASE_TIMEOUT = 60.0
+# 单元目标耗时 (秒); 首个样本出来之前按 INITIAL_UNIT_SIZE 场切分.
+DEFAULT_UNIT_SECONDS = 2.0
+INITIAL_UNIT_SIZE = 200
+MIN_UNIT_SIZE = 50
+MAX_UNIT_SIZE = 200_000
+# 收尾时每个工作进程至少分到的单元份数.
+TAIL_SPLIT = 2
+EMA_WEIGHT = 0.3
+WAIT_DELAY = 0.2
+MIN_CLUSTER_ROSTER = 2
+# 本地工作进程存活检查间隔 (秒) 与每个进程平均可重启次数.
+WORKER_POLL_SECONDS = 0.5
+WORKER_RESTARTS = 3
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """一个工作单元: 第 pair 组对阵的序号区间 [start, stop)."""
+
+    unit_id: int
+    pair: int
+    start: int
+    stop: int
+
+
+@dataclass
+class PairProgress:
+    """单组对阵的分发进度与累计胜场."""
+
+    name_a: str
+    name_b: str
+    base_seed: int
+    iterations: int
+    next_start: int = 0
+    completed: int = 0
+    wins_a: int = 0
+    wins_b: int = 0
+    # 单场耗时的指数滑动平均, 0 表示尚无样本.
+    seconds_per_battle: float = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return self.iterations - self.next_start
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        coordinator = cast("_Server", self.server).coordinator
+        host, port = self.client_address[:2]
+        worker = f"{host}:{port}"
+        try:
+            for line in self.rfile:
+                reply = coordinator.dispatch(worker, json.loads(line))
+                self.wfile.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+        except (OSError, ValueError):
+            pass
+        finally:
+            # 连接断开即视为工作进程丢失, 其持有的单元立即重新排队.
+            coordinator.release(worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    coordinator: Coordinator
+
+
+@dataclass(frozen=True)
+class CoordinatorOptions:
+    """协调者的监听地址、调度参数与驱动设置.
+
+    port 为 0 时由系统分配端口. target_seconds 为单元目标耗时; journal 为单元完成日志路径.
+    """
+
+    host: str = DEFAULT_HOST
+    port: int = 0
+    lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+    target_seconds: float = DEFAULT_UNIT_SECONDS
+    max_rounds: int = DEFAULT_MAX_ROUNDS
+    stalemate_rounds: int = DEFAULT_STALEMATE_ROUNDS
+    journal: str | Path | None = None
+
+
+class Coordinator:
+    """循环赛分片协调者.
+
+    每组对阵的基础种子为 pair_seed(seed, A, B), 与 CLI 的多进程模式相同. 单元按租约
+    下发, 超过 lease_timeout 未交回或连接断开时重新下发; 传入 journal 时每完成一个
+    单元追加一行记录, 协调者重启后跳过已完成的区间, 只补跑缺口.
+    """
+
+    def __init__(
+        self,
+        roster: Mapping[str, Callable[[], BaseCharacter]],
+        iterations_per_pair: int = 10_000,
+        seed: int = 0,
+        options: CoordinatorOptions | None = None,
+    ) -> None:
+        options = options if options is not None else CoordinatorOptions()
+        self.names = list(roster)
+        if len(self.names) < MIN_CLUSTER_ROSTER:
+            raise ValueError("循环赛至少需要两名角色")
+        if iterations_per_pair <= 0:
+            raise ValueError("每组对阵场数必须为正")
+        self.iterations = iterations_per_pair
+        self.seed = seed
+        self.lease_timeout = options.lease_timeout
+        self.target_seconds = options.target_seconds
+        self.limits = {
+            "max_rounds": options.max_rounds,
+            "stalemate_rounds": options.stalemate_rounds,
+        }
+        self.fingerprints = {name: character_fingerprint(roster[name]) for name in self.names}
+        self.pairs = [
+            PairProgress(a, b, pair_seed(seed, a, b), iterations_per_pair)
+            for i, a in enumerate(self.names)
+            for b in self.names[i + 1 :]
+        ]
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._units: dict[int, WorkUnit] = {}
+        self._pending: deque[WorkUnit] = deque()
+        self._leases: dict[int, tuple[float, str]] = {}
+        self._done: set[int] = set()
+        self._workers: set[str] = set()
+        journal = options.journal
+        self._journal_path = Path(journal) if journal is not None else None
+        self._journal = None
+        if self._journal_path is not None:
+            self._load_journal(self._journal_path)
+            self._journal = self._journal_path.open("a", encoding="utf-8")
+        self._check_finished()
+        self._server = _Server((options.host, options.port), _Handler, bind_and_activate=True)
+        self._server.coordinator = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> Address:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    @property
+    def total_battles(self) -> int:
+        return self.iterations * len(self.pairs)
+
+    @property
+    def completed_battles(self) -> int:
+        return sum(progress.completed for progress in self.pairs)
+
+    def start(self) -> Coordinator:
+        """在后台线程中开始监听."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """等待全部单元完成, 超时返回 False."""
+        return self._finished.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def __enter__(self) -> Coordinator:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def results(self) -> tuple[dict[str, float], dict[tuple[str, str], dict[str, float]]]:
+        """与 round_robin_statistics 相同格式的 (整体胜率, 对阵胜率)."""
+        wins = dict.fromkeys(self.names, 0)
+        matchup_rates: dict[tuple[str, str], dict[str, float]] = {}
+        for progress in self.pairs:
+            wins[progress.name_a] += progress.wins_a
+            wins[progress.name_b] += progress.wins_b
+            counts = {progress.name_a: progress.wins_a, progress.name_b: progress.wins_b}
+            draws = progress.completed - progress.wins_a - progress.wins_b
+            if draws:
+                counts[DRAW_KEY] = draws
+            matchup_rates[(progress.name_a, progress.name_b)] = {
+                name: count / self.iterations for name, count in counts.items()
+            }
+        per_character = self.iterations * (len(self.names) - 1)
+        return {name: wins[name] / per_character for name in self.names}, matchup_rates
+
+    def dispatch(self, worker: str, message: Mapping[str, Any]) -> dict[str, Any]:
+        """处理一条工作进程消息并返回应答."""
+        op = message.get("op")
+        if op == "hello":
+            theirs = message.get("fingerprints", {})
+            stale = [name for name in self.names if theirs.get(name) != self.fingerprints[name]]
+            if stale:
+                return {"op": "error", "reason": f"角色定义与协调者不一致: {stale}"}
+            with self._lock:
+                self._workers.add(worker)
+            return {"op": "config", **self.limits}
+        if op == "lease":
+            return self._lease(worker)
+        if op == "done":
+            self._complete(
+                int(message["unit"]),
+                int(message["wins_a"]),
+                int(message["wins_b"]),
+                float(message.get("elapsed", 0.0)),
+            )
+            return {"op": "ok"}
+        return {"op": "error", "reason": f"未知消息: {op!r}"}
+
+    def release(self, worker: str) -> None:
+        """工作进程断开: 收回其全部租约."""
+        with self._lock:
+            self._workers.discard(worker)
+            for unit_id, (_, holder) in list(self._leases.items()):
+                if holder == worker:
+                    del self._leases[unit_id]
+                    self._pending.append(self._units[unit_id])
+
+    def _lease(self, worker: str) -> dict[str, Any]:
+        with self._lock:
+            if self._finished.is_set():
+                return {"op": "finished"}
+            now = time.monotonic()
+            for unit_id, (deadline, _) in list(self._leases.items()):
+                if deadline < now:
+                    del self._leases[unit_id]
+                    self._pending.append(self._units[unit_id])
+            unit = self._next_unit()
+            if unit is None:
+                # 剩余单元都在别处执行, 稍后再问; 若其持有者丢失, 单元会被重新下发.
+                return {"op": "wait", "delay": WAIT_DELAY}
+            self._leases[unit.unit_id] = (now + self.lease_timeout, worker)
+            progress = self.pairs[unit.pair]
+            return {
+                "op": "unit",
+                "unit": unit.unit_id,
+                "name_a": progress.name_a,
+                "name_b": progress.name_b,
+                "seed": progress.base_seed,
+                "start": unit.start,
+                "stop": unit.stop,
+            }
+
+    def _next_unit(self) -> WorkUnit | None:
+        while self._pending:
+            unit = self._pending.popleft()
+            if unit.unit_id not in self._done and unit.unit_id not in self._leases:
+                return unit
+        # 优先切分预计剩余耗时最长的对阵, 让长对局尽早开始, 尾部更均衡.
+        fallback = self._mean_seconds_per_battle() or 1.0
+        candidates = [(i, p) for i, p in enumerate(self.pairs) if p.remaining > 0]
+        if not candidates:
+            return None
+        index, progress = max(
+            candidates,
+            key=lambda item: item[1].remaining * (item[1].seconds_per_battle or fallback),
+        )
+        stop = progress.next_start + self._unit_size(progress)
+        return self._issue(index, progress.next_start, stop)
+
+    def _issue(self, pair: int, start: int, stop: int) -> WorkUnit:
+        unit = WorkUnit(len(self._units), pair, start, stop)
+        self._units[unit.unit_id] = unit
+        progress = self.pairs[pair]
+        progress.next_start = max(progress.next_start, stop)
+        return unit
+
+    def _unit_size(self, progress: PairProgress) -> int:
+        per_battle = progress.seconds_per_battle or self._mean_seconds_per_battle()
+        size = INITIAL_UNIT_SIZE if per_battle <= 0 else int(self.target_seconds / per_battle)
+        # 收尾阶段按在线工作进程数再切小, 避免最后一个大单元拖住整体.
+        remaining = sum(p.remaining for p in self.pairs)
+        share = remaining // (TAIL_SPLIT * max(1, len(self._workers)))
+        size = max(MIN_UNIT_SIZE, min(size, share, MAX_UNIT_SIZE))
+        return min(size, progress.remaining)
+
+    def _mean_seconds_per_battle(self) -> float:
+        samples = [p.seconds_per_battle for p in self.pairs if p.seconds_per_battle > 0]
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def _complete(self, unit_id: int, wins_a: int, wins_b: int, elapsed: float) -> None:
+        with self._lock:
+            unit = self._units.get(unit_id)
+            self._leases.pop(unit_id, None)
+            if unit is None or unit_id in self._done:
+                # 重新下发后两份结果都交回时只计一次.
+                return
+            self._done.add(unit_id)
+            progress = self.pairs[unit.pair]
+            self._record(progress, unit.stop - unit.start, wins_a, wins_b)
+            if elapsed > 0:
+                sample = elapsed / (unit.stop - unit.start)
+                previous = progress.seconds_per_battle
+                progress.seconds_per_battle = (
+                    sample if previous <= 0 else previous + EMA_WEIGHT * (sample - previous)
+                )
+            if self._journal is not None:
+                entry = [progress.name_a, progress.name_b, unit.start, unit.stop, wins_a, wins_b]
+                self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._journal.flush()
+            self._check_finished()
+
+    @staticmethod
+    def _record(progress: PairProgress, battles: int, wins_a: int, wins_b: int) -> None:
+        progress.completed += battles
+        progress.wins_a += wins_a
+        progress.wins_b += wins_b
+
+    def _check_finished(self) -> None:
+        if all(progress.completed >= progress.iterations for progress in self.pairs):
+            self._finished.set()
+
+    def _load_journal(self, path: Path) -> None:
+        params = {
+            "seed": self.seed,
+            "iterations": self.iterations,
+            "names": self.names,
+            **self.limits,
+        }
+        header = {**params, "fingerprints": self.fingerprints}
+        lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+        stored = json.loads(lines[0]) if lines else None
+        if (
+            stored is not None
+            and {k: v for k, v in stored.items() if k != "fingerprints"} != params
+        ):
+            raise ValueError(f"日志 {path} 属于另一组运行参数")
+        if stored is None or stored.get("fingerprints") != self.fingerprints:
+            # 新日志, 或角色定义已改动 (与 MatchupStore 相同按指纹判断): 旧单元全部作废.
+            path.write_text(json.dumps(header, ensure_ascii=False) + "\n", encoding="utf-8")
+            return
+        index = {(p.name_a, p.name_b): i for i, p in enumerate(self.pairs)}
+        covered: dict[int, list[tuple[int, int]]] = {}
+        for line in lines[1:]:
+            try:
+                name_a, name_b, start, stop, wins_a, wins_b = json.loads(line)
+            except ValueError:
+                # 崩溃时最后一行可能只写了一半, 该单元视为未完成.
+                continue
+            pair = index[(name_a, name_b)]
+            if (start, stop) in covered.setdefault(pair, []):
+                continue
+            covered[pair].append((start, stop))
+            self._record(self.pairs[pair], stop - start, wins_a, wins_b)
+        # 已完成区间之间的缺口是崩溃时尚未交回的单元, 重新排队补跑.
+        for pair, ranges in covered.items():
+            cursor = 0
+            for start, stop in sorted(ranges):
+                if start > cursor:
+                    self._pending.append(self._issue(pair, cursor, start))
+                cursor = max(cursor, stop)
+            self.pairs[pair].next_start = cursor
+
+
+def _request(stream: Any, message: Mapping[str, Any]) -> dict[str, Any]:
+    stream.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+    stream.flush()
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("协调者已断开")
+    return json.loads(line)
+
+
+def run_worker(
+    address: Address,
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    *,
+    max_units: int | None = None,
+) -> int:
+    """连接协调者并循环领取、执行、交回单元, 返回完成的单元数.
+
+    max_units 用于模拟中途退出的工作进程, 达到后直接断开而不领取下一个单元.
+    """
+    fingerprints = {name: character_fingerprint(spawn) for name, spawn in roster.items()}
+    completed = 0
+    with socket.create_connection(address) as connection, connection.makefile("rwb") as stream:
+        config = _request(stream, {"op": "hello", "fingerprints": fingerprints})
+        if config["op"] != "config":
+            raise RuntimeError(config.get("reason", "协调者拒绝连接"))
+        simulator = BattleSimulator(
+            max_rounds=config["max_rounds"], stalemate_rounds=config["stalemate_rounds"]
+        )
+        while max_units is None or completed < max_units:
+            try:
+                reply = _request(stream, {"op": "lease"})
+            except ConnectionError:
+                # 协调者收齐结果后即关闭, 未交回的单元由它负责重发, 这里直接退出.
+                break
+            if reply["op"] == "finished":
+                break
+            if reply["op"] == "wait":
+                time.sleep(reply["delay"])
+                continue
+            start = time.perf_counter()
+            job = PairJob(
+                roster[reply["name_a"]],
+                roster[reply["name_b"]],
+                reply["seed"],
+                reply["start"],
+                reply["stop"],
+            )
+            wins_a, wins_b = run_seeded_range(simulator, job)
+            elapsed = time.perf_counter() - start
+            message = {"op": "done", "unit": reply["unit"], "wins_a": wins_a, "wins_b": wins_b}
+            try:
+                _request(stream, {**message, "elapsed": elapsed})
+            except ConnectionError:
+                break
+            completed += 1
+    return completed
+
+
+def distributed_round_robin(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    iterations_per_pair: int = 10_000,
+    seed: int = 0,
+    *,
+    workers: int = 2,
+    options: CoordinatorOptions | None = None,
+) -> tuple[dict[str, float], dict[tuple[str, str], dict[str, float]]]:
+    """单机上启动协调者与 workers 个本地工作进程跑完循环赛, 工厂需可被 pickle.
+
+    退出的工作进程会被重新拉起 (合计至多 workers * WORKER_RESTARTS 次), 其未交回的
+    单元由协调者重新下发; 重启次数用尽且已无存活进程时抛出 RuntimeError, 不会一直等待.
+    """
+    with Coordinator(roster, iterations_per_pair, seed, options) as coordinator:
+
+        def spawn() -> multiprocessing.Process:
+            process = multiprocessing.Process(
+                target=run_worker, args=(coordinator.address, dict(roster))
+            )
+            process.start()
+            return process
+
+        processes = [spawn() for _ in range(workers)]
+        try:
+            _supervise(coordinator, processes, spawn, workers * WORKER_RESTARTS)
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+        return coordinator.results()
+
+
+def _supervise(
+    coordinator: Coordinator,
+    processes: list[multiprocessing.Process],
+    spawn: Callable[[], multiprocessing.Process],
+    restarts: int,
+) -> None:
+    # 定期检查本地工作进程, 退出的按预算重启, 全部退出且无法重启时报错.
+    while not coordinator.wait(WORKER_POLL_SECONDS):
+        for index, process in enumerate(processes):
+            if not process.is_alive() and restarts > 0:
+                restarts -= 1
+                processes[index] = spawn()
+        if not any(process.is_alive() for process in processes) and not coordinator.wait(0):
+            codes = [process.exitcode for process in processes]
+            raise RuntimeError(f"本地工作进程已全部退出 (退出码 {codes}), 循环赛未完成")
+
+
+def _parse_address(text: str) -> Address:
+    host, _, port = text.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """命令行入口: coordinator 监听并打印结果, worker 连接并执行单元."""
+    parser = argparse.ArgumentParser(description="多机分片循环赛")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("coordinator", help="启动协调者")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--iterations", type=int, default=10_000, help="每组对阵场数")
+    serve.add_argument("--seed", type=int, default=0)
+    serve.add_argument("--journal", metavar="PATH", help="单元完成日志, 重启后据此续跑")
+    serve.add_argument("--lease-timeout", type=float, default=DEFAULT_LEASE_TIMEOUT)
+    serve.add_argument("--max-rounds", type=int, default=DEFAULT_MAX_ROUNDS)
+    serve.add_argument("--stalemate-rounds", type=int, default=DEFAULT_STALEMATE_ROUNDS)
+    work = commands.add_parser("worker", help="连接协调者执行单元")
+    work.add_argument("--connect", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}", metavar="HOST:PORT")
+    args = parser.parse_args(argv)
+
+    roster = build_valkyrie_roster()
+    if args.command == "worker":
+        completed = run_worker(_parse_address(args.connect), roster)
+        print(f"完成 {completed} 个单元")
+        return
+    options = CoordinatorOptions(
+        host=args.host,
+        port=args.port,
+        lease_timeout=args.lease_timeout,
+        max_rounds=args.max_rounds,
+        stalemate_rounds=args.stalemate_rounds,
+        journal=args.journal,
+    )
+    with Coordinator(roster, args.iterations, args.seed, options) as coordinator:
+        host, port = coordinator.address
+        print(f"协调者监听 {host}:{port}, 共 {coordinator.total_battles} 场")
+        coordinator.wait()
+        overall, matchup_rates = coordinator.results()
+    for name, rate in sorted(overall.items(), key=lambda item: item[1], reverse=True):
+        print(f"{name}: {rate:.2%}")
+    for (name_a, name_b), rates in matchup_rates.items():
+        print(f"{name_a} vs {name_b}: " + ", ".join(f"{k} {v:.2%}" for k, v in rates.items()))
+
+
+if __name__ == "__main__":
+    main()
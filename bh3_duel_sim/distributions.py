@@ -0,0 +1,247 @@
+"""流式分布统计: 对局时长与剩余生命的直方图与分位数草图, 内存与场数无关."""
+
+from __future__ import annotations
+
+import math
+from array import array
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.simulator import BattleSimulator, PairJob, battle_seed
+
+MAX_TRACKED_ROUNDS = 64
+HP_BINS = 20
+ZERO_THRESHOLD = 1e-12
+
+
+class Histogram:
+    """固定分箱直方图: [low, high) 等分为 bins 箱, 另计下溢与上溢.
+
+    只保存计数数组与少量汇总量, 同布局的直方图可逐箱相加合并.
+    """
+
+    __slots__ = ("low", "high", "bins", "counts", "total", "sum", "min", "max")
+
+    def __init__(self, low: float, high: float, bins: int) -> None:
+        if high <= low or bins <= 0:
+            raise ValueError("直方图需要 high > low 且 bins > 0")
+        self.low = low
+        self.high = high
+        self.bins = bins
+        # 下标 0 为下溢, bins + 1 为上溢.
+        self.counts = array("q", bytes(8 * (bins + 2)))
+        self.total = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def bin_index(self, value: float) -> int:
+        """value 所在的计数下标 (0 为下溢, bins + 1 为上溢)."""
+        if value < self.low:
+            return 0
+        if value >= self.high:
+            return self.bins + 1
+        return 1 + int((value - self.low) * self.bins / (self.high - self.low))
+
+    def add(self, value: float) -> None:
+        self.counts[self.bin_index(value)] += 1
+        self.total += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: Histogram) -> None:
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError("只能合并分箱相同的直方图")
+        for slot, count in enumerate(other.counts):
+            self.counts[slot] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    def edge(self, index: int) -> float:
+        """第 index 个箱 (从 0 起) 的左边界."""
+        return self.low + (self.high - self.low) * index / self.bins
+
+    def fraction_below(self, value: float) -> float:
+        """小于 value 的样本比例; value 落在箱边界时是精确值, 箱内线性插值."""
+        if not self.total:
+            return 0.0
+        if value <= self.low:
+            return self.counts[0] / self.total
+        if value >= self.high:
+            return (self.total - self.counts[self.bins + 1]) / self.total
+        position = (value - self.low) * self.bins / (self.high - self.low)
+        whole = int(position)
+        below = sum(self.counts[: whole + 1]) + self.counts[whole + 1] * (position - whole)
+        return below / self.total
+
+    def quantile(self, q: float) -> float:
+        """箱内线性插值的近似分位数."""
+        if not self.total:
+            return 0.0
+        target = min(max(q, 0.0), 1.0) * self.total
+        width = (self.high - self.low) / self.bins
+        seen = self.counts[0]
+        if target <= seen:
+            return self.min
+        for index in range(self.bins):
+            count = self.counts[index + 1]
+            if seen + count >= target and count:
+                return self.edge(index) + (target - seen) / count * width
+            seen += count
+        return self.max
+
+
+class QuantileSketch:
+    """对数分桶分位数草图 (DDSketch): 正值的分位数相对误差不超过 alpha.
+
+    桶数只取决于数值跨度与 alpha, 与样本数无关; 桶计数直接相加即可合并.
+    不大于 ZERO_THRESHOLD 的值单独计数.
+    """
+
+    __slots__ = ("alpha", "_gamma", "_log_gamma", "_buckets", "zero_count", "count")
+
+    def __init__(self, alpha: float = 0.01) -> None:
+        if not 0.0 < alpha < 1.0:
+            raise ValueError("alpha 需要位于 (0, 1)")
+        self.alpha = alpha
+        self._gamma = (1.0 + alpha) / (1.0 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= ZERO_THRESHOLD:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.alpha != self.alpha:
+            raise ValueError("只能合并精度相同的分位数草图")
+        buckets = self._buckets
+        for key, count in other._buckets.items():
+            buckets[key] = buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                return 2.0 * self._gamma**key / (self._gamma + 1.0)
+        return 2.0 * self._gamma ** max(self._buckets) / (self._gamma + 1.0)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class MatchupDistributions:
+    """单组对阵的流式分布: 对局回合数, 以及胜方剩余生命比例 (按 A/B 分开).
+
+    平局计入回合数分布与 draws, 不计入剩余生命分布.
+    """
+
+    __slots__ = (
+        "length",
+        "length_sketch",
+        "hp_a",
+        "hp_b",
+        "hp_sketch_a",
+        "hp_sketch_b",
+        "draws",
+    )
+
+    def __init__(
+        self, max_rounds: int = MAX_TRACKED_ROUNDS, hp_bins: int = HP_BINS, alpha: float = 0.01
+    ) -> None:
+        # 回合数为整数, 第 k 箱恰好对应第 k+1 回合结束的对局.
+        self.length = Histogram(1, max_rounds + 1, max_rounds)
+        self.length_sketch = QuantileSketch(alpha)
+        self.hp_a = Histogram(0.0, 1.0 + 1e-9, hp_bins)
+        self.hp_b = Histogram(0.0, 1.0 + 1e-9, hp_bins)
+        self.hp_sketch_a = QuantileSketch(alpha)
+        self.hp_sketch_b = QuantileSketch(alpha)
+        self.draws = 0
+
+    def record(self, rounds: int, a_won: bool, winner_hp_ratio: float) -> None:
+        self.length.add(rounds)
+        self.length_sketch.add(rounds)
+        if a_won:
+            self.hp_a.add(winner_hp_ratio)
+            self.hp_sketch_a.add(winner_hp_ratio)
+        else:
+            self.hp_b.add(winner_hp_ratio)
+            self.hp_sketch_b.add(winner_hp_ratio)
+
+    def record_draw(self, rounds: int) -> None:
+        self.length.add(rounds)
+        self.length_sketch.add(rounds)
+        self.draws += 1
+
+    def record_battle(
+        self, simulator: BattleSimulator, fighter_a: BaseCharacter, winner: BaseCharacter | None
+    ) -> None:
+        """记录 simulator 刚打完的一场对局; fighter_a 为 A 方实例, winner 为 None 表示平局."""
+        if winner is None:
+            self.record_draw(simulator.rounds_played)
+        else:
+            self.record(
+                simulator.rounds_played, winner is fighter_a, winner.current_hp / winner.max_hp
+            )
+
+    @property
+    def battles(self) -> int:
+        return self.length.total
+
+    def ends_by(self, rounds: int) -> float:
+        """对局在第 rounds 回合 (含) 之前结束的概率."""
+        return self.length.fraction_below(rounds + 1)
+
+    def ends_by_curve(self, max_rounds: int | None = None) -> list[float]:
+        """第 1..max_rounds 回合的累计结束概率曲线."""
+        limit = max_rounds if max_rounds is not None else self.length.bins
+        return [self.ends_by(k) for k in range(1, limit + 1)]
+
+    def merge(self, other: MatchupDistributions) -> None:
+        self.length.merge(other.length)
+        self.length_sketch.merge(other.length_sketch)
+        self.hp_a.merge(other.hp_a)
+        self.hp_b.merge(other.hp_b)
+        self.hp_sketch_a.merge(other.hp_sketch_a)
+        self.hp_sketch_b.merge(other.hp_sketch_b)
+        self.draws += other.draws
+
+
+def run_seeded_distributions(
+    simulator: BattleSimulator, job: PairJob, distributions: MatchupDistributions | None = None
+) -> MatchupDistributions:
+    """与 run_seeded_range 相同的定种对局 (job 的序号区间), 逐场写入分布而不保留逐场记录.
+
+    传入 distributions 时累加到其中并返回它, 否则新建.
+    """
+    quiet_logger = BattleLogger(enabled=False)
+    distributions = distributions if distributions is not None else MatchupDistributions()
+    spawn_a, spawn_b, base_seed = job.spawn_a, job.spawn_b, job.base_seed
+    for index in range(job.start, job.stop):
+        fighter_a = spawn_a()
+        winner = simulator.simulate_seeded(
+            fighter_a, spawn_b(), quiet_logger, battle_seed(base_seed, index)
+        )
+        distributions.record_battle(simulator, fighter_a, winner)
+    return distributions
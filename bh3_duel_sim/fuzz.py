@@ -0,0 +1,132 @@
+"""属性模糊测试: 随机化 CombatStats, 在时间预算内寻找会拖成平局的组合."""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.characters.variants import VariantFactory, resolve_class
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.simulator import (
+    DEFAULT_MAX_ROUNDS,
+    DEFAULT_STALEMATE_ROUNDS,
+    BattleSimulator,
+    battle_seed,
+)
+from bh3_duel_sim.stats import CombatStats
+
+
+@dataclass(frozen=True)
+class FuzzFinding:
+    """一个以平局收场的属性组合, 用 (名称, 属性, 种子) 即可复现."""
+
+    name_a: str
+    stats_a: CombatStats
+    name_b: str
+    stats_b: CombatStats
+    seed: int
+    rounds: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class FuzzOptions:
+    """fuzz_stalemates 的预算与驱动设置.
+
+    用时超过 time_budget 秒或找到 max_findings 个组合后停止; 每组跑 battles_per_case 场.
+    max_rounds / stalemate_rounds 同 BattleSimulator.
+    """
+
+    time_budget: float = 10.0
+    battles_per_case: int = 20
+    max_findings: int = 50
+    max_rounds: int = DEFAULT_MAX_ROUNDS
+    stalemate_rounds: int = DEFAULT_STALEMATE_ROUNDS
+
+
+@dataclass
+class FuzzReport:
+    """一次模糊测试的汇总."""
+
+    cases: int = 0
+    battles: int = 0
+    elapsed: float = 0.0
+    findings: list[FuzzFinding] = field(default_factory=list)
+
+
+def random_stats(base: CombatStats, rng: random.Random, scale: float = 8.0) -> CombatStats:
+    """各属性独立乘以 [1/scale, scale] 内对数均匀分布的倍率.
+
+    倍率跨度足够大, 低攻击对高防御 (伤害被钳制为 0) 的组合会频繁出现.
+    """
+    log_scale = math.log(scale)
+    values = {
+        name: value * math.exp(rng.uniform(-log_scale, log_scale))
+        for name, value in asdict(base).items()
+    }
+    return CombatStats(**values)
+
+
+def fuzz_stalemates(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    *,
+    seed: int = 0,
+    options: FuzzOptions | None = None,
+) -> FuzzReport:
+    """随机抽取两名角色与属性, 每组跑 battles_per_case 场, 记录出现平局的组合.
+
+    seed 同时决定属性抽样与各场对局种子, 相同 seed 与预算下结果可复现. 每组只记录
+    第一场平局; 回合上限保证单场用时有界, 因此预算检查在每场之后进行即可. 要求角色
+    声明 BASE_STATS.
+    """
+    options = options or FuzzOptions()
+    names = list(roster)
+    if len(names) < MIN_FUZZ_SIZE:
+        raise ValueError("模糊测试至少需要两名角色")
+    base_stats: dict[str, CombatStats] = {}
+    for name in names:
+        declared = getattr(resolve_class(roster[name]), "BASE_STATS", None)
+        if declared is None:
+            raise ValueError(f"{name} 未声明 BASE_STATS, 无法随机属性")
+        base_stats[name] = declared
+    rng = random.Random(seed)
+    simulator = BattleSimulator(
+        max_rounds=options.max_rounds, stalemate_rounds=options.stalemate_rounds
+    )
+    quiet_logger = BattleLogger(enabled=False)
+    report = FuzzReport()
+    start = time.perf_counter()
+    deadline = start + options.time_budget
+    while time.perf_counter() < deadline and len(report.findings) < options.max_findings:
+        name_a, name_b = rng.sample(names, 2)
+        stats_a = random_stats(base_stats[name_a], rng)
+        stats_b = random_stats(base_stats[name_b], rng)
+        spawn_a = VariantFactory(roster[name_a], asdict(stats_a))
+        spawn_b = VariantFactory(roster[name_b], asdict(stats_b))
+        # 与 pair_seed 相同的拼法: 高位为 seed, 低位为组序号.
+        case_seed = (seed << 32) | report.cases
+        report.cases += 1
+        for index in range(options.battles_per_case):
+            battle = battle_seed(case_seed, index)
+            winner = simulator.simulate_seeded(spawn_a(), spawn_b(), quiet_logger, battle)
+            report.battles += 1
+            if winner is None:
+                reason = simulator.draw_reason or ""
+                report.findings.append(
+                    FuzzFinding(
+                        name_a, stats_a, name_b, stats_b, battle, simulator.rounds_played, reason
+                    )
+                )
+                break
+            if time.perf_counter() >= deadline:
+                break
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+MIN_FUZZ_SIZE = 2
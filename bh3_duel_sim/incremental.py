@@ -0,0 +1,186 @@
+"""机制依赖追踪与增量重算模块."""
+
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.simulator import DRAW_KEY, BattleSimulator, battle_seed
+
+_NOTE_PATTERN = re.compile(r"""note_mechanic\(\s*["']([^"']+)["']\s*\)""")
+
+
+@dataclass(frozen=True)
+class BattleRecord:
+    """单场对局记录: 种子、胜者 (平局为 DRAW_KEY) 与本场读取过的机制标签."""
+
+    seed: int
+    winner: str
+    mechanics: frozenset[str]
+
+
+def _lineage(cls: type[BaseCharacter]) -> list[type]:
+    return [klass for klass in cls.__mro__ if klass not in (BaseCharacter, object)]
+
+
+def mechanic_constants(spawn: Callable[[], BaseCharacter]) -> dict[str, str]:
+    """读取角色全部大写类常量, 键名为 "定义类.常量" (子类覆盖沿用原定义类名)."""
+    cls = type(spawn())
+    constants: dict[str, str] = {}
+    for attr_name in dir(cls):
+        if not attr_name.isupper():
+            continue
+        owners = [klass for klass in _lineage(cls) if attr_name in vars(klass)]
+        if not owners:
+            continue
+        constants[f"{owners[-1].__name__}.{attr_name}"] = repr(getattr(cls, attr_name))
+    return constants
+
+
+def tracked_mechanics(spawn: Callable[[], BaseCharacter]) -> frozenset[str]:
+    """从角色源码中收集所有 note_mechanic 标签, 即可增量重算的常量."""
+    tags: set[str] = set()
+    for klass in _lineage(type(spawn())):
+        try:
+            source = inspect.getsource(klass)
+        except (OSError, TypeError):
+            continue
+        tags.update(_NOTE_PATTERN.findall(source))
+    return frozenset(tags)
+
+
+class IncrementalPair:
+    """逐场记录一组对阵, 常量调整后只重跑读取过该常量的对局."""
+
+    def __init__(
+        self,
+        spawn_a: Callable[[], BaseCharacter],
+        spawn_b: Callable[[], BaseCharacter],
+        iterations: int = 10_000,
+        base_seed: int = 0,
+    ) -> None:
+        self.spawn_a = spawn_a
+        self.spawn_b = spawn_b
+        self.iterations = iterations
+        self.base_seed = base_seed
+        self.records: list[BattleRecord] = []
+        self._constants: dict[str, str] = {}
+        self._stats: tuple[str, str] = ("", "")
+        # 相同的标签集合只保存一份, 上万场记录共享少量 frozenset.
+        self._interned: dict[frozenset[str], frozenset[str]] = {}
+
+    def _snapshot_settings(self) -> None:
+        self._constants = {**mechanic_constants(self.spawn_a), **mechanic_constants(self.spawn_b)}
+        self._stats = (repr(self.spawn_a().stats), repr(self.spawn_b().stats))
+
+    def _simulate(
+        self, simulator: BattleSimulator, index: int, logger: BattleLogger
+    ) -> BattleRecord:
+        seed = battle_seed(self.base_seed, index)
+        fighter_a = self.spawn_a()
+        fighter_b = self.spawn_b()
+        touched: set[str] = set()
+        fighter_a.track_mechanics(touched)
+        fighter_b.track_mechanics(touched)
+        winner = simulator.simulate_seeded(fighter_a, fighter_b, logger, seed)
+        key = frozenset(touched)
+        mechanics = self._interned.setdefault(key, key)
+        name = winner.name if winner is not None else DRAW_KEY
+        return BattleRecord(seed=seed, winner=name, mechanics=mechanics)
+
+    def run(self, simulator: BattleSimulator) -> dict[str, int]:
+        """完整跑一遍并记录每场的种子与机制依赖."""
+        quiet_logger = BattleLogger(enabled=False)
+        self._snapshot_settings()
+        self.records = [
+            self._simulate(simulator, index, quiet_logger) for index in range(self.iterations)
+        ]
+        return self.wins
+
+    def changed_mechanics(self) -> set[str]:
+        """对比记录时与当前的类常量, 返回发生变化的标签."""
+        current = {**mechanic_constants(self.spawn_a), **mechanic_constants(self.spawn_b)}
+        keys = current.keys() | self._constants.keys()
+        return {key for key in keys if current.get(key) != self._constants.get(key)}
+
+    def patch(self, simulator: BattleSimulator, changed: Iterable[str] | None = None) -> int:
+        """只重跑受影响的对局并修补统计, 返回重跑场数.
+
+        未指定 changed 时自动比对类常量. 若改动涉及未打标签的常量或基础属性,
+        无法判定影响范围, 退化为全部重跑.
+        """
+        if not self.records:
+            self.run(simulator)
+            return self.iterations
+        changed_set = set(self.changed_mechanics() if changed is None else changed)
+        tracked = tracked_mechanics(self.spawn_a) | tracked_mechanics(self.spawn_b)
+        stats_now = (repr(self.spawn_a().stats), repr(self.spawn_b().stats))
+        if stats_now != self._stats or not changed_set <= tracked:
+            self.run(simulator)
+            return self.iterations
+
+        quiet_logger = BattleLogger(enabled=False)
+        rerun = 0
+        for index, record in enumerate(self.records):
+            if record.mechanics.isdisjoint(changed_set):
+                continue
+            self.records[index] = self._simulate(simulator, index, quiet_logger)
+            rerun += 1
+        self._snapshot_settings()
+        return rerun
+
+    @property
+    def wins(self) -> dict[str, int]:
+        """按胜者名称汇总胜场."""
+        totals: dict[str, int] = {}
+        for record in self.records:
+            totals[record.winner] = totals.get(record.winner, 0) + 1
+        return totals
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """保存逐场记录, 标签与胜者名称以索引压缩."""
+        tags = sorted({tag for record in self.records for tag in record.mechanics})
+        tag_index = {tag: idx for idx, tag in enumerate(tags)}
+        winners = sorted({record.winner for record in self.records})
+        winner_index = {name: idx for idx, name in enumerate(winners)}
+        payload = {
+            "base_seed": self.base_seed,
+            "iterations": self.iterations,
+            "constants": self._constants,
+            "stats": list(self._stats),
+            "tags": tags,
+            "winners": winners,
+            "battles": [
+                [
+                    record.seed,
+                    winner_index[record.winner],
+                    sorted(tag_index[tag] for tag in record.mechanics),
+                ]
+                for record in self.records
+            ],
+        }
+        Path(path).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    def load(self, path: str | os.PathLike[str]) -> None:
+        """载入 save 写出的记录, 角色工厂仍由调用方提供."""
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        tags = payload["tags"]
+        winners = payload["winners"]
+        self.base_seed = int(payload["base_seed"])
+        self.iterations = int(payload["iterations"])
+        self._constants = dict(payload["constants"])
+        self._stats = (payload["stats"][0], payload["stats"][1])
+        self._interned.clear()
+        self.records = []
+        for seed, winner_idx, tag_ids in payload["battles"]:
+            key = frozenset(tags[idx] for idx in tag_ids)
+            mechanics = self._interned.setdefault(key, key)
+            self.records.append(BattleRecord(seed, winners[winner_idx], mechanics))
@@ -2,23 +2,32 @@
 
 from __future__ import annotations
 
+import threading
 from collections.abc import Iterable
+from types import MappingProxyType
 
 
 class BattleLogger:
-    """支持颜色与类别区分的日志器."""
+    """支持颜色与类别区分的日志器.
+
+    类级配色表只读, 实例的角色配色整体替换而不原地修改, 输出逐行加锁;
+    多个线程可各自持有日志器, 也可共用同一个开启的日志器, 各行输出不会交错.
+    """
 
     RESET = "\033[0m"
     ACTOR_COLORS = ("\033[91m", "\033[94m")  # 红 / 蓝
-    CATEGORY_COLORS = {
-        "system": "\033[90m",
-        "state": "\033[95m",
-        "passive": "\033[96m",
-        "active": "\033[93m",
-        "basic": "\033[92m",
-        "heal": "\033[92m",
-        "damage": "\033[91m",
-    }
+    CATEGORY_COLORS = MappingProxyType(
+        {
+            "system": "\033[90m",
+            "state": "\033[95m",
+            "passive": "\033[96m",
+            "active": "\033[93m",
+            "basic": "\033[92m",
+            "heal": "\033[92m",
+            "damage": "\033[91m",
+        }
+    )
+    _OUTPUT_LOCK = threading.Lock()
 
     def __init__(self, enabled: bool) -> None:
         self.enabled = enabled
@@ -26,9 +35,7 @@ class BattleLogger:
 
     def configure_actors(self, actors: Iterable[str]) -> None:
         """为参与者配置固定颜色."""
-        self._actor_colors.clear()
-        for color, name in zip(self.ACTOR_COLORS, actors):
-            self._actor_colors[name] = color
+        self._actor_colors = {name: color for color, name in zip(self.ACTOR_COLORS, actors)}
 
     def _apply_color(self, text: str, color: str | None) -> str:
         if not color:
@@ -38,7 +45,8 @@ class BattleLogger:
     def log(self, message: str) -> None:
         """仅在开启时输出日志."""
         if self.enabled:
-            print(message)
+            with self._OUTPUT_LOCK:
+                print(message)
 
     def emit(self, actor_name: str | None, category: str, content: str) -> None:
         """输出带有角色颜色与分类颜色的日志."""
@@ -0,0 +1,237 @@
+"""稠密对阵矩阵: 连续整数数组存储胜场、场次与先后手拆分."""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+
+# 文件头: 魔数, 版本, 角色数, 名称区字节数 (小端).
+_HEADER = struct.Struct("<4sHIQ")
+_MAGIC = b"BH3M"
+_VERSION = 1
+
+
+def _zeros(size: int) -> array[int]:
+    return array("q", bytes(8 * size))
+
+
+class MatchupMatrix:
+    """N×N 对阵计数矩阵, 行优先存放在 array('q') 中.
+
+    wins[i, j]        i 击败 j 的场数
+    battles[i, j]     i 与 j 的总场数 (对称)
+    first[i, j]       i 对 j 时 i 先手的场数
+    first_wins[i, j]  i 先手时击败 j 的场数
+    """
+
+    __slots__ = ("names", "_index", "wins", "battles", "first", "first_wins")
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = list(names)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("对阵矩阵的角色名不能重复")
+        self._index = {name: idx for idx, name in enumerate(self.names)}
+        cells = len(self.names) ** 2
+        self.wins = _zeros(cells)
+        self.battles = _zeros(cells)
+        self.first = _zeros(cells)
+        self.first_wins = _zeros(cells)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self._index[name]
+
+    def _cell(self, name_a: str, name_b: str) -> int:
+        return self._index[name_a] * len(self.names) + self._index[name_b]
+
+    def add(self, name_a: str, name_b: str, counts: Sequence[int]) -> None:
+        """累加一组对阵的计数, counts 格式同 run_seeded_seats 的返回值.
+
+        (A 胜场, B 胜场, 平局, A 先手场数, A 先手胜场, B 先手胜场); 平局计入场次.
+        """
+        wins_a, wins_b, draws, first_a, first_wins_a, first_wins_b = counts
+        ab = self._cell(name_a, name_b)
+        ba = self._cell(name_b, name_a)
+        total = wins_a + wins_b + draws
+        self.wins[ab] += wins_a
+        self.wins[ba] += wins_b
+        self.battles[ab] += total
+        self.battles[ba] += total
+        self.first[ab] += first_a
+        self.first[ba] += total - first_a
+        self.first_wins[ab] += first_wins_a
+        self.first_wins[ba] += first_wins_b
+
+    def battles_between(self, name_a: str, name_b: str) -> int:
+        return self.battles[self._cell(name_a, name_b)]
+
+    def rate(self, name_a: str, name_b: str) -> float:
+        """A 对 B 的胜率, 没有对局时为 0."""
+        cell = self._cell(name_a, name_b)
+        battles = self.battles[cell]
+        return self.wins[cell] / battles if battles else 0.0
+
+    def first_mover_rate(self, name_a: str, name_b: str) -> float:
+        """A 先手时对 B 的胜率."""
+        cell = self._cell(name_a, name_b)
+        first = self.first[cell]
+        return self.first_wins[cell] / first if first else 0.0
+
+    def second_mover_rate(self, name_a: str, name_b: str) -> float:
+        """A 后手时对 B 的胜率."""
+        cell = self._cell(name_a, name_b)
+        second = self.battles[cell] - self.first[cell]
+        second_wins = self.wins[cell] - self.first_wins[cell]
+        return second_wins / second if second else 0.0
+
+    def row(self, name: str) -> dict[str, float]:
+        """某角色对其余所有角色的胜率."""
+        return {other: self.rate(name, other) for other in self.names if other != name}
+
+    def overall(self) -> dict[str, float]:
+        """各角色整体胜率."""
+        size = len(self.names)
+        result: dict[str, float] = {}
+        for i, name in enumerate(self.names):
+            row = slice(i * size, (i + 1) * size)
+            battles = sum(self.battles[row])
+            result[name] = sum(self.wins[row]) / battles if battles else 0.0
+        return result
+
+    def to_matchup_rates(self) -> dict[tuple[str, str], dict[str, float]]:
+        """转换为 round_robin_statistics 的 i<j 字典格式."""
+        rates: dict[tuple[str, str], dict[str, float]] = {}
+        for i, name_a in enumerate(self.names):
+            for name_b in self.names[i + 1 :]:
+                battles = self.battles_between(name_a, name_b)
+                if battles:
+                    rates[(name_a, name_b)] = {
+                        name_a: self.rate(name_a, name_b),
+                        name_b: self.rate(name_b, name_a),
+                    }
+        return rates
+
+    def merge(self, other: MatchupMatrix) -> None:
+        """原地累加另一分片的计数; 角色集合不同时取并集."""
+        if other.names == self.names:
+            for mine, theirs in self._arrays_with(other):
+                for cell, value in enumerate(theirs):
+                    if value:
+                        mine[cell] += value
+            return
+        merged = MatchupMatrix(self.names + [n for n in other.names if n not in self._index])
+        for source in (self, other):
+            size = len(source.names)
+            for i, name_a in enumerate(source.names):
+                for j, name_b in enumerate(source.names):
+                    src = i * size + j
+                    dst = merged._cell(name_a, name_b)
+                    for mine, theirs in merged._arrays_with(source):
+                        mine[dst] += theirs[src]
+        self.names = merged.names
+        self._index = merged._index
+        self.wins, self.battles = merged.wins, merged.battles
+        self.first, self.first_wins = merged.first, merged.first_wins
+
+    def _arrays_with(self, other: MatchupMatrix) -> Iterable[tuple[array[int], array[int]]]:
+        return zip(
+            (self.wins, self.battles, self.first, self.first_wins),
+            (other.wins, other.battles, other.first, other.first_wins),
+        )
+
+    def copy(self) -> MatchupMatrix:
+        clone = MatchupMatrix(self.names)
+        clone.merge(self)
+        return clone
+
+    def __add__(self, other: MatchupMatrix) -> MatchupMatrix:
+        result = self.copy()
+        result.merge(other)
+        return result
+
+    def __iadd__(self, other: MatchupMatrix) -> MatchupMatrix:
+        self.merge(other)
+        return self
+
+    def to_bytes(self) -> bytes:
+        """紧凑二进制: 文件头 + NUL 分隔的 UTF-8 名称 + 四个小端 int64 数组."""
+        names_blob = "\0".join(self.names).encode("utf-8")
+        parts = [_HEADER.pack(_MAGIC, _VERSION, len(self.names), len(names_blob)), names_blob]
+        for values in (self.wins, self.battles, self.first, self.first_wins):
+            if sys.byteorder == "big":
+                swapped = array("q", values)
+                swapped.byteswap()
+                parts.append(swapped.tobytes())
+            else:
+                parts.append(values.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> MatchupMatrix:
+        magic, version, count, names_size = _HEADER.unpack_from(blob)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("不是可识别的对阵矩阵数据")
+        offset = _HEADER.size
+        names = blob[offset : offset + names_size].decode("utf-8").split("\0") if count else []
+        offset += names_size
+        matrix = cls(names)
+        span = 8 * count * count
+        if len(blob) != offset + 4 * span:
+            raise ValueError("对阵矩阵数据长度不符")
+        arrays = []
+        for _ in range(4):
+            values = array("q")
+            values.frombytes(blob[offset : offset + span])
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            offset += span
+        matrix.wins, matrix.battles, matrix.first, matrix.first_wins = arrays
+        return matrix
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """原子写入文件."""
+        target = Path(path)
+        tmp_path = target.with_name(target.name + ".tmp")
+        tmp_path.write_bytes(self.to_bytes())
+        os.replace(tmp_path, target)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> MatchupMatrix:
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+def matchup_matrix(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    iterations_per_pair: int = 10_000,
+    seed: int = 0,
+    pool: SimulationPool | None = None,
+) -> MatchupMatrix:
+    """跑完整循环赛并直接填入稠密矩阵, 同时记录先后手拆分.
+
+    pool 决定工作进程数与回合上限 (max_rounds / stalemate_rounds), 由调用方负责关闭;
+    不传时在当前进程内按默认上限执行.
+    """
+    names = list(roster)
+    pairs = [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))]
+    jobs = [
+        PairJob(roster[a], roster[b], pair_seed(seed, a, b), 0, iterations_per_pair)
+        for a, b in pairs
+    ]
+    matrix = MatchupMatrix(names)
+    with nullcontext(pool) if pool is not None else SimulationPool() as active:
+        for (name_a, name_b), counts in zip(pairs, active.run_seats(jobs)):
+            matrix.add(name_a, name_b, counts)
+    return matrix
@@ -0,0 +1,217 @@
+"""平衡优化模块: 以 SPSA 调整属性/常量, 让对阵胜率矩阵逼近目标值."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+from bh3_duel_sim.sweep import SweepAxis, apply_overrides
+
+
+@dataclass
+class OptimizationResult:
+    """优化结果: 最优参数、对应偏差、消耗场数与逐轮历史."""
+
+    best_params: dict[str, float]
+    best_objective: float
+    battles_used: int
+    iterations: int
+    history: list[dict[str, float]] = field(default_factory=list)
+
+
+def _denormalize(axes: Sequence[SweepAxis], theta: Sequence[float]) -> dict[str, float]:
+    return {axis.key: axis.low + (axis.high - axis.low) * u for axis, u in zip(axes, theta)}
+
+
+class BalanceObjective:
+    """胜率矩阵偏差: 所有对阵 (胜率 - 目标)^2 的均值.
+
+    不含被调整角色的对阵与参数无关, 首次评估后缓存, 之后只模拟受影响的对阵.
+    """
+
+    def __init__(
+        self,
+        roster: Mapping[str, Callable[[], BaseCharacter]],
+        axes: Sequence[SweepAxis],
+        target: float = 0.5,
+        iterations: int = 1_000,
+    ) -> None:
+        self.roster = dict(roster)
+        self.target = target
+        self.iterations = iterations
+        tuned = {axis.character for axis in axes}
+        names = list(self.roster)
+        pairs = [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))]
+        self.tuned_pairs = [pair for pair in pairs if tuned & set(pair)]
+        self.fixed_pairs = [pair for pair in pairs if not tuned & set(pair)]
+        self.fixed_error: float | None = None
+
+    def jobs(self, params: Mapping[str, float], seed: int) -> list[PairJob]:
+        """生成一次评估所需的对局任务, seed 相同即共享随机数."""
+        variant_roster = apply_overrides(self.roster, params)
+        return [
+            PairJob(variant_roster[a], variant_roster[b], pair_seed(seed, a, b), 0, self.iterations)
+            for a, b in self.tuned_pairs
+        ]
+
+    def fixed_jobs(self, seed: int) -> list[PairJob]:
+        """不受参数影响的对阵, 只需评估一次."""
+        if self.fixed_error is not None:
+            return []
+        return [
+            PairJob(self.roster[a], self.roster[b], pair_seed(seed, a, b), 0, self.iterations)
+            for a, b in self.fixed_pairs
+        ]
+
+    def _squared_error(self, outcomes: Sequence[tuple[int, int]]) -> float:
+        # 胜率以总场数为分母, 平局既不算胜也不算负.
+        battles = max(1, self.iterations)
+        return sum((wins_a / battles - self.target) ** 2 for wins_a, _ in outcomes)
+
+    def score(
+        self,
+        tuned_outcomes: Sequence[tuple[int, int]],
+        fixed_outcomes: Sequence[tuple[int, int]] = (),
+    ) -> float:
+        """由对局结果计算偏差, 首次传入的固定对阵结果会被缓存."""
+        if self.fixed_error is None:
+            self.fixed_error = self._squared_error(fixed_outcomes)
+        pair_count = len(self.tuned_pairs) + len(self.fixed_pairs)
+        return (self._squared_error(tuned_outcomes) + self.fixed_error) / max(1, pair_count)
+
+
+@dataclass
+class _SpsaState:
+    """SPSA 迭代状态, 整体写入检查点."""
+
+    theta: list[float]
+    best_theta: list[float]
+    step: int = 0
+    best_objective: float = float("inf")
+    battles_used: int = 0
+    fixed_error: float | None = None
+    history: list[dict[str, float]] = field(default_factory=list)
+
+
+def _load_checkpoint(path: Path | None, config: dict[str, object]) -> _SpsaState | None:
+    if path is None or not path.exists():
+        return None
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("config") != config:
+        raise ValueError(f"检查点 {path} 与本次优化参数不一致")
+    return _SpsaState(**payload["state"])
+
+
+def _save_checkpoint(path: Path | None, config: dict[str, object], state: _SpsaState) -> None:
+    if path is None:
+        return
+    tmp_path = path.with_name(path.name + ".tmp")
+    payload = {"config": config, "state": asdict(state)}
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+@dataclass(frozen=True)
+class BalanceOptions:
+    """optimize_balance 的目标、预算与 SPSA 参数.
+
+    battle_budget 为总场数上限 (含平局); step_size / perturbation 为 SPSA 增益与扰动幅度;
+    指定 checkpoint_path 时每步原子写入检查点, 可中断续跑.
+    """
+
+    target: float = 0.5
+    iterations_per_pair: int = 1_000
+    max_steps: int = 50
+    battle_budget: int | None = None
+    seed: int = 0
+    workers: int = 1
+    step_size: float = 0.2
+    perturbation: float = 0.1
+    checkpoint_path: str | os.PathLike[str] | None = None
+
+
+def optimize_balance(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    axes: Sequence[SweepAxis],
+    options: BalanceOptions | None = None,
+) -> OptimizationResult:
+    """SPSA 优化: 每步只需两次评估, 且两次评估使用公共随机数.
+
+    决策变量按各自 [low, high] 归一化到 [0, 1], 初值取区间中点. 每步 (θ+cΔ) 与
+    (θ-cΔ) 共享同一批对局种子, 梯度估计只反映参数差异而非抽样噪声; 两次评估的任务
+    合并成一批交给进程池.
+    """
+    options = options or BalanceOptions()
+    target, iterations_per_pair, seed = options.target, options.iterations_per_pair, options.seed
+    max_steps, battle_budget = options.max_steps, options.battle_budget
+    step_size, perturbation = options.step_size, options.perturbation
+    objective = BalanceObjective(roster, axes, target, iterations_per_pair)
+    config: dict[str, object] = {
+        "axes": [asdict(axis) for axis in axes],
+        "roster": list(roster),
+        "target": target,
+        "iterations_per_pair": iterations_per_pair,
+        "seed": seed,
+        "step_size": step_size,
+        "perturbation": perturbation,
+    }
+    checkpoint_path = options.checkpoint_path
+    path = Path(checkpoint_path) if checkpoint_path is not None else None
+    state = _load_checkpoint(path, config) or _SpsaState(
+        theta=[0.5] * len(axes), best_theta=[0.5] * len(axes)
+    )
+    objective.fixed_error = state.fixed_error
+
+    with SimulationPool(workers=options.workers) as pool:
+        while state.step < max_steps:
+            if battle_budget is not None and state.battles_used >= battle_budget:
+                break
+            step = state.step
+            theta = state.theta
+            # SPSA 标准增益序列 (Spall 推荐指数 0.602 / 0.101).
+            gain = step_size / (step + 1 + max_steps * 0.1) ** 0.602
+            width = perturbation / (step + 1) ** 0.101
+            rng = random.Random(seed * 1_000_003 + step)
+            delta = [rng.choice((-1.0, 1.0)) for _ in axes]
+            plus = [min(1.0, max(0.0, u + width * d)) for u, d in zip(theta, delta)]
+            minus = [min(1.0, max(0.0, u - width * d)) for u, d in zip(theta, delta)]
+            step_seed = seed + step
+            jobs_plus = objective.jobs(_denormalize(axes, plus), step_seed)
+            jobs_minus = objective.jobs(_denormalize(axes, minus), step_seed)
+            jobs_fixed = objective.fixed_jobs(step_seed)
+            jobs = jobs_plus + jobs_minus + jobs_fixed
+            outcomes = pool.run(jobs)
+            state.battles_used += sum(job.stop - job.start for job in jobs)
+            split = len(jobs_plus)
+            f_plus = objective.score(outcomes[:split], outcomes[2 * split :])
+            f_minus = objective.score(outcomes[split : 2 * split])
+            center = (f_plus + f_minus) / 2
+            if center < state.best_objective:
+                state.best_objective = center
+                state.best_theta = list(theta)
+            state.theta = [
+                min(1.0, max(0.0, u - gain * (f_plus - f_minus) / (plus[i] - minus[i] or 1.0)))
+                for i, u in enumerate(theta)
+            ]
+            state.step += 1
+            state.fixed_error = objective.fixed_error
+            state.history.append(
+                {"step": state.step, "objective": center, "battles": state.battles_used}
+            )
+            _save_checkpoint(path, config, state)
+
+    return OptimizationResult(
+        best_params=_denormalize(axes, state.best_theta),
+        best_objective=state.best_objective,
+        battles_used=state.battles_used,
+        iterations=state.step,
+        history=state.history,
+    )
@@ -0,0 +1,209 @@
+"""多进程 / 多线程对局执行模块."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from operator import add
+from typing import Callable, TypeVar
+
+from bh3_duel_sim.distributions import MatchupDistributions, run_seeded_distributions
+from bh3_duel_sim.simulator import (
+    DEFAULT_MAX_ROUNDS,
+    DEFAULT_STALEMATE_ROUNDS,
+    BattleSimulator,
+    PairJob,
+    run_seeded_outcomes,
+    run_seeded_range,
+    run_seeded_seats,
+)
+from bh3_duel_sim.telemetry import TelemetryCounters, run_seeded_telemetry
+
+DEFAULT_CHUNK_SIZE = 500
+# 执行后端; inline 为单 worker 时的当前线程执行, 不可显式指定.
+BACKEND_AUTO = "auto"
+BACKEND_PROCESS = "process"
+BACKEND_THREAD = "thread"
+BACKEND_INLINE = "inline"
+BACKENDS = (BACKEND_AUTO, BACKEND_PROCESS, BACKEND_THREAD)
+# run_seeded_seats 返回的计数个数.
+SEAT_FIELDS = 6
+
+_T = TypeVar("_T")
+
+
+# 每个工作线程 (进程模式下即每个进程的主线程) 复用一个驱动器, 逐场重设种子,
+# 角色实例由工厂逐场新建, 线程之间不共享任何可变状态.
+_LOCAL = threading.local()
+
+
+def _worker_simulator() -> BattleSimulator:
+    simulator = getattr(_LOCAL, "simulator", None)
+    if simulator is None:
+        simulator = _LOCAL.simulator = BattleSimulator()
+    return simulator
+
+
+def _configure_worker(max_rounds: int, stalemate_rounds: int) -> None:
+    _LOCAL.simulator = BattleSimulator(max_rounds=max_rounds, stalemate_rounds=stalemate_rounds)
+
+
+def gil_enabled() -> bool:
+    """当前解释器是否启用 GIL; 标准构建恒为 True, 自由线程构建可能为 False."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def resolve_backend(backend: str, workers: int) -> str:
+    """确定实际后端: 单 worker 为 inline; auto 在 GIL 关闭时选线程, 否则选进程."""
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的执行后端: {backend}")
+    if workers <= 1:
+        return BACKEND_INLINE
+    if backend == BACKEND_AUTO:
+        return BACKEND_PROCESS if gil_enabled() else BACKEND_THREAD
+    return backend
+
+
+def _run_chunk(job: PairJob) -> tuple[int, int]:
+    return run_seeded_range(_worker_simulator(), job)
+
+
+def _run_chunk_outcomes(job: PairJob) -> bytes:
+    return run_seeded_outcomes(_worker_simulator(), job)
+
+
+def _run_chunk_seats(job: PairJob) -> tuple[int, int, int, int, int, int]:
+    return run_seeded_seats(_worker_simulator(), job)
+
+
+def _run_chunk_distributions(job: PairJob) -> MatchupDistributions:
+    return run_seeded_distributions(_worker_simulator(), job)
+
+
+def _run_chunk_telemetry(job: PairJob) -> TelemetryCounters:
+    return run_seeded_telemetry(_worker_simulator(), job)
+
+
+class SimulationPool:
+    """对局执行池: workers<=1 时在当前线程内执行, 否则分块交给进程池或线程池.
+
+    backend 为 auto 时按 GIL 是否启用自动选择: 启用时线程无法并行, 用进程池;
+    自由线程构建下用线程池, 省去进程启动、导入与 pickle 开销. 进程池要求工厂可被
+    pickle (角色类或 LazyFactory), 线程池与单线程模式也接受闭包工厂.
+    max_rounds / stalemate_rounds 传给各工作者的驱动器, 超限的对局记为平局.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        *,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        stalemate_rounds: int = DEFAULT_STALEMATE_ROUNDS,
+        backend: str = BACKEND_AUTO,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.backend = resolve_backend(backend, self.workers)
+        self._executor: Executor | None = None
+        limits = (max_rounds, stalemate_rounds)
+        if self.backend == BACKEND_PROCESS:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_configure_worker, initargs=limits
+            )
+        elif self.backend == BACKEND_THREAD:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, initializer=_configure_worker, initargs=limits
+            )
+        else:
+            _configure_worker(*limits)
+
+    def __enter__(self) -> SimulationPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """关闭进程池或线程池."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _split(self, job: PairJob, per_chunk: bool = False) -> list[PairJob]:
+        # 并行时按块切分, 让各工作者负载均衡; 单线程不切分, 省去调度开销,
+        # 除非调用方要逐块回报进度.
+        if self._executor is None and not per_chunk:
+            return [job]
+        size = self.chunk_size
+        return [
+            PairJob(job.spawn_a, job.spawn_b, job.base_seed, start, min(start + size, job.stop))
+            for start in range(job.start, job.stop, size)
+        ]
+
+    def _map_chunks(
+        self,
+        runner: Callable[[PairJob], _T],
+        jobs: Sequence[PairJob],
+        per_chunk: bool = False,
+    ) -> Iterator[tuple[int, PairJob, _T]]:
+        """切块执行任务, 按输入顺序逐块产出 (任务序号, 块, 块结果), 由调用方合并."""
+        chunks = [
+            (idx, chunk) for idx, job in enumerate(jobs) for chunk in self._split(job, per_chunk)
+        ]
+        if self._executor is None:
+            outcomes = map(runner, (chunk for _, chunk in chunks))
+        else:
+            outcomes = self._executor.map(runner, [chunk for _, chunk in chunks])
+        for (idx, chunk), outcome in zip(chunks, outcomes):
+            yield idx, chunk, outcome
+
+    def run(
+        self,
+        jobs: Sequence[PairJob],
+        on_chunk: Callable[[int, int, int, int], None] | None = None,
+    ) -> list[tuple[int, int]]:
+        """执行一批任务, 按输入顺序返回各自的 (A 胜场, B 胜场).
+
+        on_chunk(任务序号, 场数, A 胜场, B 胜场) 在主进程中随每块结果调用, 用于进度报告.
+        """
+        results = [(0, 0) for _ in jobs]
+        for idx, chunk, (wins_a, wins_b) in self._map_chunks(
+            _run_chunk, jobs, on_chunk is not None
+        ):
+            total_a, total_b = results[idx]
+            results[idx] = (total_a + wins_a, total_b + wins_b)
+            if on_chunk is not None:
+                on_chunk(idx, chunk.stop - chunk.start, wins_a, wins_b)
+        return results
+
+    def run_outcomes(self, jobs: Sequence[PairJob]) -> list[bytes]:
+        """执行一批任务, 按输入顺序返回逐场结果 (1 表示 A 胜), 供配对分析使用."""
+        results = [bytearray() for _ in jobs]
+        for idx, _, outcomes in self._map_chunks(_run_chunk_outcomes, jobs):
+            results[idx] += outcomes
+        return [bytes(result) for result in results]
+
+    def run_seats(self, jobs: Sequence[PairJob]) -> list[tuple[int, ...]]:
+        """执行一批任务, 按输入顺序返回各自的先后手拆分 (格式同 run_seeded_seats)."""
+        results: list[tuple[int, ...]] = [(0,) * SEAT_FIELDS for _ in jobs]
+        for idx, _, counts in self._map_chunks(_run_chunk_seats, jobs):
+            results[idx] = tuple(map(add, results[idx], counts))
+        return results
+
+    def run_distributions(self, jobs: Sequence[PairJob]) -> list[MatchupDistributions]:
+        """执行一批任务, 按输入顺序返回各自合并后的回合数与剩余生命分布."""
+        results = [MatchupDistributions() for _ in jobs]
+        for idx, _, distributions in self._map_chunks(_run_chunk_distributions, jobs):
+            results[idx].merge(distributions)
+        return results
+
+    def run_telemetry(self, jobs: Sequence[PairJob]) -> list[TelemetryCounters]:
+        """执行一批任务, 按输入顺序返回各自合并后的伤害与机制归因计数."""
+        results = [TelemetryCounters() for _ in jobs]
+        for idx, _, counters in self._map_chunks(_run_chunk_telemetry, jobs):
+            results[idx].merge(counters)
+        return results
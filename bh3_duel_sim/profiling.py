@@ -0,0 +1,271 @@
+"""分阶段耗时剖析: 按 (角色类, 阶段) 累计调用次数与纳秒耗时, 关闭时零开销.
+
+与 telemetry 相同, 剖析器通过在实例上覆盖方法挂接: 驱动器的 _exec_turn 记为
+"turn" 阶段, 角色的状态 / 被动 / 主动 / 普攻阶段及受伤、治疗、施加状态各记一个
+阶段. 未挂接的驱动器与角色走类上的原方法, 不受任何影响.
+
+每次调用同时记录总耗时与自身耗时 (扣除嵌套在内的其它阶段), 并按调用栈路径累计
+自身耗时, 可导出为平铺报告, 或 flamegraph.pl / speedscope 可读的折叠栈格式.
+计时本身有包装开销, 绝对值偏大, 适合比较各阶段与各角色的相对占比.
+
+用法: python -m bh3_duel_sim.profiling --roster 丽塔,薇塔 --battles 2000 --collapsed out.folded
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import unicodedata
+from array import array
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, Callable
+
+from bh3_duel_sim.characters import build_valkyrie_roster
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.parallel import PairJob
+from bh3_duel_sim.simulator import BattleSimulator, battle_seed, pair_seed
+
+# (角色类名, 阶段).
+PhaseKey = tuple[str, str]
+
+# 角色实例上被覆盖的方法及其阶段名.
+PHASE_METHODS = {
+    "apply_state_effects": "state",
+    "resolve_passive_phase": "passive",
+    "resolve_active_phase": "active",
+    "perform_basic_attack": "basic",
+    "take_damage": "take_damage",
+    "heal": "heal",
+    "apply_state": "apply_state",
+}
+TURN_PHASE = "turn"
+
+INITIAL_SLOTS = 32
+# 平铺报告各列的显示宽度, 表头与数据行共用; 前 LEFT_ALIGNED 列左对齐, 其余右对齐.
+REPORT_COLUMNS = (24, 16, 12, 14, 14, 12, 12)
+LEFT_ALIGNED = 2
+REPORT_HEADERS = ("角色类", "阶段", "次数", "总耗时ms", "自身ms", "自身占比", "ns/次")
+MIN_PLAYERS = 2
+
+
+def _report_line(cells: Sequence[str]) -> str:
+    # 按终端显示宽度补齐: 全角字符占两列, 否则中文表头会把后面的列挤歪.
+    parts = []
+    for index, (cell, width) in enumerate(zip(cells, REPORT_COLUMNS)):
+        shown = sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in cell)
+        pad = " " * max(0, width - shown)
+        parts.append(cell + pad if index < LEFT_ALIGNED else pad + cell)
+    return "".join(parts)
+
+
+class PhaseProfiler:
+    """预分配槽位的阶段计时表: 每个 (角色类, 阶段) 一个槽, 槽内为 次数 / 总耗时 / 自身耗时.
+
+    stacks 按调用栈路径累计自身耗时 (纳秒). 可 pickle, 跨进程结果用 merge 相加.
+    """
+
+    __slots__ = ("_index", "_keys", "calls", "total_ns", "self_ns", "stacks", "_stack")
+
+    def __init__(self) -> None:
+        self._index: dict[PhaseKey, int] = {}
+        self._keys: list[PhaseKey] = []
+        self.calls = array("q", bytes(8 * INITIAL_SLOTS))
+        self.total_ns = array("q", bytes(8 * INITIAL_SLOTS))
+        self.self_ns = array("q", bytes(8 * INITIAL_SLOTS))
+        self.stacks: dict[tuple[PhaseKey, ...], int] = {}
+        # 进行中的调用: [栈路径, 已计入的子阶段耗时].
+        self._stack: list[list[Any]] = []
+
+    def __getstate__(self) -> tuple[object, ...]:
+        return self._index, self._keys, self.calls, self.total_ns, self.self_ns, self.stacks
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self._index, self._keys, self.calls, self.total_ns, self.self_ns, self.stacks = state
+        self._stack = []
+
+    def _slot(self, key: PhaseKey) -> int:
+        slot = self._index.get(key)
+        if slot is not None:
+            return slot
+        slot = len(self._keys)
+        if slot == len(self.calls):
+            self.calls.extend(array("q", bytes(8 * slot)))
+            self.total_ns.extend(array("q", bytes(8 * slot)))
+            self.self_ns.extend(array("q", bytes(8 * slot)))
+        self._index[key] = slot
+        self._keys.append(key)
+        return slot
+
+    def add_totals(self, key: PhaseKey, calls: int, total_ns: int, self_ns: int) -> None:
+        """按已汇总的 (次数, 总耗时, 自身耗时) 累加一个键."""
+        slot = self._slot(key)
+        self.calls[slot] += calls
+        self.total_ns[slot] += total_ns
+        self.self_ns[slot] += self_ns
+
+    def get(self, class_name: str, phase: str) -> tuple[int, int, int]:
+        """返回 (次数, 总耗时 ns, 自身耗时 ns), 未出现过的键为全零."""
+        slot = self._index.get((class_name, phase))
+        if slot is None:
+            return 0, 0, 0
+        return self.calls[slot], self.total_ns[slot], self.self_ns[slot]
+
+    def items(self) -> Iterator[tuple[PhaseKey, int, int, int]]:
+        for slot, key in enumerate(self._keys):
+            yield key, self.calls[slot], self.total_ns[slot], self.self_ns[slot]
+
+    def merge(self, other: PhaseProfiler) -> None:
+        for key, calls, total_ns, self_ns in other.items():
+            self.add_totals(key, calls, total_ns, self_ns)
+        for path, elapsed in other.stacks.items():
+            self.stacks[path] = self.stacks.get(path, 0) + elapsed
+
+    def _timed(self, key: PhaseKey, method: Callable[..., Any]) -> Callable[..., Any]:
+        slot = self._slot(key)
+        calls = self.calls
+        total_ns = self.total_ns
+        self_ns = self.self_ns
+        stacks = self.stacks
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            path = stack[-1][0] + (key,) if stack else (key,)
+            frame = [path, 0]
+            stack.append(frame)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stack.pop()
+                own = elapsed - frame[1]
+                calls[slot] += 1
+                total_ns[slot] += elapsed
+                self_ns[slot] += own
+                stacks[path] = stacks.get(path, 0) + own
+                if stack:
+                    stack[-1][1] += elapsed
+
+        return wrapped
+
+    def attach(self, fighter_a: BaseCharacter, fighter_b: BaseCharacter) -> None:
+        """为一场对局的双方挂接计时, 需在 simulate_once 之前调用."""
+        for fighter in (fighter_a, fighter_b):
+            class_name = type(fighter).__name__
+            namespace = fighter.__dict__
+            for method_name, phase in PHASE_METHODS.items():
+                namespace[method_name] = self._timed(
+                    (class_name, phase), getattr(fighter, method_name)
+                )
+
+    @staticmethod
+    def detach(fighter: BaseCharacter) -> None:
+        """移除角色上的挂接, 恢复类上的原方法."""
+        for method_name in PHASE_METHODS:
+            fighter.__dict__.pop(method_name, None)
+
+    def attach_simulator(self, simulator: BattleSimulator) -> None:
+        """为驱动器的 _exec_turn 挂接计时, 按行动方的角色类记为 "turn" 阶段."""
+        exec_turn = simulator._exec_turn
+        by_class: dict[type, Callable[..., Any]] = {}
+
+        def wrapped_turn(actor: BaseCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
+            timed = by_class.get(type(actor))
+            if timed is None:
+                timed = by_class[type(actor)] = self._timed(
+                    (type(actor).__name__, TURN_PHASE), exec_turn
+                )
+            timed(actor, target, logger)
+
+        simulator.__dict__["_exec_turn"] = wrapped_turn
+
+    @staticmethod
+    def detach_simulator(simulator: BattleSimulator) -> None:
+        simulator.__dict__.pop("_exec_turn", None)
+
+    def report(self, top: int | None = None) -> str:
+        """平铺报告: 按自身耗时降序, 列出次数、总耗时、自身耗时、自身占比与单次耗时."""
+        rows = sorted(self.items(), key=lambda item: item[3], reverse=True)
+        grand = sum(self_ns for *_, self_ns in rows) or 1
+        lines = [_report_line(REPORT_HEADERS)]
+        for (class_name, phase), calls, total_ns, self_ns in rows[:top]:
+            per_call = total_ns / calls if calls else 0.0
+            cells = (
+                class_name,
+                phase,
+                str(calls),
+                f"{total_ns / 1e6:.1f}",
+                f"{self_ns / 1e6:.1f}",
+                f"{self_ns / grand:.1%}",
+                f"{per_call:.0f}",
+            )
+            lines.append(_report_line(cells))
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """折叠栈格式: 每行 "类.阶段;类.阶段;... 自身耗时ns", 可直接交给 flamegraph.pl."""
+        lines = [
+            ";".join(f"{class_name}.{phase}" for class_name, phase in path) + f" {elapsed}"
+            for path, elapsed in sorted(self.stacks.items())
+            if elapsed > 0
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_collapsed(self, path: str | Path) -> None:
+        Path(path).write_text(self.collapsed(), encoding="utf-8")
+
+
+def run_seeded_profile(
+    simulator: BattleSimulator, job: PairJob, profiler: PhaseProfiler | None = None
+) -> PhaseProfiler:
+    """与 run_seeded_range 相同的定种对局 (job 的序号区间), 累计双方各阶段的耗时."""
+    quiet_logger = BattleLogger(enabled=False)
+    profiler = profiler if profiler is not None else PhaseProfiler()
+    profiler.attach_simulator(simulator)
+    try:
+        for index in range(job.start, job.stop):
+            fighter_a = job.spawn_a()
+            fighter_b = job.spawn_b()
+            profiler.attach(fighter_a, fighter_b)
+            simulator.simulate_seeded(
+                fighter_a, fighter_b, quiet_logger, battle_seed(job.base_seed, index)
+            )
+    finally:
+        profiler.detach_simulator(simulator)
+    return profiler
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """命令行入口: 对名单两两对阵剖析, 输出平铺报告, 可另存折叠栈."""
+    parser = argparse.ArgumentParser(description="按角色类与阶段剖析回合耗时")
+    parser.add_argument("--roster", metavar="NAMES", help="参赛角色显示名, 逗号分隔 (默认全部)")
+    parser.add_argument("--battles", type=int, default=1000, help="每组对阵场数")
+    parser.add_argument("--seed", type=int, default=0, help="基础随机种子")
+    parser.add_argument("--top", type=int, help="报告只列耗时最高的前 N 项")
+    parser.add_argument("--collapsed", metavar="PATH", help="写出折叠栈文件 (火焰图输入)")
+    args = parser.parse_args(argv)
+
+    roster = build_valkyrie_roster()
+    names = [name for name in args.roster.split(",") if name] if args.roster else list(roster)
+    unknown = [name for name in names if name not in roster]
+    if unknown:
+        raise SystemExit(f"未知角色: {', '.join(unknown)} (可选: {', '.join(roster)})")
+    if len(names) < MIN_PLAYERS:
+        raise SystemExit("至少需要两名角色")
+    profiler = PhaseProfiler()
+    simulator = BattleSimulator()
+    for i, name_a in enumerate(names):
+        for name_b in names[i + 1 :]:
+            seed = pair_seed(args.seed, name_a, name_b)
+            job = PairJob(roster[name_a], roster[name_b], seed, 0, args.battles)
+            run_seeded_profile(simulator, job, profiler)
+    print(profiler.report(args.top))
+    if args.collapsed:
+        profiler.write_collapsed(args.collapsed)
+
+
+if __name__ == "__main__":
+    main()
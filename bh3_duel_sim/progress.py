@@ -0,0 +1,312 @@
+"""长时间运行的进度与收敛遥测.
+
+运行器按块 (而非逐场) 向 ProgressTracker 报告各组对阵的累计场数与胜场, 追踪器
+按固定最短间隔生成快照交给输出端: 已完成场数、吞吐 (场/秒)、预计剩余时间, 以及
+每组对阵当前的 95% 置信区间半宽. 输出端有终端进度 (TerminalProgress) 与
+Prometheus 文本格式指标文件 (PrometheusTextfile, 供本地 node_exporter 等采集).
+
+报告只在块边界发生, 且两次输出之间只做几次加法与一次时钟读取, 热循环本身不受影响.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Protocol, TextIO
+
+from bh3_duel_sim.simulator import win_rate_half_width
+
+DEFAULT_INTERVAL_SECONDS = 1.0
+DEFAULT_PAIR_LINES = 8
+DEFAULT_METRIC_PREFIX = "bh3_duel_sim"
+# 吞吐滑动平均中最新一段速率的权重.
+RATE_SMOOTHING = 0.3
+
+
+@dataclass(frozen=True)
+class PairSnapshot:
+    """单组对阵的进度: planned 为计划场数 (精度模式为上限)."""
+
+    name_a: str
+    name_b: str
+    battles: int
+    planned: int
+    wins_a: int
+
+    @property
+    def rate_a(self) -> float:
+        return self.wins_a / self.battles if self.battles else 0.0
+
+    @property
+    def half_width(self) -> float:
+        return win_rate_half_width(self.wins_a, self.battles)
+
+    @property
+    def finished(self) -> bool:
+        return self.battles >= self.planned
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """某一时刻的整体进度; simulated 只计本次实际模拟的场数, 不含缓存与续跑前的部分."""
+
+    elapsed: float
+    completed: int
+    planned: int
+    simulated: int
+    battles_per_second: float
+    pairs: tuple[PairSnapshot, ...]
+    final: bool = False
+
+    @property
+    def eta_seconds(self) -> float | None:
+        remaining = self.planned - self.completed
+        if remaining <= 0:
+            return 0.0
+        if self.battles_per_second <= 0:
+            return None
+        return remaining / self.battles_per_second
+
+
+class ProgressSink(Protocol):
+    def emit(self, snapshot: ProgressSnapshot) -> None: ...
+
+
+class _PairStatus:
+    __slots__ = ("planned", "battles", "wins_a")
+
+    def __init__(self, planned: int) -> None:
+        self.planned = planned
+        self.battles = 0
+        self.wins_a = 0
+
+
+class ProgressTracker:
+    """汇总各组对阵进度, 每隔至少 interval 秒把快照交给全部输出端.
+
+    对阵以 (A, B) 名称对标识; 吞吐取相邻两次输出间速率的指数滑动平均.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[ProgressSink],
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.sinks = list(sinks)
+        self.interval = interval
+        self._clock = clock
+        self._pairs: dict[tuple[str, str], _PairStatus] = {}
+        self._started = clock()
+        self._next_emit = self._started + interval
+        self._simulated = 0
+        self._last_time = self._started
+        self._last_simulated = 0
+        self._rate = 0.0
+
+    def plan(self, name_a: str, name_b: str, battles: int) -> None:
+        """登记 (或修改) 一组对阵的计划场数."""
+        status = self._pairs.get((name_a, name_b))
+        if status is None:
+            self._pairs[(name_a, name_b)] = _PairStatus(battles)
+        else:
+            status.planned = battles
+
+    def finish(self, name_a: str, name_b: str) -> None:
+        """对阵提前结束 (如精度模式已达标): 计划场数改为已完成场数."""
+        status = self._status(name_a, name_b)
+        status.planned = status.battles
+
+    def record_cached(self, name_a: str, name_b: str, battles: int, wins_a: int) -> None:
+        """登记无需模拟即得到的进度 (缓存命中、检查点续跑), 不计入吞吐."""
+        status = self._status(name_a, name_b)
+        status.battles = battles
+        status.wins_a = wins_a
+
+    def update(self, name_a: str, name_b: str, battles: int, wins_a: int) -> None:
+        """报告一组对阵的累计场数与 A 胜场."""
+        status = self._status(name_a, name_b)
+        self._simulated += battles - status.battles
+        status.battles = battles
+        status.wins_a = wins_a
+        if self._clock() >= self._next_emit:
+            self._emit(final=False)
+
+    def add(self, name_a: str, name_b: str, battles: int, wins_a: int) -> None:
+        """报告一组对阵新完成的一块 (场数与其中的 A 胜场)."""
+        status = self._status(name_a, name_b)
+        self.update(name_a, name_b, status.battles + battles, status.wins_a + wins_a)
+
+    def close(self) -> None:
+        """输出最终快照."""
+        self._emit(final=True)
+
+    def snapshot(self, final: bool = False) -> ProgressSnapshot:
+        pairs = tuple(
+            PairSnapshot(name_a, name_b, status.battles, status.planned, status.wins_a)
+            for (name_a, name_b), status in self._pairs.items()
+        )
+        return ProgressSnapshot(
+            elapsed=self._clock() - self._started,
+            completed=sum(pair.battles for pair in pairs),
+            planned=sum(max(pair.planned, pair.battles) for pair in pairs),
+            simulated=self._simulated,
+            battles_per_second=self._rate,
+            pairs=pairs,
+            final=final,
+        )
+
+    def _status(self, name_a: str, name_b: str) -> _PairStatus:
+        status = self._pairs.get((name_a, name_b))
+        if status is None:
+            status = self._pairs[(name_a, name_b)] = _PairStatus(0)
+        return status
+
+    def _emit(self, final: bool) -> None:
+        now = self._clock()
+        window = now - self._last_time
+        if window > 0:
+            recent = (self._simulated - self._last_simulated) / window
+            if self._rate == 0:
+                self._rate = recent
+            else:
+                self._rate = RATE_SMOOTHING * recent + (1 - RATE_SMOOTHING) * self._rate
+        if final and now > self._started:
+            self._rate = self._simulated / (now - self._started)
+        self._last_time = now
+        self._last_simulated = self._simulated
+        self._next_emit = now + self.interval
+        snapshot = self.snapshot(final)
+        for sink in self.sinks:
+            sink.emit(snapshot)
+
+
+def _format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds + 0.5)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+class TerminalProgress:
+    """终端进度: 一行总览, 终端上另列置信区间最宽的几组未完成对阵并原地刷新.
+
+    输出不是终端 (重定向到文件) 时每次只追加总览行, 便于日志查看.
+    """
+
+    def __init__(self, stream: TextIO | None = None, pair_lines: int = DEFAULT_PAIR_LINES) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+        self.pair_lines = pair_lines
+        self.interactive = self.stream.isatty()
+        self._drawn = 0
+
+    def emit(self, snapshot: ProgressSnapshot) -> None:
+        percent = snapshot.completed / snapshot.planned if snapshot.planned else 1.0
+        status = "完成" if snapshot.final else f"剩余 {_format_duration(snapshot.eta_seconds)}"
+        lines = [
+            f"进度 {snapshot.completed:,}/{snapshot.planned:,} 场 ({percent:.1%}), "
+            f"{snapshot.battles_per_second:,.0f} 场/秒, "
+            f"已用 {_format_duration(snapshot.elapsed)}, {status}"
+        ]
+        if self.interactive and not snapshot.final:
+            running = [pair for pair in snapshot.pairs if not pair.finished and pair.battles]
+            running.sort(key=lambda pair: pair.half_width, reverse=True)
+            lines.extend(
+                f"  {pair.name_a} vs {pair.name_b}: {pair.battles:,}/{pair.planned:,} 场, "
+                f"{pair.name_a} {pair.rate_a:.2%} ±{pair.half_width:.2%}"
+                for pair in running[: self.pair_lines]
+            )
+        if self.interactive:
+            # 回到上次输出的起点, 逐行覆盖, 多余的旧行清掉.
+            prefix = f"\033[{self._drawn}F" if self._drawn else ""
+            stale = max(0, self._drawn - len(lines))
+            text = prefix + "".join(f"\033[2K{line}\n" for line in lines)
+            text += "\033[2K\n" * stale + (f"\033[{stale}F" if stale else "")
+            self._drawn = len(lines)
+        else:
+            text = lines[0] + "\n"
+        self.stream.write(text)
+        self.stream.flush()
+
+
+def _sample(value: float) -> str:
+    # 整数原样输出, 避免大计数被科学计数法截断精度.
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusTextfile:
+    """把快照写成 Prometheus 文本格式指标文件, 每次先写临时文件再原子替换."""
+
+    def __init__(self, path: str | os.PathLike[str], prefix: str = DEFAULT_METRIC_PREFIX) -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def render(self, snapshot: ProgressSnapshot) -> str:
+        p = self.prefix
+        eta = snapshot.eta_seconds
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            lines.extend(f"{p}_{name}{labels} {_sample(value)}" for labels, value in samples)
+
+        metric("battles_completed", "gauge", "已完成场数.", [("", snapshot.completed)])
+        metric("battles_planned", "gauge", "计划场数.", [("", snapshot.planned)])
+        metric(
+            "battles_simulated_total",
+            "counter",
+            "本次运行实际模拟的场数.",
+            [("", snapshot.simulated)],
+        )
+        metric(
+            "battles_per_second", "gauge", "近期吞吐 (场/秒).", [("", snapshot.battles_per_second)]
+        )
+        metric("elapsed_seconds", "gauge", "已运行时间 (秒).", [("", snapshot.elapsed)])
+        if eta is not None:
+            metric("eta_seconds", "gauge", "预计剩余时间 (秒).", [("", eta)])
+        metric("run_finished", "gauge", "运行结束后为 1.", [("", snapshot.final)])
+        labels = [
+            (f'{{a="{_escape_label(pair.name_a)}",b="{_escape_label(pair.name_b)}"}}', pair)
+            for pair in snapshot.pairs
+        ]
+        metric(
+            "pair_battles_completed",
+            "gauge",
+            "各组对阵已完成场数.",
+            [(label, pair.battles) for label, pair in labels],
+        )
+        metric(
+            "pair_battles_planned",
+            "gauge",
+            "各组对阵计划场数.",
+            [(label, pair.planned) for label, pair in labels],
+        )
+        metric(
+            "pair_win_rate_a",
+            "gauge",
+            "A 方当前胜率.",
+            [(label, pair.rate_a) for label, pair in labels],
+        )
+        metric(
+            "pair_ci_half_width",
+            "gauge",
+            "当前胜率 95% 置信区间半宽.",
+            [(label, pair.half_width) for label, pair in labels],
+        )
+        return "\n".join(lines) + "\n"
+
+    def emit(self, snapshot: ProgressSnapshot) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(self.render(snapshot), encoding="utf-8")
+        os.replace(tmp_path, self.path)
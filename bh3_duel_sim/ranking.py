@@ -0,0 +1,184 @@
+"""自适应排名模块: Bradley-Terry 拟合 + 对决式赌博机调度."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+
+
+@dataclass(frozen=True)
+class RankedEntry:
+    """排名条目: 对数强度 θ、其标准误与换算 Elo."""
+
+    name: str
+    strength: float
+    std_error: float
+    elo: float
+
+
+@dataclass
+class RankingResult:
+    """排名结果: 名次、相邻名次的置信度与实际消耗场数."""
+
+    ranking: list[RankedEntry]
+    adjacent_confidence: list[float]  # 第 k 名强于第 k+1 名的置信度
+    total_battles: int
+    pair_battles: dict[tuple[str, str], int]
+
+    @property
+    def min_confidence(self) -> float:
+        return min(self.adjacent_confidence, default=1.0)
+
+
+def fit_bradley_terry(
+    wins: list[list[float]], iterations: int = 200, prior: float = 0.5
+) -> list[float]:
+    """MM 算法拟合 Bradley-Terry 对数强度 (均值归零).
+
+    每对双方各加 prior 场虚拟胜场, 避免全胜/全负时强度发散.
+    """
+    size = len(wins)
+    strength = [1.0] * size
+    for _ in range(iterations):
+        updated = []
+        for i in range(size):
+            won = 0.0
+            denominator = 0.0
+            for j in range(size):
+                if i == j:
+                    continue
+                w_ij = wins[i][j] + prior
+                w_ji = wins[j][i] + prior
+                won += w_ij
+                denominator += (w_ij + w_ji) / (strength[i] + strength[j])
+            updated.append(won / denominator if denominator else strength[i])
+        norm = math.exp(sum(math.log(value) for value in updated) / size)
+        strength = [value / norm for value in updated]
+    return [math.log(value) for value in strength]
+
+
+def _std_errors(theta: list[float], battles: list[list[int]]) -> list[float]:
+    # 对角 Fisher 信息近似: I_i = Σ_j n_ij p_ij (1 - p_ij).
+    errors = []
+    for i, theta_i in enumerate(theta):
+        information = 0.0
+        for j, theta_j in enumerate(theta):
+            if i == j:
+                continue
+            p = 1.0 / (1.0 + math.exp(theta_j - theta_i))
+            information += battles[i][j] * p * (1.0 - p)
+        errors.append(1.0 / math.sqrt(information) if information > 0 else float("inf"))
+    return errors
+
+
+def _normal_cdf(z: float) -> float:
+    return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+@dataclass(frozen=True)
+class RankingOptions:
+    """adaptive_ranking 的预算与调度参数.
+
+    battle_budget 为总场数上限; 每轮为置信度最低的 pairs_per_round 组相邻名次各追加
+    batch_battles 场, 直到相邻名次置信度都达到 target_confidence.
+    """
+
+    battle_budget: int = 50_000
+    initial_battles: int = 200
+    batch_battles: int = 500
+    target_confidence: float = 0.95
+    pairs_per_round: int = 2
+    seed: int = 0
+    workers: int = 1
+
+
+def adaptive_ranking(
+    roster: Mapping[str, Callable[[], BaseCharacter]], options: RankingOptions | None = None
+) -> RankingResult:
+    """用尽量少的对局给名单排名, 参数见 RankingOptions.
+
+    先为每对跑 initial_battles 场, 之后每轮拟合 Bradley-Terry 模型, 找出置信度最低的
+    若干相邻名次, 让它们直接对决 batch_battles 场 (对决式赌博机: 只在最能减少排名
+    不确定性的对阵上花预算). 所有相邻名次置信度达标或预算耗尽即停止.
+    """
+    options = options or RankingOptions()
+    seed, battle_budget = options.seed, options.battle_budget
+    names = list(roster)
+    size = len(names)
+    if size < MIN_RANKING_SIZE:
+        raise ValueError("排名至少需要两名角色")
+    wins = [[0] * size for _ in range(size)]
+    battles = [[0] * size for _ in range(size)]
+    # 每对已消耗的对局序号; 平局不计入 battles, 但同样占用种子序号.
+    played = [[0] * size for _ in range(size)]
+    total = 0
+
+    def play(pool: SimulationPool, requests: list[tuple[int, int, int]]) -> None:
+        nonlocal total
+        jobs = [
+            PairJob(
+                roster[names[i]],
+                roster[names[j]],
+                pair_seed(seed, names[i], names[j]),
+                played[i][j],
+                played[i][j] + count,
+            )
+            for i, j, count in requests
+        ]
+        for (i, j, count), (wins_i, wins_j) in zip(requests, pool.run(jobs)):
+            played[i][j] += count
+            wins[i][j] += wins_i
+            wins[j][i] += wins_j
+            battles[i][j] += wins_i + wins_j
+            battles[j][i] = battles[i][j]
+            total += count
+
+    with SimulationPool(workers=options.workers) as pool:
+        play(
+            pool,
+            [(i, j, options.initial_battles) for i in range(size) for j in range(i + 1, size)],
+        )
+        while True:
+            theta = fit_bradley_terry([[float(w) for w in row] for row in wins])
+            errors = _std_errors(theta, battles)
+            order = sorted(range(size), key=lambda idx: theta[idx], reverse=True)
+            confidence = []
+            for upper, lower in zip(order, order[1:]):
+                spread = math.sqrt(errors[upper] ** 2 + errors[lower] ** 2)
+                gap = theta[upper] - theta[lower]
+                confidence.append(_normal_cdf(gap / spread) if spread > 0 else 1.0)
+            uncertain = sorted(
+                (conf, rank)
+                for rank, conf in enumerate(confidence)
+                if conf < options.target_confidence
+            )
+            remaining = battle_budget - total
+            if not uncertain or remaining <= 0:
+                break
+            requests = []
+            for _, rank in uncertain[: options.pairs_per_round]:
+                i, j = sorted((order[rank], order[rank + 1]))
+                requests.append((i, j, min(options.batch_battles, remaining)))
+                remaining -= requests[-1][2]
+                if remaining <= 0:
+                    break
+            play(pool, requests)
+
+    scale = 400.0 / math.log(10.0)
+    ranking = [
+        RankedEntry(names[idx], theta[idx], errors[idx], 1500.0 + scale * theta[idx])
+        for idx in order
+    ]
+    pair_battles = {
+        (names[i], names[j]): battles[i][j] for i in range(size) for j in range(i + 1, size)
+    }
+    return RankingResult(ranking, confidence, total, pair_battles)
+
+
+MIN_RANKING_SIZE = 2
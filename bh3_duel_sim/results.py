@@ -0,0 +1,171 @@
+"""对阵结果持久化模块."""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable
+
+from bh3_duel_sim.characters import base
+from bh3_duel_sim.characters.base import BaseCharacter
+
+# 指纹中忽略的实例字段: 随机源每场重新绑定, 与角色设定无关.
+_FINGERPRINT_SKIP_FIELDS = frozenset({"_rng"})
+# 战斗驱动源码; simulator 模块导入了本模块, 这里按文件读取而不导入, 避免循环导入.
+_SIMULATOR_SOURCE = Path(__file__).with_name("simulator.py")
+
+
+def _source_digest(objects: list[type]) -> str:
+    digest = hashlib.sha1()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode("utf-8"))
+        except (OSError, TypeError):
+            digest.update(repr(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _stable_repr(value: object) -> str:
+    # 集合的 repr 顺序随字符串哈希种子变化, 排序后才能跨进程得到相同指纹.
+    if isinstance(value, (set, frozenset)):
+        return f"{type(value).__name__}({sorted(map(_stable_repr, value))})"
+    return repr(value)
+
+
+def engine_fingerprint() -> str:
+    """战斗引擎指纹: 基类或驱动改动后, 所有已存结果一并失效."""
+    digest = hashlib.sha1(inspect.getsource(base).encode("utf-8"))
+    digest.update(_SIMULATOR_SOURCE.read_bytes())
+    return digest.hexdigest()
+
+
+def character_fingerprint(spawn: Callable[[], BaseCharacter]) -> str:
+    """角色指纹: 覆盖类源码、类常量与实例初始数值, 任何一项变化都会改变指纹."""
+    instance = spawn()
+    cls = type(instance)
+    lineage = [klass for klass in cls.__mro__ if klass not in (BaseCharacter, object)]
+    digest = hashlib.sha1(_source_digest(lineage).encode("utf-8"))
+    for klass in lineage:
+        for attr_name, value in sorted(vars(klass).items()):
+            if attr_name.isupper():
+                digest.update(f"{klass.__qualname__}.{attr_name}={_stable_repr(value)}".encode())
+    for attr_name, value in sorted(vars(instance).items()):
+        if attr_name not in _FINGERPRINT_SKIP_FIELDS:
+            digest.update(f"{attr_name}={_stable_repr(value)}".encode())
+    return digest.hexdigest()
+
+
+class MatchupStore:
+    """按角色指纹缓存对阵胜场, 未改动的对阵可以直接复用.
+
+    文件头记录引擎指纹与驱动设置 (回合模式、回合上限等), 使用前须以 use_settings
+    声明本次的设置, 与已存结果不同时旧结果全部作废.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.engine = engine_fingerprint()
+        self.settings: dict[str, object] = {}
+        # (名称对) -> (双方指纹, 场次, 双方胜场), 名称对按字典序排列.
+        self._pairs: dict[tuple[str, str], tuple[tuple[str, str], int, tuple[int, int]]] = {}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    @staticmethod
+    def _key(name_a: str, name_b: str) -> tuple[str, str]:
+        return (name_a, name_b) if name_a <= name_b else (name_b, name_a)
+
+    def _load(self) -> None:
+        assert self.path is not None
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("engine") != self.engine:
+            # 引擎变化后旧结果全部作废.
+            return
+        self.settings = dict(data.get("settings", {}))
+        for entry in data.get("pairs", []):
+            name_a, name_b = entry["names"]
+            fingerprint_a, fingerprint_b = entry["fingerprints"]
+            wins_a, wins_b = entry["wins"]
+            self._pairs[(name_a, name_b)] = (
+                (fingerprint_a, fingerprint_b),
+                int(entry["battles"]),
+                (int(wins_a), int(wins_b)),
+            )
+
+    def save(self) -> None:
+        """原子写回缓存文件, 未指定路径时仅保存在内存中."""
+        if self.path is None:
+            return
+        pairs = [
+            {
+                "names": list(key),
+                "fingerprints": list(fingerprints),
+                "battles": battles,
+                "wins": list(wins),
+            }
+            for key, (fingerprints, battles, wins) in self._pairs.items()
+        ]
+        payload = {"engine": self.engine, "settings": self.settings, "pairs": pairs}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def use_settings(self, settings: dict[str, object]) -> None:
+        """声明本次运行的驱动设置; 与已存结果的设置不同时清空已存结果."""
+        settings = dict(settings)
+        if settings != self.settings:
+            self._pairs.clear()
+            self.settings = settings
+
+    def lookup(self, fingerprints: Mapping[str, str], *, battles: int) -> dict[str, int] | None:
+        """查询指纹与场次都吻合的结果, 返回各自胜场; fingerprints 为双方名称 -> 指纹."""
+        key = self._key(*fingerprints)
+        entry = self._pairs.get(key)
+        if entry is None or entry[1] != battles:
+            return None
+        stored, _, wins = entry
+        if dict(zip(key, stored)) != dict(fingerprints):
+            return None
+        return dict(zip(key, wins))
+
+    def record(
+        self, fingerprints: Mapping[str, str], *, battles: int, wins: dict[str, int]
+    ) -> None:
+        """写入(或覆盖)一组对阵结果; fingerprints 为双方名称 -> 指纹."""
+        key = self._key(*fingerprints)
+        self._pairs[key] = (
+            (fingerprints[key[0]], fingerprints[key[1]]),
+            battles,
+            (wins.get(key[0], 0), wins.get(key[1], 0)),
+        )
+
+    def overall(self, roster: dict[str, Callable[[], BaseCharacter]]) -> dict[str, float]:
+        """根据已存对阵汇总整体胜率, 只统计名单内指纹仍然有效的对局."""
+        fingerprints = {name: character_fingerprint(spawn) for name, spawn in roster.items()}
+        wins = dict.fromkeys(roster, 0)
+        battles = dict.fromkeys(roster, 0)
+        for key, (stored, pair_battles, (wins_a, wins_b)) in self._pairs.items():
+            if any(fingerprints.get(n) != fp for n, fp in zip(key, stored)):
+                continue
+            name_a, name_b = key
+            wins[name_a] += wins_a
+            wins[name_b] += wins_b
+            battles[name_a] += pair_battles
+            battles[name_b] += pair_battles
+        return {name: wins[name] / battles[name] if battles[name] else 0.0 for name in roster}
+
+    def matchup_rates(
+        self, roster: dict[str, Callable[[], BaseCharacter]]
+    ) -> dict[tuple[str, str], dict[str, float]]:
+        """取出名单内指纹仍然有效的对阵胜率, 格式同 round_robin_statistics."""
+        fingerprints = {name: character_fingerprint(spawn) for name, spawn in roster.items()}
+        rates: dict[tuple[str, str], dict[str, float]] = {}
+        for key, (stored, battles, wins) in self._pairs.items():
+            if battles == 0 or any(fingerprints.get(n) != fp for n, fp in zip(key, stored)):
+                continue
+            rates[key] = {name: count / battles for name, count in zip(key, wins)}
+        return rates
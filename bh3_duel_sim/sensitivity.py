@@ -0,0 +1,129 @@
+"""胜率敏感度分析: 公共随机数下的中心差分."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, fields
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.characters.variants import VariantFactory, resolve_class
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+from bh3_duel_sim.stats import CombatStats
+
+
+@dataclass(frozen=True)
+class Perturbation:
+    """一个扰动参数: 角色(显示名)、属性字段或类常量名, 以及上下扰动的绝对步长."""
+
+    character: str
+    parameter: str
+    base_value: float
+    step: float
+
+
+@dataclass(frozen=True)
+class SensitivityEntry:
+    """某参数对某对阵胜率的导数估计."""
+
+    character: str
+    parameter: str
+    opponent: str
+    base_value: float
+    step: float
+    rate_change: float  # (胜率+ - 胜率-), 即 ±step 之间的胜率差
+    derivative: float  # 每单位参数的胜率变化
+    std_error: float  # derivative 的标准误
+
+
+def default_perturbations(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    characters: Sequence[str] | None = None,
+    relative_step: float = 0.1,
+) -> list[Perturbation]:
+    """列出角色的全部数值参数: CombatStats 字段与数值类常量.
+
+    浮点参数按 relative_step 相对扰动, 整数参数(回合数、冷却等)扰动 ±1.
+    """
+    perturbations: list[Perturbation] = []
+    for character in characters or list(roster):
+        cls = resolve_class(roster[character])
+        base_stats = getattr(cls, "BASE_STATS", None)
+        if isinstance(base_stats, CombatStats):
+            for stat in fields(CombatStats):
+                value = float(getattr(base_stats, stat.name))
+                perturbations.append(
+                    Perturbation(character, stat.name, value, abs(value) * relative_step or 1.0)
+                )
+        for attr_name in sorted(dir(cls)):
+            if not attr_name.isupper() or attr_name == "BASE_STATS":
+                continue
+            value = getattr(cls, attr_name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            step = 1.0 if isinstance(value, int) else abs(value) * relative_step or relative_step
+            perturbations.append(Perturbation(character, attr_name, float(value), step))
+    return perturbations
+
+
+def _shifted(
+    spawn: Callable[[], BaseCharacter], perturbation: Perturbation, sign: float
+) -> VariantFactory:
+    # 整数常量由 make_variant 按原类型取整.
+    value = perturbation.base_value + sign * perturbation.step
+    return VariantFactory(spawn, {perturbation.parameter: value})
+
+
+def sensitivity_report(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    perturbations: Sequence[Perturbation],
+    iterations: int = 2_000,
+    seed: int = 0,
+    workers: int = 1,
+) -> list[SensitivityEntry]:
+    """对每个参数做 ±step 中心差分, 估计其对所在角色全部对阵胜率的导数.
+
+    上下两个变体与同一对手使用完全相同的逐场种子, 导数与标准误由逐场配对差
+    d_i = y+_i - y-_i 计算, 抽样噪声在差分中大部分抵消. 所有任务合并为一批并行执行.
+    """
+    plans: list[tuple[Perturbation, str]] = []
+    jobs: list[PairJob] = []
+    for perturbation in perturbations:
+        spawn = roster[perturbation.character]
+        plus = _shifted(spawn, perturbation, 1.0)
+        minus = _shifted(spawn, perturbation, -1.0)
+        for opponent, spawn_opponent in roster.items():
+            if opponent == perturbation.character:
+                continue
+            base_seed = pair_seed(seed, perturbation.character, opponent)
+            plans.append((perturbation, opponent))
+            jobs.append(PairJob(plus, spawn_opponent, base_seed, 0, iterations))
+            jobs.append(PairJob(minus, spawn_opponent, base_seed, 0, iterations))
+
+    with SimulationPool(workers=workers) as pool:
+        outcomes = pool.run_outcomes(jobs)
+
+    report: list[SensitivityEntry] = []
+    for idx, (perturbation, opponent) in enumerate(plans):
+        upper = outcomes[2 * idx]
+        lower = outcomes[2 * idx + 1]
+        count = len(upper)
+        diffs = [up - low for up, low in zip(upper, lower)]
+        mean = sum(diffs) / count if count else 0.0
+        variance = sum((d - mean) ** 2 for d in diffs) / (count - 1) if count > 1 else 0.0
+        width = 2 * perturbation.step
+        report.append(
+            SensitivityEntry(
+                character=perturbation.character,
+                parameter=perturbation.parameter,
+                opponent=opponent,
+                base_value=perturbation.base_value,
+                step=perturbation.step,
+                rate_change=mean,
+                derivative=mean / width,
+                std_error=math.sqrt(variance / count) / width if count else 0.0,
+            )
+        )
+    return report
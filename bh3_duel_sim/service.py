@@ -0,0 +1,459 @@
+"""常驻模拟服务: asyncio HTTP/JSON 接口, 背后是预热好的进程池.
+
+接口:
+    GET  /roster                               角色名单
+    GET  /matchup?a=丽塔&b=薇塔&battles=20000&seed=0[&stream=1]
+    POST /reload                               重新扫描名单并清空结果缓存
+
+相同参数的请求在计算期间合并为一次计算, 结果进入 LRU 缓存; stream=1 时以
+NDJSON 分块逐批推送阶段结果. 查询参数按 UTF-8 解码, 角色名可写中文或百分号编码.
+缓存键包含角色模块文件的版本 (修改时间与大小), 修改女武神源码后下一次请求自动
+使用新代码: 工作进程在收到新版本的任务时就地重新导入该模块, 无需重启进程池.
+
+用法: python -m bh3_duel_sim.service --port 8765 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import importlib.util
+import itertools
+import json
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from bh3_duel_sim.characters import build_valkyrie_roster
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.characters.valkyries import LazyFactory
+from bh3_duel_sim.parallel import DEFAULT_CHUNK_SIZE, PairJob
+from bh3_duel_sim.simulator import (
+    DEFAULT_MAX_ROUNDS,
+    DEFAULT_STALEMATE_ROUNDS,
+    BattleSimulator,
+    pair_seed,
+    run_seeded_range,
+    win_rate_half_width,
+)
+
+# 模块版本: (完整模块名, (修改时间 ns, 文件大小)).
+ModuleVersion = tuple[str, tuple[int, int]]
+QueryKey = tuple[str, str, int, int, tuple[ModuleVersion, ...]]
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUERY_BATTLES = 10_000
+# 单次查询的场数上限; 每个查询同时在途的分块数为工作进程数的 IN_FLIGHT_PER_WORKER 倍.
+DEFAULT_MAX_QUERY_BATTLES = 10_000_000
+IN_FLIGHT_PER_WORKER = 2
+WARM_TASKS_PER_WORKER = 2
+HTTP_REQUEST_PARTS = 2
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+@dataclass(frozen=True)
+class ServiceOptions:
+    """SimulationService 的进程池、缓存与驱动设置; max_battles 为单次查询的场数上限."""
+
+    workers: int = 2
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    cache_size: int = DEFAULT_CACHE_SIZE
+    max_battles: int = DEFAULT_MAX_QUERY_BATTLES
+    max_rounds: int = DEFAULT_MAX_ROUNDS
+    stalemate_rounds: int = DEFAULT_STALEMATE_ROUNDS
+
+
+class _WorkerState:
+    """工作进程状态: 驱动器, 以及已加载的模块版本."""
+
+    __slots__ = ("simulator", "loaded")
+
+    def __init__(self) -> None:
+        self.simulator: BattleSimulator | None = None
+        self.loaded: dict[str, tuple[int, int]] = {}
+
+
+_WORKER = _WorkerState()
+
+
+def _init_worker(max_rounds: int, stalemate_rounds: int) -> None:
+    _WORKER.simulator = BattleSimulator(max_rounds=max_rounds, stalemate_rounds=stalemate_rounds)
+
+
+def _ensure_versions(versions: Sequence[ModuleVersion]) -> None:
+    # 任务携带的版本与本进程上次加载的不同 (或首次遇到) 时重新导入该模块.
+    for module, version in versions:
+        if _WORKER.loaded.get(module) == version:
+            continue
+        if module in sys.modules:
+            importlib.reload(sys.modules[module])
+        else:
+            importlib.import_module(module)
+        _WORKER.loaded[module] = version
+
+
+def _run_versioned_chunk(versions: tuple[ModuleVersion, ...], job: PairJob) -> tuple[int, int]:
+    _ensure_versions(versions)
+    simulator = _WORKER.simulator or BattleSimulator()
+    return run_seeded_range(simulator, job)
+
+
+def module_version(spawn: Callable[[], BaseCharacter]) -> ModuleVersion | None:
+    """女武神模块的当前文件版本; 非 LazyFactory 工厂无法热重载, 返回 None."""
+    if not isinstance(spawn, LazyFactory):
+        return None
+    name = f"bh3_duel_sim.characters.valkyries.{spawn.module}"
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.origin is None:
+        return None
+    stat = os.stat(spec.origin)
+    return name, (stat.st_mtime_ns, stat.st_size)
+
+
+class MatchupQuery:
+    """一次 (可被多个请求共享的) 对阵计算, 保存逐批累计的阶段结果."""
+
+    def __init__(self, name_a: str, name_b: str, battles: int, seed: int) -> None:
+        self.name_a = name_a
+        self.name_b = name_b
+        self.battles = battles
+        self.seed = seed
+        self.completed = 0
+        self.wins_a = 0
+        self.wins_b = 0
+        self.updates: list[dict[str, Any]] = []
+        self.error: BaseException | None = None
+        self.done = False
+        self._changed = asyncio.Condition()
+
+    def snapshot(self) -> dict[str, Any]:
+        completed = self.completed
+        draws = completed - self.wins_a - self.wins_b
+        return {
+            "name_a": self.name_a,
+            "name_b": self.name_b,
+            "seed": self.seed,
+            "battles": self.battles,
+            "completed": completed,
+            "wins_a": self.wins_a,
+            "wins_b": self.wins_b,
+            "draws": draws,
+            "rate_a": self.wins_a / completed if completed else 0.0,
+            "rate_b": self.wins_b / completed if completed else 0.0,
+            "half_width": win_rate_half_width(self.wins_a, completed),
+            "done": self.done,
+        }
+
+    async def publish(self, wins_a: int, wins_b: int, battles: int) -> None:
+        async with self._changed:
+            self.wins_a += wins_a
+            self.wins_b += wins_b
+            self.completed += battles
+            self.done = self.completed >= self.battles
+            self.updates.append(self.snapshot())
+            self._changed.notify_all()
+
+    async def fail(self, error: BaseException) -> None:
+        async with self._changed:
+            self.error = error
+            self.done = True
+            self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[dict[str, Any]]:
+        """依次产出阶段结果直到完成; 中途加入的订阅者从第一批开始补齐."""
+        seen = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda seen=seen: len(self.updates) > seen or self.done
+                )
+                fresh = self.updates[seen:]
+                seen = len(self.updates)
+                finished = self.done
+            for update in fresh:
+                yield update
+            if finished and seen == len(self.updates):
+                if self.error is not None:
+                    raise self.error
+                return
+
+    async def result(self) -> dict[str, Any]:
+        final: dict[str, Any] = {}
+        async for update in self.follow():
+            final = update
+        return final
+
+
+class SimulationService:
+    """对阵查询服务: 合并进行中的相同查询, 缓存已完成的结果, 分块提交到进程池."""
+
+    def __init__(
+        self,
+        roster: Mapping[str, Callable[[], BaseCharacter]] | None = None,
+        options: ServiceOptions | None = None,
+    ) -> None:
+        options = options or ServiceOptions()
+        self.roster = dict(roster) if roster is not None else build_valkyrie_roster()
+        self._custom_roster = roster is not None
+        self.workers = max(1, options.workers)
+        self.chunk_size = max(1, options.chunk_size)
+        self.cache_size = options.cache_size
+        self.max_battles = options.max_battles
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(options.max_rounds, options.stalemate_rounds),
+        )
+        self._inflight: dict[QueryKey, MatchupQuery] = {}
+        self._cache: OrderedDict[QueryKey, MatchupQuery] = OrderedDict()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._server: asyncio.Server | None = None
+        # 统计: 实际计算、合并、缓存命中的查询数.
+        self.computed = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    async def warm_up(self) -> None:
+        """让每个工作进程提前完成启动与角色模块导入."""
+        versions = tuple(
+            version for version in map(module_version, self.roster.values()) if version is not None
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _ensure_versions, versions)
+                for _ in range(WARM_TASKS_PER_WORKER * self.workers)
+            )
+        )
+
+    def reload_roster(self) -> None:
+        """重新扫描名单 (新增的女武神模块) 并清空结果缓存."""
+        if not self._custom_roster:
+            self.roster = build_valkyrie_roster()
+        self._cache.clear()
+
+    def _key(self, name_a: str, name_b: str, battles: int, seed: int) -> QueryKey:
+        spawns = (self.roster[name_a], self.roster[name_b])
+        versions = tuple(version for version in map(module_version, spawns) if version is not None)
+        return name_a, name_b, battles, seed, versions
+
+    def query(self, name_a: str, name_b: str, battles: int, seed: int = 0) -> MatchupQuery:
+        """取得对阵计算: 命中缓存或进行中的相同查询时直接复用, 否则新开计算."""
+        for name in (name_a, name_b):
+            if name not in self.roster:
+                raise KeyError(name)
+        if not 0 < battles <= self.max_battles:
+            raise ValueError(f"battles 须在 1 到 {self.max_battles} 之间")
+        key = self._key(name_a, name_b, battles, seed)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+        running = self._inflight.get(key)
+        if running is not None:
+            self.coalesced += 1
+            return running
+        query = MatchupQuery(name_a, name_b, battles, seed)
+        self._inflight[key] = query
+        self.computed += 1
+        task = asyncio.get_running_loop().create_task(self._compute(key, query))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return query
+
+    async def _compute(self, key: QueryKey, query: MatchupQuery) -> None:
+        loop = asyncio.get_running_loop()
+        spawn_a = self.roster[query.name_a]
+        spawn_b = self.roster[query.name_b]
+        base_seed = pair_seed(query.seed, query.name_a, query.name_b)
+        versions = key[4]
+
+        async def run_chunk(start: int, stop: int) -> tuple[int, int, int]:
+            job = PairJob(spawn_a, spawn_b, base_seed, start, stop)
+            wins_a, wins_b = await loop.run_in_executor(
+                self._executor, _run_versioned_chunk, versions, job
+            )
+            return wins_a, wins_b, stop - start
+
+        # 分块按窗口逐步提交, 同时在途的分块数有上限, 大查询不会一次排满进程池队列.
+        starts = iter(range(0, query.battles, self.chunk_size))
+        window = IN_FLIGHT_PER_WORKER * self.workers
+        pending: set[asyncio.Task[tuple[int, int, int]]] = set()
+        try:
+            while True:
+                for start in itertools.islice(starts, window - len(pending)):
+                    stop = min(start + self.chunk_size, query.battles)
+                    pending.add(loop.create_task(run_chunk(start, stop)))
+                if not pending:
+                    break
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    await query.publish(*task.result())
+        except asyncio.CancelledError:
+            # 服务关闭等原因取消计算时同样通知订阅者, 否则它们会一直等待.
+            for task in pending:
+                task.cancel()
+            await query.fail(RuntimeError("对阵计算已取消"))
+            raise
+        except Exception as error:  # noqa: BLE001 - 转交给所有订阅者
+            for task in pending:
+                task.cancel()
+            await query.fail(error)
+        else:
+            self._cache[key] = query
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> tuple[str, int]:
+        """预热进程池并开始监听, 返回实际地址."""
+        await self.warm_up()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        address = self._server.sockets[0].getsockname()
+        return str(address[0]), int(address[1])
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise RuntimeError("服务尚未启动")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._executor.shutdown(cancel_futures=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # 目标中的非 ASCII 字符按 UTF-8 解码, 百分号编码由 parse_qs 按 UTF-8 还原.
+            request_line = (await reader.readline()).decode("utf-8", "replace").split()
+            while (await reader.readline()).strip():
+                pass  # 不需要任何请求头.
+            if len(request_line) < HTTP_REQUEST_PARTS:
+                await _respond(writer, 400, {"error": "请求格式错误"})
+                return
+            method, target = request_line[0], request_line[1]
+            await self._route(method, target, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str, writer: asyncio.StreamWriter) -> None:
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == "GET" and url.path == "/roster":
+            await _respond(writer, 200, {"names": list(self.roster)})
+        elif method == "POST" and url.path == "/reload":
+            self.reload_roster()
+            await _respond(writer, 200, {"names": list(self.roster)})
+        elif method == "GET" and url.path == "/stats":
+            stats = {
+                "computed": self.computed,
+                "coalesced": self.coalesced,
+                "cache_hits": self.cache_hits,
+                "cached": len(self._cache),
+                "inflight": len(self._inflight),
+            }
+            await _respond(writer, 200, stats)
+        elif method == "GET" and url.path == "/matchup":
+            try:
+                query = self.query(
+                    params["a"],
+                    params["b"],
+                    int(params.get("battles", DEFAULT_QUERY_BATTLES)),
+                    int(params.get("seed", 0)),
+                )
+            except KeyError as error:
+                await _respond(writer, 400, {"error": f"缺少参数或未知角色: {error.args[0]}"})
+                return
+            except ValueError as error:
+                await _respond(writer, 400, {"error": str(error)})
+                return
+            if params.get("stream") in ("1", "true"):
+                await _stream(writer, query)
+            else:
+                try:
+                    await _respond(writer, 200, await query.result())
+                except Exception as error:  # noqa: BLE001
+                    await _respond(writer, 500, {"error": repr(error)})
+        else:
+            await _respond(writer, 404, {"error": f"未知路径: {method} {url.path}"})
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: object) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    head = (
+        f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+
+async def _stream(writer: asyncio.StreamWriter, query: MatchupQuery) -> None:
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"Connection: close\r\n\r\n"
+    )
+    try:
+        async for update in query.follow():
+            line = json.dumps(update, ensure_ascii=False).encode() + b"\n"
+            writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            await writer.drain()
+    except Exception as error:  # noqa: BLE001 - 响应头已发出, 以最后一行报告错误
+        line = json.dumps({"error": repr(error)}, ensure_ascii=False).encode() + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def _serve(host: str, port: int, options: ServiceOptions) -> None:
+    service = SimulationService(options=options)
+    address = await service.start(host, port)
+    print(f"模拟服务监听 http://{address[0]}:{address[1]}, {service.workers} 个工作进程已预热")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description="常驻对阵模拟 HTTP 服务")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="工作进程数")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="每批场数")
+    parser.add_argument(
+        "--max-battles", type=int, default=DEFAULT_MAX_QUERY_BATTLES, help="单次查询场数上限"
+    )
+    args = parser.parse_args(argv)
+    options = ServiceOptions(
+        workers=args.workers, chunk_size=args.chunk_size, max_battles=args.max_battles
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args.host, args.port, options))
+
+
+if __name__ == "__main__":
+    main()
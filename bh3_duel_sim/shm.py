@@ -0,0 +1,315 @@
+"""共享内存聚合: 工作进程把胜场、直方图与归因计数直接累加进共享数组.
+
+进程池中每个工作进程独占一片 (slice), 每片按对阵划分固定布局, 写入无需加锁;
+任务本身不返回任何对象, 省去逐块 pickle 结果的开销. 全部任务结束后由主进程按片
+求和. 直方图分箱与 distributions.MatchupDistributions 相同, 归因计数只记录事先
+声明的键 (共享数组需要固定布局).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from bh3_duel_sim.distributions import HP_BINS, MAX_TRACKED_ROUNDS, Histogram
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.parallel import DEFAULT_CHUNK_SIZE, PairJob
+from bh3_duel_sim.simulator import (
+    DEFAULT_MAX_ROUNDS,
+    DEFAULT_STALEMATE_ROUNDS,
+    BattleSimulator,
+    battle_seed,
+)
+from bh3_duel_sim.telemetry import TelemetryCounters, TelemetryKey
+
+
+@dataclass(frozen=True)
+class SharedLayout:
+    """共享数组布局: slices 片 x matchups 组对阵, 每组一段整数区与一段浮点区.
+
+    整数区依次为 A 胜 / B 胜 / 平局, 回合数直方图, A、B 胜方剩余生命直方图,
+    以及每个归因键的 (次数, 命中); 浮点区为每个归因键的数值合计.
+    """
+
+    matchups: int
+    slices: int
+    max_rounds: int = MAX_TRACKED_ROUNDS
+    hp_bins: int = HP_BINS
+    keys: tuple[TelemetryKey, ...] = ()
+
+    @property
+    def rounds_offset(self) -> int:
+        return OUTCOME_SLOTS
+
+    @property
+    def hp_a_offset(self) -> int:
+        return self.rounds_offset + self.max_rounds + 2
+
+    @property
+    def hp_b_offset(self) -> int:
+        return self.hp_a_offset + self.hp_bins + 2
+
+    @property
+    def keys_offset(self) -> int:
+        return self.hp_b_offset + self.hp_bins + 2
+
+    @property
+    def int_stride(self) -> int:
+        return self.keys_offset + 2 * len(self.keys)
+
+    @property
+    def float_stride(self) -> int:
+        return len(self.keys)
+
+    @property
+    def int_count(self) -> int:
+        return self.slices * self.matchups * self.int_stride
+
+    @property
+    def nbytes(self) -> int:
+        return ITEM_SIZE * (self.int_count + self.slices * self.matchups * self.float_stride)
+
+    def int_base(self, slot: int, matchup: int) -> int:
+        return (slot * self.matchups + matchup) * self.int_stride
+
+    def float_base(self, slot: int, matchup: int) -> int:
+        return (slot * self.matchups + matchup) * self.float_stride
+
+
+@dataclass
+class MatchupTotals:
+    """单组对阵按片求和后的结果; 直方图下标与 Histogram.counts 相同 (0 为下溢, 末位为上溢)."""
+
+    wins_a: int
+    wins_b: int
+    draws: int
+    rounds: list[int]
+    hp_a: list[int]
+    hp_b: list[int]
+    attribution: TelemetryCounters = field(default_factory=TelemetryCounters)
+
+    @property
+    def battles(self) -> int:
+        return self.wins_a + self.wins_b + self.draws
+
+
+def _views(shm: SharedMemory, layout: SharedLayout) -> tuple[memoryview[int], memoryview[float]]:
+    buf = shm.buf
+    # 只有 close 之后 buf 才为 None.
+    assert buf is not None
+    split = ITEM_SIZE * layout.int_count
+    return buf[:split].cast("q"), buf[split : layout.nbytes].cast("d")
+
+
+class _WorkerState:
+    """工作进程状态: 片号、驱动器, 以及当前挂接的共享内存 (块名, 对象, 整数视图, 浮点视图)."""
+
+    __slots__ = ("slot", "simulator", "attached")
+
+    def __init__(self) -> None:
+        self.slot = 0
+        self.simulator: BattleSimulator | None = None
+        self.attached: tuple[str, SharedMemory, memoryview[int], memoryview[float]] | None = None
+
+
+_WORKER = _WorkerState()
+
+
+def _init_worker(slots: Any, max_rounds: int, stalemate_rounds: int) -> None:
+    _WORKER.slot = slots.get() if slots is not None else 0
+    _WORKER.simulator = BattleSimulator(max_rounds=max_rounds, stalemate_rounds=stalemate_rounds)
+
+
+def _attach(name: str, layout: SharedLayout) -> tuple[memoryview[int], memoryview[float]]:
+    attached = _WORKER.attached
+    if attached is not None:
+        if attached[0] == name:
+            return attached[2], attached[3]
+        _detach()
+    # 由主进程负责释放, 工作进程挂接时不登记到资源跟踪器.
+    shm = SharedMemory(name=name, track=False)
+    ints, floats = _views(shm, layout)
+    _WORKER.attached = (name, shm, ints, floats)
+    return ints, floats
+
+
+def _detach() -> None:
+    attached = _WORKER.attached
+    if attached is None:
+        return
+    _, shm, ints, floats = attached
+    _WORKER.attached = None
+    ints.release()
+    floats.release()
+    shm.close()
+
+
+def _run_shared_chunk(task: tuple[str, SharedLayout, int, PairJob]) -> None:
+    name, layout, matchup, job = task
+    ints, floats = _attach(name, layout)
+    simulator = _WORKER.simulator or BattleSimulator()
+    base = layout.int_base(_WORKER.slot, matchup)
+    rounds_base = base + layout.rounds_offset
+    hp_a_base = base + layout.hp_a_offset
+    hp_b_base = base + layout.hp_b_offset
+    # 只借用分箱规则, 计数直接写入共享数组.
+    length_slot = Histogram(1, layout.max_rounds + 1, layout.max_rounds).bin_index
+    hp_slot = Histogram(0.0, 1.0 + 1e-9, layout.hp_bins).bin_index
+    counters = TelemetryCounters() if layout.keys else None
+    quiet_logger = BattleLogger(enabled=False)
+    spawn_a = job.spawn_a
+    spawn_b = job.spawn_b
+    for index in range(job.start, job.stop):
+        fighter_a = spawn_a()
+        fighter_b = spawn_b()
+        if counters is not None:
+            counters.attach(fighter_a, fighter_b)
+        winner = simulator.simulate_seeded(
+            fighter_a, fighter_b, quiet_logger, battle_seed(job.base_seed, index)
+        )
+        ints[rounds_base + length_slot(simulator.rounds_played)] += 1
+        if winner is None:
+            ints[base + DRAW_SLOT] += 1
+        elif winner is fighter_a:
+            ints[base + WIN_A_SLOT] += 1
+            ints[hp_a_base + hp_slot(winner.current_hp / winner.max_hp)] += 1
+        else:
+            ints[base + WIN_B_SLOT] += 1
+            ints[hp_b_base + hp_slot(winner.current_hp / winner.max_hp)] += 1
+    if counters is not None:
+        keys_base = base + layout.keys_offset
+        float_base = layout.float_base(_WORKER.slot, matchup)
+        for offset, key in enumerate(layout.keys):
+            count, hits, total = counters.get(*key)
+            ints[keys_base + 2 * offset] += count
+            ints[keys_base + 2 * offset + 1] += hits
+            floats[float_base + offset] += total
+
+
+def _reduce(shm: SharedMemory, layout: SharedLayout) -> list[MatchupTotals]:
+    ints, floats = _views(shm, layout)
+    try:
+        results: list[MatchupTotals] = []
+        stride = layout.int_stride
+        for matchup in range(layout.matchups):
+            summed = [0] * stride
+            totals = [0.0] * layout.float_stride
+            for slot in range(layout.slices):
+                base = layout.int_base(slot, matchup)
+                for offset, value in enumerate(ints[base : base + stride]):
+                    summed[offset] += value
+                float_base = layout.float_base(slot, matchup)
+                for offset, value in enumerate(floats[float_base : float_base + len(totals)]):
+                    totals[offset] += value
+            counters = TelemetryCounters()
+            for offset, key in enumerate(layout.keys):
+                count = summed[layout.keys_offset + 2 * offset]
+                if count:
+                    hits = summed[layout.keys_offset + 2 * offset + 1]
+                    counters.add_totals(key, count, hits, totals[offset])
+            results.append(
+                MatchupTotals(
+                    summed[WIN_A_SLOT],
+                    summed[WIN_B_SLOT],
+                    summed[DRAW_SLOT],
+                    summed[layout.rounds_offset : layout.hp_a_offset],
+                    summed[layout.hp_a_offset : layout.hp_b_offset],
+                    summed[layout.hp_b_offset : layout.keys_offset],
+                    counters,
+                )
+            )
+        return results
+    finally:
+        ints.release()
+        floats.release()
+
+
+class SharedMemoryPool:
+    """共享内存聚合的执行池: workers<=1 时在当前进程内执行, 否则分块交给进程池.
+
+    与 SimulationPool 相同的定种切块规则, 结果与工作进程数无关. attribution_keys
+    为需要累计的归因键, 为空时不挂接计数器.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        *,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        stalemate_rounds: int = DEFAULT_STALEMATE_ROUNDS,
+        attribution_keys: Sequence[TelemetryKey] = (),
+    ) -> None:
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.attribution_keys = tuple(attribution_keys)
+        self._executor: Executor | None = None
+        if self.workers > 1:
+            context = multiprocessing.get_context()
+            # 每个工作进程启动时领取一个片号, 之后只写自己的片.
+            slots = context.SimpleQueue()
+            for slot in range(self.workers):
+                slots.put(slot)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(slots, max_rounds, stalemate_rounds),
+            )
+        else:
+            _init_worker(None, max_rounds, stalemate_rounds)
+
+    def __enter__(self) -> SharedMemoryPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """关闭进程池."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, jobs: Sequence[PairJob]) -> list[MatchupTotals]:
+        """执行一批任务, 按输入顺序返回各组对阵的汇总."""
+        layout = SharedLayout(len(jobs), self.workers, keys=self.attribution_keys)
+        shm = SharedMemory(create=True, size=max(layout.nbytes, ITEM_SIZE))
+        try:
+            # 新建的共享内存已清零, 各片从 0 开始累加.
+            tasks = [
+                (shm.name, layout, idx, chunk)
+                for idx, job in enumerate(jobs)
+                for chunk in self._split(job)
+            ]
+            if self._executor is None:
+                for task in tasks:
+                    _run_shared_chunk(task)
+                _detach()
+            else:
+                for _ in self._executor.map(_run_shared_chunk, tasks):
+                    pass
+            return _reduce(shm, layout)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _split(self, job: PairJob) -> list[PairJob]:
+        if self._executor is None:
+            return [job]
+        size = self.chunk_size
+        return [
+            PairJob(job.spawn_a, job.spawn_b, job.base_seed, start, min(start + size, job.stop))
+            for start in range(job.start, job.stop, size)
+        ]
+
+
+ITEM_SIZE = 8
+WIN_A_SLOT = 0
+WIN_B_SLOT = 1
+DRAW_SLOT = 2
+OUTCOME_SLOTS = 3
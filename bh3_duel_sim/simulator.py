@@ -2,26 +2,110 @@
 
 from __future__ import annotations
 
+import math
 import random
-from typing import Callable
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
 
-from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.characters.base import BaseCharacter, CharacterSnapshot
 from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.results import MatchupStore, character_fingerprint
+from bh3_duel_sim.timeline import ActionTimeline
+
+if TYPE_CHECKING:
+    from bh3_duel_sim.checkpoint import RoundRobinCheckpoint
+    from bh3_duel_sim.distributions import MatchupDistributions
+    from bh3_duel_sim.progress import ProgressTracker
+
+# 单场对局的回合上限; 超过后判平局, 保证攻防钳制为 0 等组合不会让对局无限进行.
+DEFAULT_MAX_ROUNDS = 500
+# 连续这么多回合双方生命都没有变化时提前判平局; 0 表示关闭.
+DEFAULT_STALEMATE_ROUNDS = 30
+
+
+@dataclass(frozen=True)
+class BattleSnapshot:
+    """对局中途的完整局面, 可在同一对角色上反复恢复以分叉推演."""
+
+    fighters: tuple[tuple[BaseCharacter, CharacterSnapshot], ...]
+    order: tuple[tuple[BaseCharacter, BaseCharacter], ...]
+    rng_state: tuple[object, ...]
+    round_count: int
+    timeline: tuple[tuple[float, int, BaseCharacter], ...] | None
+    stall: tuple[tuple[float, float] | None, int] = (None, 0)
+
+
+@dataclass(frozen=True)
+class PairJob:
+    """一段定种对局: 对阵双方工厂、基础种子与序号区间 [start, stop)."""
+
+    spawn_a: Callable[[], BaseCharacter]
+    spawn_b: Callable[[], BaseCharacter]
+    base_seed: int
+    start: int
+    stop: int
+
+
+@dataclass(frozen=True)
+class RoundRobinOptions:
+    """循环赛的可选组件.
+
+    store 复用并更新已存结果; checkpoint 定期写入检查点并支持续跑; progress 按块报告进度.
+    distributions 为 (A, B) 名称对 -> 回合数与剩余生命分布, 循环赛把本次实际模拟的
+    每场对局写入其中 (缺少的对阵自动新建); 取自缓存或检查点的场次没有逐场信息, 不计入.
+    """
+
+    store: MatchupStore | None = None
+    checkpoint: RoundRobinCheckpoint | None = None
+    progress: ProgressTracker | None = None
+    distributions: dict[tuple[str, str], MatchupDistributions] | None = None
 
 
 class BattleSimulator:
     """战斗驱动器."""
 
-    def __init__(self, seed: int | None = None) -> None:
+    def __init__(
+        self,
+        seed: int | None = None,
+        turn_mode: str = "alternate",
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        stalemate_rounds: int = DEFAULT_STALEMATE_ROUNDS,
+    ) -> None:
+        """turn_mode: "alternate" 双方严格交替 (默认, 最快); "timeline" 按速度排行动条.
+
+        max_rounds 回合打完仍未分胜负, 或连续 stalemate_rounds 回合双方生命都不变时,
+        对局以平局结束, simulate_once 返回 None.
+        """
+        if turn_mode not in TURN_MODES:
+            raise ValueError(f"未知的回合模式: {turn_mode}")
+        if max_rounds < 1 or stalemate_rounds < 0:
+            raise ValueError("回合上限至少为 1, 僵局判定回合数不能为负")
         self.rng = random.Random(seed)
+        self.turn_mode = turn_mode
+        self.max_rounds = max_rounds
+        self.stalemate_rounds = stalemate_rounds
+        # 最近一场对局若为平局, 记录原因; 分出胜负时为 None.
+        self.draw_reason: str | None = None
+        # 最近一场对局的先手方, 供先后手拆分统计使用.
+        self.first_mover: BaseCharacter | None = None
+        # 每回合开始、任何角色行动前调用 on_round(驱动器, 回合序号), 可在其中取快照.
+        self.on_round: Callable[[BattleSimulator, int], None] | None = None
+        self._fighters: tuple[BaseCharacter, BaseCharacter] | None = None
+        self._order: list[tuple[BaseCharacter, BaseCharacter]] = []
+        self._round = 0
+        self._timeline: ActionTimeline | None = None
+        # 上一回合开始时的双方生命, 以及生命连续未变的回合数.
+        self._last_hp: tuple[float, float] | None = None
+        self._stalled = 0
 
     def simulate_once(
         self,
         fighter_a: BaseCharacter,
         fighter_b: BaseCharacter,
         logger: BattleLogger,
-    ) -> BaseCharacter:
-        """执行一场对局."""
+    ) -> BaseCharacter | None:
+        """执行一场对局, 返回胜者; 平局时返回 None."""
         fighter_a.reset_for_battle()
         fighter_b.reset_for_battle()
         fighter_a.bind_rng(self.rng)
@@ -29,18 +113,131 @@ class BattleSimulator:
         logger.configure_actors([fighter_a.name, fighter_b.name])
         logger.log_system(f"=== 对局开始: {fighter_a.name} vs {fighter_b.name} ===")
         order = self._decide_order(fighter_a, fighter_b)
-        round_count = 1
-        while fighter_a.is_alive and fighter_b.is_alive:
-            logger.log_system(f"-- 第 {round_count} 回合 --")
-            for actor, target in order:
-                if not (actor.is_alive and target.is_alive):
+        self.first_mover = order[0][0]
+        self._fighters = (fighter_a, fighter_b)
+        self._order = order
+        self._last_hp = None
+        self._stalled = 0
+        if self.turn_mode == TURN_MODE_TIMELINE:
+            self._timeline = ActionTimeline([actor for actor, _ in order])
+            self._round = 0
+        else:
+            self._timeline = None
+            self._round = 1
+        return self._play(logger, self.on_round)
+
+    def _play(
+        self, logger: BattleLogger, hook: Callable[[BattleSimulator, int], None] | None
+    ) -> BaseCharacter | None:
+        assert self._fighters is not None
+        fighter_a, fighter_b = self._fighters
+        self.draw_reason = None
+        if self._timeline is not None:
+            self._run_timeline(self._timeline, logger, hook)
+        else:
+            order = self._order
+            while fighter_a.is_alive and fighter_b.is_alive:
+                if self._check_draw(self._round):
                     break
-                self._exec_turn(actor, target, logger)
-            round_count += 1
+                if hook is not None:
+                    hook(self, self._round)
+                logger.log_system(f"-- 第 {self._round} 回合 --")
+                for actor, target in order:
+                    if not (actor.is_alive and target.is_alive):
+                        break
+                    self._exec_turn(actor, target, logger)
+                self._round += 1
+        if self.draw_reason is not None:
+            logger.log_system(f"=== 平局: {self.draw_reason} ===")
+            return None
         winner = fighter_a if fighter_a.is_alive else fighter_b
         logger.log_system(f"=== 胜者: {winner.name} ===")
         return winner
 
+    def _check_draw(self, round_count: int) -> bool:
+        """第 round_count 回合开始前检查回合上限与僵局, 判平局时写入 draw_reason."""
+        assert self._fighters is not None
+        fighter_a, fighter_b = self._fighters
+        hp = (fighter_a.current_hp, fighter_b.current_hp)
+        if hp == self._last_hp:
+            self._stalled += 1
+        else:
+            self._stalled = 0
+            self._last_hp = hp
+        if self.stalemate_rounds and self._stalled >= self.stalemate_rounds:
+            self.draw_reason = f"连续 {self._stalled} 回合双方生命无变化"
+        elif round_count > self.max_rounds:
+            self.draw_reason = f"超过 {self.max_rounds} 回合上限"
+        return self.draw_reason is not None
+
+    @property
+    def rounds_played(self) -> int:
+        """当前(或最近一场)对局已进行的回合数, 最后一个未打完的回合也计入."""
+        return self._round if self._timeline is not None else self._round - 1
+
+    @property
+    def fighters(self) -> tuple[BaseCharacter, BaseCharacter] | None:
+        """当前(或最近一场)对局的双方, 顺序同 simulate_once 的参数."""
+        return self._fighters
+
+    @property
+    def settings(self) -> dict[str, object]:
+        """影响对局结果的驱动设置, 供缓存与检查点判断结果能否复用."""
+        return {
+            "turn_mode": self.turn_mode,
+            "max_rounds": self.max_rounds,
+            "stalemate_rounds": self.stalemate_rounds,
+        }
+
+    def snapshot(self) -> BattleSnapshot:
+        """保存当前局面: 双方角色状态、随机数状态、回合序号与行动条."""
+        if self._fighters is None:
+            raise RuntimeError("尚未开始对局, 无法取快照")
+        return BattleSnapshot(
+            fighters=tuple((fighter, fighter.snapshot()) for fighter in self._fighters),
+            order=tuple(self._order),
+            rng_state=self.rng.getstate(),
+            round_count=self._round,
+            timeline=self._timeline.state() if self._timeline is not None else None,
+            stall=(self._last_hp, self._stalled),
+        )
+
+    def restore(self, snapshot: BattleSnapshot) -> None:
+        """恢复到 snapshot 的局面, 角色对象仍是取快照时的同一组."""
+        for fighter, state in snapshot.fighters:
+            fighter.restore(state)
+            fighter.bind_rng(self.rng)
+        fighter_a, fighter_b = (fighter for fighter, _ in snapshot.fighters)
+        self._fighters = (fighter_a, fighter_b)
+        self._order = list(snapshot.order)
+        self.first_mover = self._order[0][0]
+        self.rng.setstate(snapshot.rng_state)
+        self._round = snapshot.round_count
+        self._last_hp, self._stalled = snapshot.stall
+        if snapshot.timeline is None:
+            self._timeline = None
+        else:
+            if self._timeline is None:
+                self._timeline = ActionTimeline([actor for actor, _ in self._order])
+            self._timeline.restore(snapshot.timeline)
+
+    def resume(self, logger: BattleLogger, *, hooks: bool = False) -> BaseCharacter | None:
+        """从当前局面(通常刚 restore 过)继续打完, 默认不触发 on_round 以免推演中递归."""
+        if self._fighters is None:
+            raise RuntimeError("尚未开始对局, 无法继续")
+        return self._play(logger, self.on_round if hooks else None)
+
+    def simulate_seeded(
+        self,
+        fighter_a: BaseCharacter,
+        fighter_b: BaseCharacter,
+        logger: BattleLogger,
+        seed: int,
+    ) -> BaseCharacter | None:
+        """以指定种子执行一场对局, 同一种子总是复现同一场战斗."""
+        self.rng.seed(seed)
+        return self.simulate_once(fighter_a, fighter_b, logger)
+
     def _decide_order(
         self, fighter_a: BaseCharacter, fighter_b: BaseCharacter
     ) -> list[tuple[BaseCharacter, BaseCharacter]]:
@@ -53,6 +250,33 @@ class BattleSimulator:
             return [(fighter_a, fighter_b), (fighter_b, fighter_a)]
         return [(fighter_b, fighter_a), (fighter_a, fighter_b)]
 
+    def _run_timeline(
+        self,
+        timeline: ActionTimeline,
+        logger: BattleLogger,
+        hook: Callable[[BattleSimulator, int], None] | None,
+    ) -> None:
+        """行动条模式: 由时间轴决定谁行动, 速度越快行动越频繁."""
+        order = self._order
+        targets = dict(order)
+        while all(actor.is_alive for actor, _ in order):
+            upcoming = timeline.peek_time()
+            if upcoming is None:
+                break
+            current_round = timeline.round_of(upcoming)
+            if current_round != self._round:
+                if self._check_draw(current_round):
+                    break
+                self._round = current_round
+                if hook is not None:
+                    hook(self, current_round)
+                logger.log_system(f"-- 第 {current_round} 回合 --")
+            scheduled = timeline.next_actor()
+            if scheduled is None:
+                break
+            _, actor = scheduled
+            self._exec_turn(actor, targets[actor], logger)
+
     def _exec_turn(self, actor: BaseCharacter, target: BaseCharacter, logger: BattleLogger) -> None:
         """执行单个角色的行动阶段."""
         actor.apply_state_effects(target, logger)
@@ -73,13 +297,109 @@ class BattleSimulator:
         actor.perform_basic_attack(target, logger)
 
 
+def battle_seed(base_seed: int, index: int) -> int:
+    """由基础种子与对局序号派生单场种子."""
+    return base_seed * BATTLE_SEED_STRIDE + index
+
+
+def pair_seed(seed: int, name_a: str, name_b: str) -> int:
+    """为一组对阵派生基础种子, 与名单中其它角色无关."""
+    return (seed << 32) | zlib.crc32(f"{name_a}\t{name_b}".encode())
+
+
+def run_seeded_range(
+    simulator: BattleSimulator, job: PairJob, logger: BattleLogger | None = None
+) -> tuple[int, int]:
+    """按 job 的序号区间 [start, stop) 执行逐场定种对局, 返回 (A 胜场, B 胜场).
+
+    每场种子只由 (base_seed, 序号) 决定, 区间可任意切分到不同进程, 合并结果不变.
+    平局不计入任何一方, 平局场数为 (stop - start) - A 胜场 - B 胜场.
+    """
+    quiet_logger = logger or BattleLogger(enabled=False)
+    spawn_a, spawn_b, base_seed = job.spawn_a, job.spawn_b, job.base_seed
+    wins_a = 0
+    wins_b = 0
+    for index in range(job.start, job.stop):
+        fighter_a = spawn_a()
+        winner = simulator.simulate_seeded(
+            fighter_a, spawn_b(), quiet_logger, battle_seed(base_seed, index)
+        )
+        if winner is fighter_a:
+            wins_a += 1
+        elif winner is not None:
+            wins_b += 1
+    return wins_a, wins_b
+
+
+def run_seeded_outcomes(simulator: BattleSimulator, job: PairJob) -> bytes:
+    """与 run_seeded_range 相同的定种对局, 但逐场返回结果: 1 表示 A 胜, 0 表示 B 胜或平局."""
+    quiet_logger = BattleLogger(enabled=False)
+    spawn_a, spawn_b, base_seed = job.spawn_a, job.spawn_b, job.base_seed
+    outcomes = bytearray(job.stop - job.start)
+    for offset, index in enumerate(range(job.start, job.stop)):
+        fighter_a = spawn_a()
+        winner = simulator.simulate_seeded(
+            fighter_a, spawn_b(), quiet_logger, battle_seed(base_seed, index)
+        )
+        if winner is fighter_a:
+            outcomes[offset] = 1
+    return bytes(outcomes)
+
+
+def run_seeded_seats(
+    simulator: BattleSimulator, job: PairJob
+) -> tuple[int, int, int, int, int, int]:
+    """与 run_seeded_range 相同的定种对局, 额外按先后手拆分.
+
+    返回 (A 胜场, B 胜场, 平局, A 先手场数, A 先手时的胜场, B 先手时的胜场).
+    """
+    quiet_logger = BattleLogger(enabled=False)
+    spawn_a, spawn_b, base_seed = job.spawn_a, job.spawn_b, job.base_seed
+    wins_a = 0
+    wins_b = 0
+    first_a = 0
+    first_wins_a = 0
+    first_wins_b = 0
+    for index in range(job.start, job.stop):
+        fighter_a = spawn_a()
+        winner = simulator.simulate_seeded(
+            fighter_a, spawn_b(), quiet_logger, battle_seed(base_seed, index)
+        )
+        a_first = simulator.first_mover is fighter_a
+        if a_first:
+            first_a += 1
+        if winner is fighter_a:
+            wins_a += 1
+            if a_first:
+                first_wins_a += 1
+        elif winner is not None:
+            wins_b += 1
+            if not a_first:
+                first_wins_b += 1
+    draws = (job.stop - job.start) - wins_a - wins_b
+    return wins_a, wins_b, draws, first_a, first_wins_a, first_wins_b
+
+
+def win_rate_half_width(wins: int, battles: int, z: float = 1.96) -> float:
+    """胜率正态近似置信区间半宽, 默认 95%."""
+    if battles <= 0:
+        return 1.0
+    rate = wins / battles
+    return z * math.sqrt(rate * (1.0 - rate) / battles)
+
+
 def mass_battle_statistics(
     simulator: BattleSimulator,
     spawn_a: Callable[[], BaseCharacter],
     spawn_b: Callable[[], BaseCharacter],
     iterations: int = 10_000,
+    *,
+    distributions: MatchupDistributions | None = None,
 ) -> dict[str, float]:
-    """重复模拟多场对局并统计胜率."""
+    """重复模拟多场对局并统计胜率, 出现平局时另有 DRAW_KEY 一项.
+
+    传入 distributions 时逐场写入回合数与剩余生命分布.
+    """
     sample_a = spawn_a()
     sample_b = spawn_b()
     name_a = sample_a.name
@@ -87,57 +407,245 @@ def mass_battle_statistics(
     del sample_a
     del sample_b
     wins: dict[str, int] = {name_a: 0, name_b: 0}
-    quiet_logger = BattleLogger(enabled=False)
-    for _ in range(iterations):
-        winner = simulator.simulate_once(spawn_a(), spawn_b(), quiet_logger)
-        wins[winner.name] = wins.get(winner.name, 0) + 1
+    _play_battles(simulator, (spawn_a, spawn_b), iterations, wins, distributions)
     return {name: count / iterations for name, count in wins.items()}
 
 
+def _play_battles(
+    simulator: BattleSimulator,
+    spawns: tuple[Callable[[], BaseCharacter], Callable[[], BaseCharacter]],
+    battles: int,
+    wins: dict[str, int],
+    distributions: MatchupDistributions | None,
+) -> None:
+    # 连续模拟 battles 场, 胜场按胜者名称 (平局为 DRAW_KEY) 累加到 wins.
+    spawn_a, spawn_b = spawns
+    quiet_logger = BattleLogger(enabled=False)
+    for _ in range(battles):
+        fighter_a = spawn_a()
+        winner = simulator.simulate_once(fighter_a, spawn_b(), quiet_logger)
+        key = winner.name if winner is not None else DRAW_KEY
+        wins[key] = wins.get(key, 0) + 1
+        if distributions is not None:
+            distributions.record_battle(simulator, fighter_a, winner)
+
+
 def run_single_verbose_battle(
     simulator: BattleSimulator,
     spawn_a: Callable[[], BaseCharacter],
     spawn_b: Callable[[], BaseCharacter],
+    annotate_rollouts: int = 0,
 ) -> None:
-    """输出一场带日志的对局."""
+    """输出一场带日志的对局; annotate_rollouts > 0 时每回合标注推演胜率."""
+    if annotate_rollouts > 0:
+        from bh3_duel_sim.winprob import (  # noqa: PLC0415 - winprob 依赖本模块
+            AnnotationOptions,
+            run_annotated_battle,
+        )
+
+        run_annotated_battle(
+            simulator, spawn_a, spawn_b, AnnotationOptions(rollouts=annotate_rollouts)
+        )
+        return
     logger = BattleLogger(enabled=True)
     simulator.simulate_once(spawn_a(), spawn_b(), logger)
 
 
+def _run_pair(
+    simulator: BattleSimulator,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    names: tuple[str, str],
+    iterations: int,
+    options: RoundRobinOptions,
+) -> dict[str, int]:
+    """跑完一组对阵并返回双方胜场 (有平局时另含 DRAW_KEY).
+
+    检查点中已完成或缓存中指纹未变的对阵直接复用, 不再模拟.
+    """
+    store, checkpoint, progress = options.store, options.checkpoint, options.progress
+    fingerprints = _pair_fingerprints(roster, names) if store is not None else {}
+    finished = checkpoint.completed.get(names) if checkpoint is not None else None
+    cached = None
+    if finished is None and store is not None:
+        cached = _lookup_pair(store, fingerprints, iterations)
+        if cached is not None and checkpoint is not None:
+            checkpoint.finish_pair(simulator.rng, names, cached)
+    pair_wins = finished or cached
+    if pair_wins is None:
+        pair_wins = _simulate_pair(simulator, roster, names, iterations, options)
+    elif progress is not None:
+        progress.record_cached(*names, iterations, pair_wins[names[0]])
+    if store is not None and cached is None:
+        store.record(fingerprints, battles=iterations, wins=pair_wins)
+    return pair_wins
+
+
+def _pair_fingerprints(
+    roster: dict[str, Callable[[], BaseCharacter]], names: tuple[str, str]
+) -> dict[str, str]:
+    return {name: character_fingerprint(roster[name]) for name in names}
+
+
+def _lookup_pair(
+    store: MatchupStore, fingerprints: dict[str, str], iterations: int
+) -> dict[str, int] | None:
+    # 缓存只存双方胜场, 平局场数由总场数补出.
+    cached = store.lookup(fingerprints, battles=iterations)
+    if cached is None:
+        return None
+    draws = iterations - sum(cached.values())
+    return {**cached, DRAW_KEY: draws} if draws else cached
+
+
+def _simulate_pair(
+    simulator: BattleSimulator,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    names: tuple[str, str],
+    iterations: int,
+    options: RoundRobinOptions,
+) -> dict[str, int]:
+    """模拟一组对阵, 有检查点时从中断处续跑."""
+    checkpoint, progress = options.checkpoint, options.progress
+    resumed = checkpoint.resume_pair(names) if checkpoint is not None else None
+    done, pair_wins = resumed or (0, dict.fromkeys(names, 0))
+    if progress is not None:
+        progress.record_cached(*names, done, pair_wins[names[0]])
+    distributions = _pair_distributions(options, names)
+    # 按块执行, 检查点与进度只在块边界处理; 两者都没有时整组作为一块跑完.
+    stride = iterations if checkpoint is None and progress is None else HOOK_STRIDE
+    spawns = (roster[names[0]], roster[names[1]])
+    while done < iterations:
+        stop = min(done + stride, iterations)
+        _play_battles(simulator, spawns, stop - done, pair_wins, distributions)
+        done = stop
+        if checkpoint is not None:
+            checkpoint.tick(simulator.rng, names, done, pair_wins)
+        if progress is not None:
+            progress.update(*names, done, pair_wins[names[0]])
+    if checkpoint is not None:
+        checkpoint.finish_pair(simulator.rng, names, pair_wins)
+    return pair_wins
+
+
+def _pair_distributions(
+    options: RoundRobinOptions, names: tuple[str, str]
+) -> MatchupDistributions | None:
+    if options.distributions is None:
+        return None
+    distributions = options.distributions.get(names)
+    if distributions is None:
+        from bh3_duel_sim.distributions import (  # noqa: PLC0415 - distributions 依赖本模块
+            MatchupDistributions,
+        )
+
+        distributions = options.distributions[names] = MatchupDistributions()
+    return distributions
+
+
+def _pair_rates(pair_wins: dict[str, int], iterations: int) -> dict[str, float]:
+    return {name: count / iterations for name, count in pair_wins.items()}
+
+
+def _round_robin_pairs(names: list[str]) -> list[tuple[str, str]]:
+    return [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))]
+
+
+def _open_options(
+    simulator: BattleSimulator,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    iterations_per_pair: int,
+    options: RoundRobinOptions,
+) -> None:
+    if options.store is not None:
+        options.store.use_settings(simulator.settings)
+    if options.checkpoint is not None:
+        options.checkpoint.begin(simulator, roster, iterations_per_pair)
+    if options.progress is not None:
+        for name_a, name_b in _round_robin_pairs(list(roster)):
+            options.progress.plan(name_a, name_b, iterations_per_pair)
+
+
+def _close_options(options: RoundRobinOptions) -> None:
+    if options.store is not None:
+        options.store.save()
+    if options.checkpoint is not None:
+        options.checkpoint.clear()
+    if options.progress is not None:
+        options.progress.close()
+
+
 def round_robin_statistics(
     simulator: BattleSimulator,
     roster: dict[str, Callable[[], BaseCharacter]],
     iterations_per_pair: int = 10_000,
+    options: RoundRobinOptions | None = None,
 ) -> tuple[dict[str, float], dict[tuple[str, str], dict[str, float]]]:
-    """对整套角色做循环赛统计."""
+    """对整套角色做循环赛统计, options 见 RoundRobinOptions.
+
+    带 store 时复用并更新已存结果. 带 checkpoint 时定期写入检查点; 检查点文件已存在
+    则从中断处续跑, 结果与一次跑完相同, 正常结束后删除检查点文件.
+    """
     names = list(roster.keys())
     if len(names) < MIN_ROSTER_SIZE:
         raise ValueError("循环赛至少需要两名角色")
 
+    options = options or RoundRobinOptions()
     total_matches_per_character = iterations_per_pair * (len(names) - 1)
-    quiet_logger = BattleLogger(enabled=False)
     wins: dict[str, int] = {name: 0 for name in names}
     matchup_rates: dict[tuple[str, str], dict[str, float]] = {}
-
-    for i in range(len(names)):
-        for j in range(i + 1, len(names)):
-            name_a = names[i]
-            name_b = names[j]
-            spawn_a = roster[name_a]
-            spawn_b = roster[name_b]
-            pair_wins = {name_a: 0, name_b: 0}
-            for _ in range(iterations_per_pair):
-                winner = simulator.simulate_once(spawn_a(), spawn_b(), quiet_logger)
-                wins[winner.name] += 1
-                pair_wins[winner.name] += 1
-            matchup_rates[(name_a, name_b)] = {
-                name_a: pair_wins[name_a] / iterations_per_pair,
-                name_b: pair_wins[name_b] / iterations_per_pair,
-            }
+    _open_options(simulator, roster, iterations_per_pair, options)
+    for name_a, name_b in _round_robin_pairs(names):
+        pair_wins = _run_pair(simulator, roster, (name_a, name_b), iterations_per_pair, options)
+        wins[name_a] += pair_wins[name_a]
+        wins[name_b] += pair_wins[name_b]
+        matchup_rates[(name_a, name_b)] = _pair_rates(pair_wins, iterations_per_pair)
+    _close_options(options)
 
     overall = {name: wins[name] / total_matches_per_character for name in names}
     return overall, matchup_rates
 
 
+def gauntlet_statistics(
+    simulator: BattleSimulator,
+    challenger: str,
+    roster: dict[str, Callable[[], BaseCharacter]],
+    store: MatchupStore,
+    iterations_per_pair: int = 10_000,
+) -> tuple[dict[str, float], dict[tuple[str, str], dict[str, float]]]:
+    """挑战者逐一对阵名单其余角色, 只重跑指纹变化的对阵.
+
+    整体胜率由 store 中名单内的全部对阵汇总, 未涉及挑战者的对阵沿用已存结果,
+    不会重跑整张 N^2 矩阵; 缺失或指纹已变的旧对阵不计入整体胜率.
+    """
+    if challenger not in roster:
+        raise ValueError(f"名单中没有挑战者: {challenger}")
+    names = list(roster.keys())
+    if len(names) < MIN_ROSTER_SIZE:
+        raise ValueError("挑战赛至少需要两名角色")
+
+    store.use_settings(simulator.settings)
+    options = RoundRobinOptions(store=store)
+    matchup_rates: dict[tuple[str, str], dict[str, float]] = {}
+    for opponent in names:
+        if opponent == challenger:
+            continue
+        pair_wins = _run_pair(
+            simulator, roster, (challenger, opponent), iterations_per_pair, options
+        )
+        matchup_rates[(challenger, opponent)] = _pair_rates(pair_wins, iterations_per_pair)
+
+    store.save()
+    return store.overall(roster), matchup_rates
+
+
 MIN_ROSTER_SIZE = 2
+# 带检查点或进度报告时每块的场数, 钩子只在块边界调用.
+HOOK_STRIDE = 256
 SAME_SPEED_THRESHOLD = 0.5
+# 单个基础种子下可容纳的对局序号数量, 超出后会与下一个基础种子重叠.
+BATTLE_SEED_STRIDE = 1 << 40
+TURN_MODE_ALTERNATE = "alternate"
+TURN_MODE_TIMELINE = "timeline"
+TURN_MODES = (TURN_MODE_ALTERNATE, TURN_MODE_TIMELINE)
+# 统计结果中平局一项的键.
+DRAW_KEY = "平局"
@@ -0,0 +1,298 @@
+"""参数扫描模块: 在属性与类常量上做网格/随机/拉丁超立方扫描."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import os
+import random
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.characters.variants import VariantFactory
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+
+
+@dataclass(frozen=True)
+class SweepAxis:
+    """扫描维度: 某角色(显示名)的一个属性字段或类常量, 取值区间 [low, high]."""
+
+    character: str
+    parameter: str
+    low: float
+    high: float
+    steps: int = 5
+
+    @property
+    def key(self) -> str:
+        return f"{self.character}.{self.parameter}"
+
+    def normalize(self, value: float) -> float:
+        """映射到 [0, 1], 便于各维度等权比较距离."""
+        span = self.high - self.low
+        return (value - self.low) / span if span else 0.0
+
+
+def grid_design(axes: Sequence[SweepAxis]) -> list[dict[str, float]]:
+    """网格设计: 每个维度等距取 steps 个点, 做笛卡尔积."""
+    levels = [
+        [axis.low + (axis.high - axis.low) * i / max(1, axis.steps - 1) for i in range(axis.steps)]
+        for axis in axes
+    ]
+    return [
+        {axis.key: value for axis, value in zip(axes, combo)}
+        for combo in itertools.product(*levels)
+    ]
+
+
+def random_design(axes: Sequence[SweepAxis], samples: int, seed: int = 0) -> list[dict[str, float]]:
+    """均匀随机设计."""
+    rng = random.Random(seed)
+    return [{axis.key: rng.uniform(axis.low, axis.high) for axis in axes} for _ in range(samples)]
+
+
+def latin_hypercube_design(
+    axes: Sequence[SweepAxis], samples: int, seed: int = 0
+) -> list[dict[str, float]]:
+    """拉丁超立方设计: 每个维度的 samples 个分层各恰好落一个点."""
+    rng = random.Random(seed)
+    columns: list[list[float]] = []
+    for axis in axes:
+        strata = [(i + rng.random()) / samples for i in range(samples)]
+        rng.shuffle(strata)
+        columns.append([axis.low + (axis.high - axis.low) * u for u in strata])
+    return [{axis.key: columns[a][i] for a, axis in enumerate(axes)} for i in range(samples)]
+
+
+@dataclass
+class SweepPoint:
+    """单个设计点的结果: 被调整角色对其余角色的胜率与平局率, 均以总场数为分母."""
+
+    index: int
+    params: dict[str, float]
+    matchups: dict[str, dict[str, float]]
+    draws: dict[str, dict[str, float]]
+
+    def overall(self, character: str) -> float:
+        """该角色在本设计点上的平均胜率."""
+        rates = self.matchups.get(character, {})
+        return sum(rates.values()) / len(rates) if rates else 0.0
+
+    def draw_rate(self, character: str) -> float:
+        """该角色在本设计点上的平均平局率."""
+        rates = self.draws.get(character, {})
+        return sum(rates.values()) / len(rates) if rates else 0.0
+
+
+class SweepSurrogate:
+    """反距离加权插值代理: 在设计点上精确复现, 点间平滑插值, 查询结果缓存."""
+
+    def __init__(
+        self,
+        axes: Sequence[SweepAxis],
+        samples: Sequence[tuple[Mapping[str, float], float]],
+        power: float = 2.0,
+    ) -> None:
+        self.axes = list(axes)
+        self.power = power
+        self._coords = [
+            tuple(axis.normalize(params[axis.key]) for axis in self.axes) for params, _ in samples
+        ]
+        self._values = [value for _, value in samples]
+        self._cache: dict[tuple[float, ...], float] = {}
+
+    def predict(self, params: Mapping[str, float]) -> float:
+        """估计给定参数组合下的胜率."""
+        point = tuple(round(axis.normalize(params[axis.key]), 9) for axis in self.axes)
+        cached = self._cache.get(point)
+        if cached is not None:
+            return cached
+        weight_sum = 0.0
+        value_sum = 0.0
+        for coords, value in zip(self._coords, self._values):
+            distance = math.dist(point, coords)
+            if distance == 0.0:
+                # 恰好落在样本点上, 直接取样本值.
+                result = value
+                break
+            weight = distance**-self.power
+            weight_sum += weight
+            value_sum += weight * value
+        else:
+            result = value_sum / weight_sum if weight_sum else 0.0
+        self._cache[point] = result
+        return result
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """保存代理, 以便不重跑扫描即可查询."""
+        payload = {
+            "axes": [asdict(axis) for axis in self.axes],
+            "power": self.power,
+            "coords": self._coords,
+            "values": self._values,
+        }
+        Path(path).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> SweepSurrogate:
+        """载入 save 写出的代理."""
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        surrogate = cls([SweepAxis(**axis) for axis in payload["axes"]], [], payload["power"])
+        surrogate._coords = [tuple(coords) for coords in payload["coords"]]
+        surrogate._values = list(payload["values"])
+        return surrogate
+
+
+@dataclass
+class SweepResult:
+    """扫描结果: 设计点列表与由其导出的胜率曲面."""
+
+    axes: list[SweepAxis]
+    points: list[SweepPoint]
+
+    def surface(self, character: str) -> list[tuple[dict[str, float], float]]:
+        """某角色的胜率曲面: (参数组合, 平均胜率) 列表."""
+        return [(point.params, point.overall(character)) for point in self.points]
+
+    def draw_surface(self, character: str) -> list[tuple[dict[str, float], float]]:
+        """某角色的平局率曲面, 格式同 surface."""
+        return [(point.params, point.draw_rate(character)) for point in self.points]
+
+    def surrogate(self, character: str, power: float = 2.0) -> SweepSurrogate:
+        """基于曲面构建插值代理."""
+        return SweepSurrogate(self.axes, self.surface(character), power)
+
+
+def apply_overrides(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    params: Mapping[str, float],
+) -> dict[str, Callable[[], BaseCharacter]]:
+    """按 "角色.参数" 键把名单中的角色替换为变体工厂."""
+    grouped: dict[str, dict[str, object]] = {}
+    for key, value in params.items():
+        character, _, parameter = key.partition(".")
+        if character not in roster:
+            raise ValueError(f"名单中没有角色: {character}")
+        grouped.setdefault(character, {})[parameter] = value
+    variant_roster = dict(roster)
+    for character, overrides in grouped.items():
+        variant_roster[character] = VariantFactory(roster[character], overrides)
+    return variant_roster
+
+
+def _point_jobs(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    characters: Sequence[str],
+    params: Mapping[str, float],
+    iterations: int,
+    seed: int,
+) -> tuple[list[tuple[str, str]], list[PairJob]]:
+    variant_roster = apply_overrides(roster, params)
+    pairs: list[tuple[str, str]] = []
+    for character in characters:
+        for opponent in roster:
+            if opponent == character or (opponent, character) in pairs:
+                continue
+            pairs.append((character, opponent))
+    # 所有设计点共用同一对阵种子(公共随机数), 曲面上的差异只来自参数本身.
+    jobs = [
+        PairJob(variant_roster[a], variant_roster[b], pair_seed(seed, a, b), 0, iterations)
+        for a, b in pairs
+    ]
+    return pairs, jobs
+
+
+def _read_progress(path: Path, header: dict[str, object]) -> dict[int, SweepPoint]:
+    done: dict[int, SweepPoint] = {}
+    if not path.exists():
+        return done
+    with path.open("r+b") as handle:
+        first = handle.readline()
+        if not first.endswith(b"\n"):
+            return done
+        if json.loads(first) != header:
+            raise ValueError(f"进度文件 {path} 与本次扫描参数不一致")
+        offset = handle.tell()
+        for line in iter(handle.readline, b""):
+            if not line.endswith(b"\n"):
+                # 中断时最后一行可能只写了一半: 截掉, 否则续扫追加的行会与它粘连.
+                handle.truncate(offset)
+                break
+            offset += len(line)
+            entry = json.loads(line) if line.strip() else {}
+            # 旧格式的行没有平局率, 其胜率也未计入平局, 对应设计点重新计算.
+            if "draws" in entry:
+                done[entry["index"]] = SweepPoint(
+                    entry["index"], entry["params"], entry["matchups"], entry["draws"]
+                )
+    return done
+
+
+@dataclass(frozen=True)
+class SweepOptions:
+    """run_sweep 的运行参数.
+
+    iterations 为每组对阵场数, seed 为对阵种子, workers 为并行数; 指定 progress_path 时
+    每完成一批设计点追加写入一行, 中断后以相同参数重跑即可续扫.
+    """
+
+    iterations: int = 2_000
+    seed: int = 0
+    workers: int = 1
+    progress_path: str | os.PathLike[str] | None = None
+
+
+def run_sweep(
+    roster: Mapping[str, Callable[[], BaseCharacter]],
+    axes: Sequence[SweepAxis],
+    design: Sequence[Mapping[str, float]],
+    options: SweepOptions | None = None,
+) -> SweepResult:
+    """对每个设计点构建变体并跑被调整角色的全部对阵, 运行参数见 SweepOptions."""
+    options = options or SweepOptions()
+    iterations, seed, workers = options.iterations, options.seed, options.workers
+    characters = sorted({axis.character for axis in axes})
+    header: dict[str, object] = {
+        "axes": [asdict(axis) for axis in axes],
+        "roster": list(roster),
+        "iterations": iterations,
+        "seed": seed,
+        "design": [dict(params) for params in design],
+    }
+    path = Path(options.progress_path) if options.progress_path is not None else None
+    done = _read_progress(path, header) if path is not None else {}
+    if path is not None and not done:
+        path.write_text(json.dumps(header, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    pending = [index for index in range(len(design)) if index not in done]
+    battles = max(1, iterations)
+    with SimulationPool(workers=workers) as pool:
+        batch_size = max(1, workers)
+        for offset in range(0, len(pending), batch_size):
+            batch = pending[offset : offset + batch_size]
+            plans = [_point_jobs(roster, characters, design[i], iterations, seed) for i in batch]
+            jobs = [job for _, point_jobs in plans for job in point_jobs]
+            outcomes = iter(pool.run(jobs))
+            for index, (pairs, _) in zip(batch, plans):
+                matchups: dict[str, dict[str, float]] = {name: {} for name in characters}
+                draws: dict[str, dict[str, float]] = {name: {} for name in characters}
+                for name_a, name_b in pairs:
+                    wins_a, wins_b = next(outcomes)
+                    draw_rate = (iterations - wins_a - wins_b) / battles
+                    matchups[name_a][name_b] = wins_a / battles
+                    draws[name_a][name_b] = draw_rate
+                    if name_b in matchups:
+                        matchups[name_b][name_a] = wins_b / battles
+                        draws[name_b][name_a] = draw_rate
+                point = SweepPoint(index, dict(design[index]), matchups, draws)
+                done[index] = point
+                if path is not None:
+                    with path.open("a", encoding="utf-8") as handle:
+                        handle.write(json.dumps(asdict(point), ensure_ascii=False) + "\n")
+
+    return SweepResult(list(axes), [done[index] for index in range(len(design))])
@@ -0,0 +1,202 @@
+"""伤害与机制归因计数: 按 (角色, 机制, 来源) 累计, 关闭时零开销."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.simulator import BattleSimulator, PairJob, battle_seed
+
+# (角色名, 机制, 来源). 机制为 "damage" / "heal" / "state", 或概率判定的机制标签
+# (如 "Bronya.PIERCE_CHANCE"); 判定本身记在来源为 "" 的键下, 判定成功后紧接着的
+# 伤害或状态记在来源为伤害来源/状态名的键下.
+TelemetryKey = tuple[str, str, str]
+
+# 计数器挂接时会在实例上覆盖的方法.
+WRAPPED_METHODS = (
+    "take_damage",
+    "heal",
+    "apply_state",
+    "apply_state_effects",
+    "roll_chance",
+    "note_mechanic",
+)
+
+INITIAL_SLOTS = 64
+
+
+class TelemetryCounters:
+    """预分配槽位的计数表: 每个键一个槽, 槽内为 次数 / 命中(击杀或判定成功) / 数值合计.
+
+    键到槽位的映射只在首次出现时建立, 之后每次更新只是一次字典查找和数组加法,
+    不做任何字符串格式化. 计数器通过 attach 在角色实例上包一层方法, 未挂接的对局
+    完全不受影响. 可 pickle, 跨进程结果用 merge 按键相加.
+    """
+
+    __slots__ = ("_index", "_keys", "counts", "hits", "totals")
+
+    def __init__(self) -> None:
+        self._index: dict[TelemetryKey, int] = {}
+        self._keys: list[TelemetryKey] = []
+        self.counts = array("q", bytes(8 * INITIAL_SLOTS))
+        self.hits = array("q", bytes(8 * INITIAL_SLOTS))
+        self.totals = array("d", bytes(8 * INITIAL_SLOTS))
+
+    def _slot(self, key: TelemetryKey) -> int:
+        slot = self._index.get(key)
+        if slot is not None:
+            return slot
+        slot = len(self._keys)
+        if slot == len(self.counts):
+            # 槽位用尽时容量翻倍.
+            self.counts.extend(array("q", bytes(8 * slot)))
+            self.hits.extend(array("q", bytes(8 * slot)))
+            self.totals.extend(array("d", bytes(8 * slot)))
+        self._index[key] = slot
+        self._keys.append(key)
+        return slot
+
+    def add(self, key: TelemetryKey, total: float = 0.0, hit: bool = False) -> None:
+        slot = self._slot(key)
+        self.counts[slot] += 1
+        self.totals[slot] += total
+        if hit:
+            self.hits[slot] += 1
+
+    def get(self, character: str, mechanic: str, source: str = "") -> tuple[int, int, float]:
+        """返回 (次数, 命中, 合计), 未出现过的键为全零."""
+        slot = self._index.get((character, mechanic, source))
+        if slot is None:
+            return 0, 0, 0.0
+        return self.counts[slot], self.hits[slot], self.totals[slot]
+
+    def items(self) -> Iterator[tuple[TelemetryKey, int, int, float]]:
+        for slot, key in enumerate(self._keys):
+            yield key, self.counts[slot], self.hits[slot], self.totals[slot]
+
+    def damage_share(self, character: str, mechanic: str, source: str) -> float:
+        """某机制造成的伤害占该角色总伤害的比例."""
+        dealt = sum(
+            total
+            for (name, kind, _), _, _, total in self.items()
+            if name == character and kind == "damage"
+        )
+        return self.get(character, mechanic, source)[2] / dealt if dealt else 0.0
+
+    def add_totals(self, key: TelemetryKey, count: int, hits: int, total: float) -> None:
+        """按已汇总的 (次数, 命中, 合计) 累加一个键."""
+        slot = self._slot(key)
+        self.counts[slot] += count
+        self.hits[slot] += hits
+        self.totals[slot] += total
+
+    def merge(self, other: TelemetryCounters) -> None:
+        for key, count, hits, total in other.items():
+            self.add_totals(key, count, hits, total)
+
+    def attach(self, fighter_a: BaseCharacter, fighter_b: BaseCharacter) -> None:
+        """为一场对局的双方挂接计数, 需在 simulate_once 之前调用."""
+        # 每名角色最近一次成功判定的机制标签, 由紧随其后的伤害或状态消耗.
+        armed: dict[BaseCharacter, str | None] = {fighter_a: None, fighter_b: None}
+        self._wrap(fighter_a, fighter_b, armed)
+        self._wrap(fighter_b, fighter_a, armed)
+
+    @staticmethod
+    def detach(fighter: BaseCharacter) -> None:
+        """移除挂接, 恢复类上的原方法."""
+        for name in WRAPPED_METHODS:
+            fighter.__dict__.pop(name, None)
+
+    def _wrap(
+        self,
+        fighter: BaseCharacter,
+        opponent: BaseCharacter,
+        armed: dict[BaseCharacter, str | None],
+    ) -> None:
+        add = self.add
+        name = fighter.name
+        noted = [""]
+        note_mechanic = fighter.note_mechanic
+        roll_chance = fighter.roll_chance
+        take_damage = fighter.take_damage
+        heal = fighter.heal
+        apply_state = fighter.apply_state
+        apply_state_effects = fighter.apply_state_effects
+
+        def wrapped_note(tag: str) -> None:
+            noted[0] = tag
+            note_mechanic(tag)
+
+        def wrapped_roll(probability: float) -> bool:
+            result = roll_chance(probability)
+            tag = noted[0]
+            add((name, tag, ""), 0.0, result)
+            armed[fighter] = tag if result else None
+            return result
+
+        def wrapped_damage(
+            amount: float,
+            logger: BattleLogger,
+            source: str,
+            *,
+            ignore_shield: bool = False,
+            attacker: BaseCharacter | None = None,
+        ) -> None:
+            before = fighter.current_hp
+            take_damage(amount, logger, source, ignore_shield=ignore_shield, attacker=attacker)
+            dealt = max(0.0, before - fighter.current_hp)
+            killed = fighter.current_hp <= 0
+            dealer = attacker.name if attacker is not None else name
+            add((dealer, "damage", source), dealt, killed)
+            if attacker is not None:
+                tag = armed.get(attacker)
+                if tag:
+                    armed[attacker] = None
+                    add((dealer, tag, source), dealt, killed)
+
+        def wrapped_heal(amount: float, logger: BattleLogger, source: str) -> None:
+            before = fighter.current_hp
+            heal(amount, logger, source)
+            add((name, "heal", source), max(0.0, fighter.current_hp - before))
+
+        def wrapped_state(state_name: str, values: dict[str, float], logger: BattleLogger) -> None:
+            apply_state(state_name, values, logger)
+            # 双人对局中状态总是由对手施加.
+            add((opponent.name, "state", state_name))
+            tag = armed.get(opponent)
+            if tag:
+                armed[opponent] = None
+                add((opponent.name, tag, state_name))
+
+        def wrapped_effects(target: BaseCharacter, logger: BattleLogger) -> None:
+            # 回合开始时作废上回合遗留的判定 (如复活), 避免算到之后的伤害上.
+            armed[fighter] = None
+            apply_state_effects(target, logger)
+
+        namespace = fighter.__dict__
+        namespace["note_mechanic"] = wrapped_note
+        namespace["roll_chance"] = wrapped_roll
+        namespace["take_damage"] = wrapped_damage
+        namespace["heal"] = wrapped_heal
+        namespace["apply_state"] = wrapped_state
+        namespace["apply_state_effects"] = wrapped_effects
+
+
+def run_seeded_telemetry(
+    simulator: BattleSimulator, job: PairJob, counters: TelemetryCounters | None = None
+) -> TelemetryCounters:
+    """与 run_seeded_range 相同的定种对局 (job 的序号区间), 累计双方的归因计数.
+
+    传入 counters 时累加到其中并返回它, 否则新建.
+    """
+    quiet_logger = BattleLogger(enabled=False)
+    counters = counters if counters is not None else TelemetryCounters()
+    spawn_a, spawn_b, base_seed = job.spawn_a, job.spawn_b, job.base_seed
+    for index in range(job.start, job.stop):
+        fighter_a = spawn_a()
+        fighter_b = spawn_b()
+        counters.attach(fighter_a, fighter_b)
+        simulator.simulate_seeded(fighter_a, fighter_b, quiet_logger, battle_seed(base_seed, index))
+    return counters
@@ -0,0 +1,75 @@
+"""行动条时间轴: 行动频率与速度成正比的回合调度."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Sequence
+
+from bh3_duel_sim.characters.base import BaseCharacter
+
+
+class ActionTimeline:
+    """基于最小堆的行动条调度器.
+
+    每名行动者每隔 GAUGE_LENGTH / 速度 的时间行动一次, 速度 25 对 5 的行动次数约为
+    5:1. 堆中存放 (下次行动时间, 初始位次, 行动者), 同时刻按初始位次先后行动,
+    每次调度 O(log N), 适用于任意人数. 倒下的行动者在出堆时惰性剔除.
+    """
+
+    __slots__ = ("_heap", "round_length")
+
+    def __init__(self, actors: Sequence[BaseCharacter]) -> None:
+        if not actors:
+            raise ValueError("时间轴至少需要一名行动者")
+        self._heap: list[tuple[float, int, BaseCharacter]] = [
+            (self.interval(actor), position, actor) for position, actor in enumerate(actors)
+        ]
+        heapq.heapify(self._heap)
+        # 一回合 = 平均速度的行动者行动一次所需时间; 速度相同时与交替模式一致.
+        mean_speed = sum(self._speed(actor) for actor in actors) / len(actors)
+        self.round_length = GAUGE_LENGTH / mean_speed
+
+    @staticmethod
+    def _speed(actor: BaseCharacter) -> float:
+        return max(actor.stats.speed, MIN_SPEED)
+
+    @classmethod
+    def interval(cls, actor: BaseCharacter) -> float:
+        """两次行动的间隔, 每次重新入堆时按当前速度计算."""
+        return GAUGE_LENGTH / cls._speed(actor)
+
+    def next_actor(self) -> tuple[float, BaseCharacter] | None:
+        """弹出下一名存活的行动者并安排其下次行动, 无人存活时返回 None."""
+        heap = self._heap
+        while heap:
+            time, position, actor = heap[0]
+            if not actor.is_alive:
+                heapq.heappop(heap)
+                continue
+            heapq.heapreplace(heap, (time + self.interval(actor), position, actor))
+            return time, actor
+        return None
+
+    def peek_time(self) -> float | None:
+        """下一名存活行动者的行动时刻, 不改变时间轴."""
+        heap = self._heap
+        while heap and not heap[0][2].is_alive:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def state(self) -> tuple[tuple[float, int, BaseCharacter], ...]:
+        """时间轴快照, 只复制堆中的条目."""
+        return tuple(self._heap)
+
+    def restore(self, state: tuple[tuple[float, int, BaseCharacter], ...]) -> None:
+        self._heap = list(state)
+
+    def round_of(self, time: float) -> int:
+        """时刻所在的回合序号 (从 1 开始)."""
+        return max(1, math.ceil(time / self.round_length - ROUND_EPSILON))
+
+
+GAUGE_LENGTH = 100.0
+MIN_SPEED = 1e-6
+ROUND_EPSILON = 1e-9
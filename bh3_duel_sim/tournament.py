@@ -0,0 +1,272 @@
+"""赛事模拟模块: 基于胜率矩阵的单败淘汰与瑞士轮蒙特卡洛."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.parallel import PairJob, SimulationPool
+from bh3_duel_sim.simulator import pair_seed
+
+
+class WinProbabilityTable:
+    """角色两两胜率表. 同名对阵(镜像局)按对称性取 0.5, 缺失对阵可按需模拟补齐."""
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = list(dict.fromkeys(names))
+        self._index = {name: idx for idx, name in enumerate(self.names)}
+        size = len(self.names)
+        self._p = [[0.5 if i == j else math.nan for j in range(size)] for i in range(size)]
+
+    @classmethod
+    def from_matchup_rates(
+        cls,
+        matchup_rates: Mapping[tuple[str, str], Mapping[str, float]],
+        names: Sequence[str] | None = None,
+    ) -> WinProbabilityTable:
+        """由 round_robin_statistics 或 MatchupStore.matchup_rates 的结果构建."""
+        if names is None:
+            names = [name for pair in matchup_rates for name in pair]
+        table = cls(names)
+        for (name_a, name_b), rates in matchup_rates.items():
+            if name_a in table._index and name_b in table._index:
+                # 用双方胜场之比归一, 兼容带平局的结果.
+                decided = rates[name_a] + rates[name_b]
+                table.set(name_a, name_b, rates[name_a] / decided if decided else 0.5)
+        return table
+
+    def set(self, name_a: str, name_b: str, rate: float) -> None:
+        i, j = self._index[name_a], self._index[name_b]
+        self._p[i][j] = rate
+        self._p[j][i] = 1.0 - rate
+
+    def prob(self, name_a: str, name_b: str) -> float:
+        """A 击败 B 的概率, 缺失时为 nan."""
+        return self._p[self._index[name_a]][self._index[name_b]]
+
+    def missing(self) -> list[tuple[str, str]]:
+        size = len(self.names)
+        return [
+            (self.names[i], self.names[j])
+            for i in range(size)
+            for j in range(i + 1, size)
+            if math.isnan(self._p[i][j])
+        ]
+
+    def fill_missing(
+        self,
+        roster: Mapping[str, Callable[[], BaseCharacter]],
+        iterations: int = 2_000,
+        seed: int = 0,
+        workers: int = 1,
+    ) -> int:
+        """只对缺失对阵做完整战斗模拟, 返回消耗的场数."""
+        pairs = self.missing()
+        if not pairs:
+            return 0
+        jobs = [
+            PairJob(roster[a], roster[b], pair_seed(seed, a, b), 0, iterations) for a, b in pairs
+        ]
+        with SimulationPool(workers=workers) as pool:
+            outcomes = pool.run(jobs)
+        battles = 0
+        for (name_a, name_b), (wins_a, wins_b) in zip(pairs, outcomes):
+            decided = wins_a + wins_b
+            self.set(name_a, name_b, wins_a / decided if decided else 0.5)
+            battles += decided
+        return battles
+
+    def entry_matrix(self, entrants: Sequence[str]) -> list[list[float]]:
+        """按参赛席位展开的胜率矩阵, 同名角色可以占多个席位; 缺项时报错."""
+        missing = sorted({name for name in entrants if name not in self._index})
+        if missing:
+            raise ValueError(f"胜率表中没有角色: {', '.join(missing)}")
+        rows = [self._p[self._index[name]] for name in entrants]
+        matrix = [[row[self._index[name]] for name in entrants] for row in rows]
+        if any(math.isnan(value) for row in matrix for value in row):
+            raise ValueError("胜率表存在缺失对阵, 请先调用 fill_missing")
+        return matrix
+
+
+@dataclass
+class TournamentOdds:
+    """赛事结果: 各角色夺冠概率与每个席位的平均胜局数."""
+
+    format: str
+    tournaments: int  # 0 表示精确计算
+    champion: dict[str, float]
+    mean_wins: dict[str, float]
+
+
+def _aggregate(
+    entrants: Sequence[str], champion: Sequence[float], wins: Sequence[float], fmt: str, runs: int
+) -> TournamentOdds:
+    champion_by_name: dict[str, float] = {}
+    wins_by_name: dict[str, float] = {}
+    seats: dict[str, int] = {}
+    for name, champ, won in zip(entrants, champion, wins):
+        champion_by_name[name] = champion_by_name.get(name, 0.0) + champ
+        wins_by_name[name] = wins_by_name.get(name, 0.0) + won
+        seats[name] = seats.get(name, 0) + 1
+    mean_wins = {name: total / seats[name] for name, total in wins_by_name.items()}
+    return TournamentOdds(fmt, runs, champion_by_name, mean_wins)
+
+
+def _bracket_size(count: int) -> int:
+    if count < MIN_ENTRANTS:
+        raise ValueError("赛事至少需要两名参赛者")
+    return 1 << (count - 1).bit_length()
+
+
+def _entry_matrix_padded(table: WinProbabilityTable, entrants: Sequence[str]) -> list[list[float]]:
+    # 轮空席位补在末尾, 与其相关的概率不会被用到.
+    size = _bracket_size(len(entrants))
+    matrix = table.entry_matrix(entrants)
+    for row in matrix:
+        row.extend([1.0] * (size - len(entrants)))
+    matrix.extend([[0.0] * size for _ in range(size - len(entrants))])
+    return matrix
+
+
+def single_elimination_odds(table: WinProbabilityTable, entrants: Sequence[str]) -> TournamentOdds:
+    """固定对阵表的单败淘汰精确概率.
+
+    entrants 按签位顺序排列, 相邻两席首轮相遇; 人数不足 2 的幂时末尾补轮空.
+    第 r 轮席位 s 的对手来自相邻半区, 晋级概率
+    reach_r[s] = reach_{r-1}[s] * (Σ_t reach_{r-1}[t] P[s][t] + P(对方半区无人)),
+    总计 O(n^2) 次运算, 无需抽样.
+    """
+    matrix = _entry_matrix_padded(table, entrants)
+    size = len(matrix)
+    reach = [1.0 if s < len(entrants) else 0.0 for s in range(size)]
+    wins = [0.0] * size
+    rounds = size.bit_length() - 1
+    for r in range(1, rounds + 1):
+        updated = [0.0] * size
+        for s in range(size):
+            if reach[s] == 0.0:
+                continue
+            half = (s >> (r - 1)) ^ 1
+            start = half << (r - 1)
+            opponents = range(start, start + (1 << (r - 1)))
+            beat = sum(reach[t] * matrix[s][t] for t in opponents)
+            walkover = 1.0 - sum(reach[t] for t in opponents)
+            wins[s] += reach[s] * beat
+            updated[s] = reach[s] * (beat + max(0.0, walkover))
+        reach = updated
+    count = len(entrants)
+    return _aggregate(entrants, reach[:count], wins[:count], "single_elimination", 0)
+
+
+def simulate_single_elimination(
+    table: WinProbabilityTable,
+    entrants: Sequence[str],
+    tournaments: int = 100_000,
+    seed: int = 0,
+    shuffle_seeding: bool = True,
+) -> TournamentOdds:
+    """单败淘汰蒙特卡洛: 每届随机抽签 (shuffle_seeding) 后按胜率表抽取每局胜负.
+
+    固定签表时请直接使用 single_elimination_odds 的精确解.
+    每局只是一次均匀随机数与查表概率的比较, 不调用战斗引擎.
+    """
+    matrix = _entry_matrix_padded(table, entrants)
+    size = len(matrix)
+    count = len(entrants)
+    rng = random.Random(seed)
+    draw = rng.random
+    shuffle = rng.shuffle
+    seats = list(range(size))
+    champion = [0] * size
+    wins = [0] * size
+    for _ in range(tournaments):
+        if shuffle_seeding:
+            shuffle(seats)
+        alive = seats
+        while len(alive) > 1:
+            advanced = []
+            for k in range(0, len(alive), 2):
+                a, b = alive[k], alive[k + 1]
+                if b >= count:
+                    advanced.append(a)
+                    continue
+                if a >= count:
+                    advanced.append(b)
+                    continue
+                winner = a if draw() < matrix[a][b] else b
+                wins[winner] += 1
+                advanced.append(winner)
+            alive = advanced
+        champion[alive[0]] += 1
+    scale = 1.0 / tournaments if tournaments else 0.0
+    return _aggregate(
+        entrants,
+        [c * scale for c in champion[:count]],
+        [w * scale for w in wins[:count]],
+        "single_elimination",
+        tournaments,
+    )
+
+
+def simulate_swiss(
+    table: WinProbabilityTable,
+    entrants: Sequence[str],
+    rounds: int | None = None,
+    tournaments: int = 100_000,
+    seed: int = 0,
+) -> TournamentOdds:
+    """瑞士轮蒙特卡洛.
+
+    每轮按 (积分, 随机次序) 排序, 依次为最高位未配对者匹配排在其后、尚未交手过的
+    第一人; 人数为奇数时排名最低且未轮空过的选手轮空记一胜. 默认 ceil(log2 n) 轮,
+    冠军取积分最高者, 同分比较对手积分和 (Buchholz), 仍相同则随机.
+    """
+    matrix = table.entry_matrix(entrants)
+    count = len(entrants)
+    if count < MIN_ENTRANTS:
+        raise ValueError("赛事至少需要两名参赛者")
+    rounds = rounds if rounds is not None else math.ceil(math.log2(count))
+    rng = random.Random(seed)
+    draw = rng.random
+    champion = [0] * count
+    wins = [0] * count
+    for _ in range(tournaments):
+        score = [0] * count
+        met: list[set[int]] = [set() for _ in range(count)]
+        had_bye = [False] * count
+        for _ in range(rounds):
+            tiebreak = [draw() for _ in range(count)]
+            order = sorted(range(count), key=lambda s: (-score[s], tiebreak[s]))
+            if count % 2:
+                bye = next((s for s in reversed(order) if not had_bye[s]), order[-1])
+                order.remove(bye)
+                had_bye[bye] = True
+                score[bye] += 1
+            while order:
+                a = order.pop(0)
+                pick = next((k for k, s in enumerate(order) if s not in met[a]), 0)
+                b = order.pop(pick)
+                met[a].add(b)
+                met[b].add(a)
+                winner = a if draw() < matrix[a][b] else b
+                score[winner] += 1
+                wins[winner] += 1
+        buchholz = [sum(score[o] for o in met[s]) for s in range(count)]
+        tiebreak = [draw() for _ in range(count)]
+        best = max(range(count), key=lambda s: (score[s], buchholz[s], tiebreak[s]))
+        champion[best] += 1
+    scale = 1.0 / tournaments if tournaments else 0.0
+    return _aggregate(
+        entrants,
+        [c * scale for c in champion],
+        [w * scale for w in wins],
+        "swiss",
+        tournaments,
+    )
+
+
+MIN_ENTRANTS = 2
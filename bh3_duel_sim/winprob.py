@@ -0,0 +1,189 @@
+"""实时胜率标注: 在详细日志的每回合开始前标出双方胜率预估."""
+
+from __future__ import annotations
+
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from bh3_duel_sim.characters.base import BaseCharacter
+from bh3_duel_sim.logger import BattleLogger
+from bh3_duel_sim.simulator import BattleSimulator, BattleSnapshot, battle_seed
+
+
+@dataclass
+class RoundEstimate:
+    """一次胜率估计: 第 round 回合开始前 (终局记为最后回合 + 1) A 的胜率."""
+
+    round: int
+    win_rate_a: float
+    std_error: float
+    swing: float  # 相对上一次估计的变化, 即上一回合事件的影响
+    events: list[str] = field(default_factory=list)  # 上一回合的日志行
+
+
+class _RoundRecorder(BattleLogger):
+    """照常输出日志, 同时缓存自上次取走以来的行, 用于关联事件与胜率摆动.
+
+    关闭输出时基类不会调用 log, 此时不记录事件.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        super().__init__(enabled)
+        self._lines: list[str] = []
+
+    def log(self, message: str) -> None:
+        super().log(message)
+        self._lines.append(message)
+
+    def take(self) -> list[str]:
+        lines, self._lines = self._lines, []
+        return lines
+
+
+# 推演任务: (快照, 推演种子, 起始序号, 结束序号, (回合上限, 僵局判定回合数)).
+RolloutJob = tuple[BattleSnapshot, int, int, int, tuple[int, int]]
+
+
+def _rollout_chunk(job: RolloutJob) -> int:
+    snapshot, seed, start, stop, (max_rounds, stalemate_rounds) = job
+    # 快照不含回合上限, 推演须沿用被估计对局的上限, 否则平局判定与原对局不同.
+    simulator = BattleSimulator(max_rounds=max_rounds, stalemate_rounds=stalemate_rounds)
+    quiet_logger = BattleLogger(enabled=False)
+    wins = 0
+    for index in range(start, stop):
+        simulator.restore(snapshot)
+        simulator.rng.seed(battle_seed(seed, index))
+        fighters = simulator.fighters
+        assert fighters is not None
+        if simulator.resume(quiet_logger) is fighters[0]:
+            wins += 1
+    return wins
+
+
+class RolloutEstimator:
+    """固定预算的推演估计器: 每次估计恰好跑 rollouts 场, 延迟有上界.
+
+    各回合使用同一组推演种子 (公共随机数), 相邻回合估计值的差主要反映局面变化.
+    workers > 1 时把快照分块发往进程池; 快照随角色对象一起 pickle, 因此要求角色类
+    可按模块路径导入 (动态生成的变体类只能在单进程下推演).
+    """
+
+    def __init__(self, rollouts: int = 200, seed: int = 0, workers: int = 1) -> None:
+        self.rollouts = max(1, rollouts)
+        self.seed = seed
+        self.workers = max(1, workers)
+        self._executor: Executor | None = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> RolloutEstimator:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def estimate(self, simulator: BattleSimulator) -> tuple[float, float]:
+        """从驱动器当前局面估计 A 的胜率与标准误, 返回前恢复原局面."""
+        snapshot = simulator.snapshot()
+        limits = (simulator.max_rounds, simulator.stalemate_rounds)
+        if self._executor is None:
+            wins = _rollout_chunk((snapshot, self.seed, 0, self.rollouts, limits))
+        else:
+            step = math.ceil(self.rollouts / self.workers)
+            jobs: list[RolloutJob] = [
+                (snapshot, self.seed, start, min(start + step, self.rollouts), limits)
+                for start in range(0, self.rollouts, step)
+            ]
+            wins = sum(self._executor.map(_rollout_chunk, jobs))
+        simulator.restore(snapshot)
+        rate = wins / self.rollouts
+        return rate, math.sqrt(rate * (1.0 - rate) / self.rollouts)
+
+
+@dataclass(frozen=True)
+class AnnotationOptions:
+    """run_annotated_battle 的推演与输出参数.
+
+    rollouts / seed / workers 同 RolloutEstimator; 终局后列出胜率摆动最大的 highlight 个
+    回合, 摆动不小于 threshold 的回合标为关键转折; verbose 为 False 时不输出日志.
+    """
+
+    rollouts: int = 200
+    seed: int = 0
+    workers: int = 1
+    highlight: int = 3
+    threshold: float = 0.15
+    verbose: bool = True
+
+
+def _format_estimate(names: tuple[str, str], estimate: RoundEstimate, threshold: float) -> str:
+    rate = estimate.win_rate_a
+    text = (
+        f"胜率预估 {names[0]} {rate:.1%} / {names[1]} {1.0 - rate:.1%}"
+        f" (±{1.96 * estimate.std_error:.1%})"
+    )
+    if estimate.round > 1:
+        text += f", 上回合摆动 {estimate.swing:+.1%}"
+    if abs(estimate.swing) >= threshold:
+        text += " ★ 关键转折"
+    return text
+
+
+def run_annotated_battle(
+    simulator: BattleSimulator,
+    spawn_a: Callable[[], BaseCharacter],
+    spawn_b: Callable[[], BaseCharacter],
+    options: AnnotationOptions | None = None,
+) -> list[RoundEstimate]:
+    """输出一场带日志的对局, 并在每回合开始前标注双方胜率, 参数见 AnnotationOptions.
+
+    每回合开始前从当前局面推演 rollouts 场; 推演结束后恢复局面与随机数状态,
+    因此标注后的对局与不标注时完全相同. 终局后按胜率摆动列出影响最大的
+    highlight 个回合及其日志, 例如科拉莉的眩晕或薇塔的复活.
+    """
+    options = options or AnnotationOptions()
+    threshold = options.threshold
+    logger = _RoundRecorder(enabled=options.verbose)
+    estimates: list[RoundEstimate] = []
+    fighter_a = spawn_a()
+    fighter_b = spawn_b()
+    names = (fighter_a.name, fighter_b.name)
+
+    def record(round_count: int, rate: float, std_error: float) -> None:
+        previous = estimates[-1].win_rate_a if estimates else rate
+        estimate = RoundEstimate(round_count, rate, std_error, rate - previous, logger.take())
+        estimates.append(estimate)
+        logger.log_system(_format_estimate(names, estimate, threshold))
+        logger.take()
+
+    previous_hook = simulator.on_round
+    with RolloutEstimator(options.rollouts, options.seed, options.workers) as estimator:
+
+        def hook(sim: BattleSimulator, round_count: int) -> None:
+            record(round_count, *estimator.estimate(sim))
+
+        simulator.on_round = hook
+        try:
+            winner = simulator.simulate_once(fighter_a, fighter_b, logger)
+        finally:
+            simulator.on_round = previous_hook
+    last_round = estimates[-1].round + 1 if estimates else 1
+    record(last_round, 1.0 if winner is fighter_a else 0.0, 0.0)
+
+    ranked = sorted(estimates[1:], key=lambda e: abs(e.swing), reverse=True)[: options.highlight]
+    if ranked:
+        logger.log_system("=== 关键回合 (按胜率摆动排序) ===")
+        for estimate in ranked:
+            logger.log_system(
+                f"第 {estimate.round - 1} 回合: {names[0]} 胜率 {estimate.swing:+.1%}"
+            )
+            for line in estimate.events:
+                logger.log(f"    {line}")
+    return estimates
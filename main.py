@@ -1,45 +1,8 @@
-"""项目入口."""
+"""项目入口, 等价于命令行 bh3-duel-sim, 参数见 --help."""
 
 from __future__ import annotations
 
-from bh3_duel_sim.characters.valkyries import build_valkyrie_roster
-from bh3_duel_sim.simulator import (
-    BattleSimulator,
-    round_robin_statistics,
-    run_single_verbose_battle,
-)
-
-MIN_PLAYERS_FOR_LOG = 2
-
-
-def main() -> None:
-    """主流程: 每个对阵 1 万场循环赛, 再输出一场示例战斗日志."""
-    simulator = BattleSimulator()
-    roster = build_valkyrie_roster()
-    roster = {
-        name: roster[name]
-        for name in [
-            "晨雪",
-            "丽塔",
-        ]
-    }
-    overall, matchup = round_robin_statistics(simulator, roster, iterations_per_pair=10_000)
-    print("整体胜率(每个对手 1 万场):")
-    for name, rate in overall.items():
-        print(f"- {name}: {rate:.2%}")
-
-    print("\n对阵详情:")
-    for (attacker, defender), result in matchup.items():
-        print(
-            f"- {attacker} vs {defender}: "
-            f"{attacker} {result[attacker]:.2%} / {defender} {result[defender]:.2%}"
-        )
-
-    names = list(roster.keys())
-    if len(names) >= MIN_PLAYERS_FOR_LOG:
-        print("\n示例对局日志:")
-        run_single_verbose_battle(simulator, roster[names[0]], roster[names[1]])
-
+from bh3_duel_sim.cli import main
 
 if __name__ == "__main__":
     main()